@@ -0,0 +1,365 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Many independent Kuba games held in NumPy arrays and played one move per game per step.
+
+import numpy as np
+
+# Cell codes used in the (N, 7, 7) board array
+EMPTY = 0
+WHITE = 1
+BLACK = 2
+RED = 3
+MARBLE_CODES = {"X": EMPTY, "W": WHITE, "B": BLACK, "R": RED}
+MARBLES = ("X", "W", "B", "R")
+
+# Direction codes used in move arrays, in the order of the direction axis of legal_move_mask
+DIRECTIONS = ("L", "R", "F", "B")
+OPPOSITE_DIRECTION_CODES = np.array([1, 0, 3, 2], dtype=np.int8)
+
+START_BOARD = [["W", "W", "X", "X", "X", "B", "B"],
+               ["W", "W", "X", "R", "X", "B", "B"],
+               ["X", "X", "R", "R", "R", "X", "X"],
+               ["X", "R", "R", "R", "R", "R", "X"],
+               ["X", "X", "R", "R", "R", "X", "X"],
+               ["B", "B", "X", "R", "X", "W", "W"],
+               ["B", "B", "X", "X", "X", "W", "W"]]
+
+
+def _build_lines():
+    """Builds the lookup tables that turn a push into a walk along one line of the board
+
+    Returns:
+        a tuple (line_cells, line_positions)
+        line_cells : (4, 7, 7) array; [direction, line] is the flat cell indexes of a row (for 'L' and 'R') or a
+            column (for 'F' and 'B'), ordered from the edge the push comes from to the edge it goes towards
+        line_positions : (4, 7, 7) array; [direction, row, column] is where that cell sits in its line
+    """
+    line_cells = np.zeros((4, 7, 7), dtype=np.int64)
+    line_positions = np.zeros((4, 7, 7), dtype=np.int64)
+    for line in range(7):
+        for position in range(7):
+            cells = {"L": (line, 6 - position), "R": (line, position),
+                     "F": (6 - position, line), "B": (position, line)}
+            for code, direction in enumerate(DIRECTIONS):
+                row, column = cells[direction]
+                line_cells[code, line, position] = row * 7 + column
+                line_positions[code, row, column] = position
+    return line_cells, line_positions
+
+
+LINE_CELLS, LINE_POSITIONS = _build_lines()
+
+
+def orient(boards, direction):
+    """Returns a view of boards turned so that pushes in 'direction' move towards higher column indexes
+
+    Parameters:
+        boards : (N, 7, 7) array
+        direction : direction code, an index into DIRECTIONS
+    Returns:
+        an (N, 7, 7) view of boards
+    """
+    if direction == 0:
+        return boards[:, :, ::-1]
+    if direction == 1:
+        return boards
+    if direction == 2:
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+    return boards.transpose(0, 2, 1)
+
+
+def unorient(oriented, direction):
+    """Undoes orient, turning an oriented (N, 7, 7) array back to board rows and columns"""
+    if direction == 0:
+        return oriented[:, :, ::-1]
+    if direction == 1:
+        return oriented
+    if direction == 2:
+        return oriented[:, :, ::-1].transpose(0, 2, 1)
+    return oriented.transpose(0, 2, 1)
+
+
+def find_pushes(boards, colors):
+    """Finds every push a side could make on each board, following the rules of KubaGame.can_marble_be_pushed
+
+    Parameters:
+        boards : (N, 7, 7) array of cell codes
+        colors : (N, 1, 1) array of the marble code of the side pushing on each board (-1 for none)
+    Returns:
+        a tuple (pushable, pushes_off) of (N, 4, 7, 7) boolean arrays; [board, direction code, row, column] is True
+        if that push is allowed, and for pushes_off if it also pushes the edge marble of its line off the board.
+        The forbidden move is not applied here.
+    """
+    pushable = np.zeros((len(boards), 4, 7, 7), dtype=bool)
+    pushes_off = np.zeros_like(pushable)
+    for direction in range(4):
+        oriented = orient(boards, direction)
+        empty = oriented == EMPTY
+
+        # The cell behind the marble must be empty, or the marble must be on the edge
+        behind_empty = np.ones_like(empty)
+        behind_empty[:, :, 1:] = empty[:, :, :-1]
+
+        # Ahead of the marble there must be an empty cell, or an edge marble that is not the mover's
+        empty_ahead = np.zeros_like(empty)
+        empty_ahead[:, :, :-1] = np.logical_or.accumulate(empty[:, :, :0:-1], axis=2)[:, :, ::-1]
+        edge_not_own = np.zeros_like(empty)
+        edge_not_own[:, :, :-1] = (oriented[:, :, 6:] != colors)
+
+        movable = (oriented == colors) & behind_empty
+        pushable[:, direction] = unorient(movable & (empty_ahead | edge_not_own), direction)
+        pushes_off[:, direction] = unorient(movable & ~empty_ahead & edge_not_own, direction)
+    return pushable, pushes_off
+
+
+class BatchKubaGame:
+    """N independent Kuba games between the same two players, stored as NumPy arrays and played in lockstep.
+
+    Every step applies at most one move to each game, with the same validation, push, capture, forbidden move,
+    turn and winner rules as KubaGame.make_move, computed for all games at once.
+
+    Player indexes 0 and 1 refer to player_one and player_two. -1 means "none" in the turn, winner, and forbidden
+    move arrays.
+
+    Data Members (private):
+        _playernames : tuple of the two player names
+        _colors : int8 array of the two players' marble codes
+        _boards : (N, 7, 7) int8 array of cell codes
+        _captures : (N, 2) int16 array; red marbles captured by each player
+        _current_turn : (N,) int8 array; index of the player to move, or -1 before the first move
+        _forbidden : (N, 3) int8 array; (row, column, direction code) of the forbidden move, or -1s
+        _winner : (N,) int8 array; index of the winner, or -1
+
+    Methods:
+        get_size() --> int
+        get_board(index) --> list of lists of strings
+        get_boards() --> (N, 7, 7) array
+        get_captured(playername) --> (N,) array
+        get_current_turn() --> (N,) array
+        get_winners() --> list of playernames or None
+        get_marble_count() --> (N, 3) array
+        legal_move_mask(player_indexes) --> (N, 4, 7, 7) boolean array
+        make_moves(player_indexes, rows, columns, directions) --> (N,) boolean array
+        make_random_moves(rng) --> (N,) boolean array
+        check_for_winner()
+    """
+
+    def __init__(self, player_one, player_two, size):
+        """Initialize the BatchKubaGame data members with 'size' games at the start position
+
+        Parameters:
+            player_one : ('Player One Name', 'W')
+            player_two : ('Player Two Name', 'B')
+            size : number of games
+        Returns:
+            None
+        """
+        self._playernames = (player_one[0], player_two[0])
+        self._colors = np.array([MARBLE_CODES[player_one[1]], MARBLE_CODES[player_two[1]]], dtype=np.int8)
+        start = np.array([[MARBLE_CODES[marble] for marble in row] for row in START_BOARD], dtype=np.int8)
+        self._boards = np.repeat(start[np.newaxis], size, axis=0)
+        self._captures = np.zeros((size, 2), dtype=np.int16)
+        self._current_turn = np.full(size, -1, dtype=np.int8)
+        self._forbidden = np.full((size, 3), -1, dtype=np.int8)
+        self._winner = np.full(size, -1, dtype=np.int8)
+
+    def get_size(self):
+        """Returns the number of games"""
+        return len(self._boards)
+
+    def get_board(self, index):
+        """Returns the board of game 'index' in KubaGame string representation
+
+        Parameters:
+            index : index of a game
+        Returns:
+            a list of seven lists of seven strings ["W", "B", "R", "X"]
+        """
+        return [[MARBLES[code] for code in row] for row in self._boards[index].tolist()]
+
+    def get_boards(self):
+        """Returns the (N, 7, 7) array of cell codes of every game"""
+        return self._boards
+
+    def get_captured(self, playername):
+        """Returns an (N,) array of the number of red marbles captured by 'playername' in every game
+
+        Parameters:
+            playername : name of one of the players
+        Returns:
+            an int array, or an array of zeros if playername is not valid
+        """
+        if playername not in self._playernames:
+            return np.zeros(len(self._boards), dtype=np.int16)
+        return self._captures[:, self._playernames.index(playername)]
+
+    def get_current_turn(self):
+        """Returns the (N,) array of the index of the player to move in every game, -1 before the first move"""
+        return self._current_turn
+
+    def get_winners(self):
+        """Returns a list with the name of the winner of every game, or None for games without a winner"""
+        return [None if winner < 0 else self._playernames[winner] for winner in self._winner.tolist()]
+
+    def get_marble_count(self):
+        """Returns an (N, 3) array of the number of white, black, and red marbles on every board"""
+        return np.stack([(self._boards == code).sum(axis=(1, 2)) for code in (WHITE, BLACK, RED)], axis=1)
+
+    def legal_move_mask(self, player_indexes=None):
+        """Finds every push each game's player could make, following the rules of KubaGame.can_marble_be_pushed
+
+        Parameters:
+            player_indexes : (N,) array of the player to find moves for in each game; defaults to the current turn.
+                Games with a player index of -1 have no moves.
+        Returns:
+            an (N, 4, 7, 7) boolean array; [game, direction code, row, column] is True if that push is allowed.
+            The turn and winner rules of is_valid_move are not applied here, but the forbidden move is.
+        """
+        if player_indexes is None:
+            player_indexes = self._current_turn
+        player_indexes = np.asarray(player_indexes)
+        colors = np.where(player_indexes >= 0, self._colors[np.clip(player_indexes, 0, 1)], -1)
+        colors = colors.astype(np.int8)[:, np.newaxis, np.newaxis]
+
+        mask = find_pushes(self._boards, colors)[0]
+
+        forbidden = np.nonzero(self._forbidden[:, 0] >= 0)[0]
+        rows, columns, directions = self._forbidden[forbidden].T.astype(np.int64)
+        mask[forbidden, directions, rows, columns] = False
+        return mask
+
+    def make_moves(self, player_indexes, rows, columns, directions):
+        """Attempts one move in every game, like KubaGame.make_move
+
+        Parameters:
+            player_indexes : (N,) array of the player attempting to move in each game (0 or 1)
+            rows : (N,) array of the row of the marble to push
+            columns : (N,) array of the column of the marble to push
+            directions : (N,) array of direction codes
+        Returns:
+            an (N,) boolean array of which games the move was actually made in
+        """
+        player_indexes = np.asarray(player_indexes, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        directions = np.asarray(directions, dtype=np.int64)
+
+        # Validate inputs, then the rules checked by is_valid_move
+        valid = ((player_indexes >= 0) & (player_indexes <= 1)
+                 & (rows >= 0) & (rows <= 6) & (columns >= 0) & (columns <= 6)
+                 & (directions >= 0) & (directions <= 3))
+        safe_players = np.where(valid, player_indexes, 0)
+        safe_rows = np.where(valid, rows, 0)
+        safe_columns = np.where(valid, columns, 0)
+        safe_directions = np.where(valid, directions, 0)
+        games = np.arange(len(self._boards))
+
+        valid &= self._winner < 0
+        valid &= self._boards[games, safe_rows, safe_columns] == self._colors[safe_players]
+        valid &= (self._current_turn < 0) | (self._current_turn == safe_players)
+        mask = self.legal_move_mask(np.where(valid, safe_players, -1))
+        valid &= mask[games, safe_directions, safe_rows, safe_columns]
+
+        moved = np.nonzero(valid)[0]
+        if len(moved) > 0:
+            self.push_marbles(moved, safe_players[moved], safe_rows[moved], safe_columns[moved],
+                              safe_directions[moved])
+            self._current_turn[moved] = 1 - safe_players[moved]
+            self.check_for_winner(moved)
+        return valid
+
+    def push_marbles(self, games, player_indexes, rows, columns, directions):
+        """Pushes one marble in each of 'games', which must all be legal pushes
+
+        Parameters:
+            games : array of game indexes
+            player_indexes : array of the player pushing in each game
+            rows, columns : arrays of the coordinates of the pushed marbles
+            directions : array of direction codes
+        Returns:
+            None
+        """
+        lines = np.where(directions <= 1, rows, columns)
+        cells = LINE_CELLS[directions, lines]
+        positions = LINE_POSITIONS[directions, rows, columns][:, np.newaxis]
+        flat_boards = self._boards.reshape(len(self._boards), 49)
+        line = flat_boards[games[:, np.newaxis], cells]
+
+        # The first empty cell ahead of the pushed marble, or 7 (off the board) if there is none
+        indexes = np.arange(7)[np.newaxis, :]
+        empty_ahead = (line == EMPTY) & (indexes > positions)
+        has_gap = empty_ahead.any(axis=1)
+        gaps = np.where(has_gap, empty_ahead.argmax(axis=1), 7)[:, np.newaxis]
+
+        shifted = np.roll(line, 1, axis=1)
+        pushed = np.where((indexes > positions) & (indexes <= gaps), shifted, line)
+        pushed[indexes == positions] = EMPTY
+        flat_boards[games[:, np.newaxis], cells] = pushed
+
+        # A red marble pushed off is captured; any push off the board clears the forbidden move
+        pushed_off = np.where(has_gap, EMPTY, line[:, 6])
+        captured = pushed_off == RED
+        self._captures[games[captured], player_indexes[captured]] += 1
+
+        gap_cells = cells[np.arange(len(games)), np.minimum(gaps[:, 0], 6)]
+        self._forbidden[games, 0] = np.where(has_gap, gap_cells // 7, -1)
+        self._forbidden[games, 1] = np.where(has_gap, gap_cells % 7, -1)
+        self._forbidden[games, 2] = np.where(has_gap, OPPOSITE_DIRECTION_CODES[directions], -1)
+
+    def check_for_winner(self, games=None):
+        """Sets the winner of 'games' by the rules of KubaGame.check_for_winner, checked in the same order
+
+        Parameters:
+            games : array of game indexes to check; defaults to every game
+        Returns:
+            None
+        """
+        if games is None:
+            games = np.arange(len(self._boards))
+
+        winner = np.full(len(games), -1, dtype=np.int8)
+
+        # A player with 7 captures wins (player one is checked first)
+        captures = self._captures[games]
+        winner = np.where(captures[:, 0] >= 7, 0, np.where(captures[:, 1] >= 7, 1, winner))
+
+        # A player whose opponent has no marbles left wins (no white marbles is checked first)
+        boards = self._boards[games]
+        no_white = ~(boards == WHITE).any(axis=(1, 2))
+        no_black = ~(boards == BLACK).any(axis=(1, 2))
+        black_player = np.argmax(self._colors == BLACK) if (self._colors == BLACK).any() else -1
+        white_player = np.argmax(self._colors == WHITE) if (self._colors == WHITE).any() else -1
+        winner = np.where((winner < 0) & no_white & (black_player >= 0), black_player, winner)
+        winner = np.where((winner < 0) & no_black & (white_player >= 0), white_player, winner)
+
+        # A player whose opponent can not move on their turn wins
+        undecided = games[winner < 0]
+        turns = self._current_turn[undecided]
+        can_move = np.ones(len(undecided), dtype=bool)
+        started = turns >= 0
+        if started.any():
+            mask = self.legal_move_mask(self._current_turn)[undecided]
+            can_move = ~started | mask.any(axis=(1, 2, 3))
+        stuck = undecided[~can_move]
+        self._winner[games] = np.where(winner >= 0, winner, self._winner[games])
+        self._winner[stuck] = 1 - self._current_turn[stuck]
+
+    def make_random_moves(self, rng):
+        """Makes a uniformly random legal move for the player to move in every unfinished game
+
+        Games before their first move are moved by player one.
+
+        Parameters:
+            rng : numpy.random.Generator used to pick moves
+        Returns:
+            an (N,) boolean array of which games a move was made in
+        """
+        player_indexes = np.where(self._current_turn < 0, 0, self._current_turn)
+        player_indexes = np.where(self._winner < 0, player_indexes, -1)
+        mask = self.legal_move_mask(player_indexes).reshape(len(self._boards), 4 * 49)
+        choices = np.argmax(rng.random(mask.shape) * mask, axis=1)
+        has_move = mask.any(axis=1)
+        player_indexes = np.where(has_move, player_indexes, -1)
+        directions, cells = np.divmod(choices, 49)
+        rows, columns = np.divmod(cells, 7)
+        return self.make_moves(player_indexes, rows, columns, directions)
@@ -0,0 +1,701 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A memory-lean Kuba game for servers that keep very many idle games resident. CompactKubaGame has the
+#              same public API as KubaGame, but holds its state in a few slots: a flat bytearray board, tuple player
+#              records and small ints, with the board geometry in lookup tables shared by every game.
+
+from KubaGame import MARBLE_CODES, MARBLES, POSITION_SIZE, ZOBRIST_KEYS
+
+DIRECTIONS = ("L", "R", "F", "B")
+DIRECTION_INDEXES = {"L": 0, "R": 1, "F": 2, "B": 3}
+OPPOSITE_DIRECTION_INDEXES = (1, 0, 3, 2)
+START_CELLS = bytes(MARBLE_CODES[marble] for marble in ("WWXXXBB" "WWXRXBB" "XXRRRXX" "XRRRRRX"
+                                                        "XXRRRXX" "BBXRXWW" "BBXXXWW"))
+
+
+def build_rays():
+    """Builds the lookup tables that turn a push into a walk along the board
+
+    Returns:
+        a tuple (rays, behind), both indexed by cell * 4 + direction index with cells numbered row * 7 + column
+        rays : tuples of the cells from the pushed cell (included) to the board edge in the direction of the push
+        behind : the cell the push comes from, or -1 if the pushed cell is on that edge
+    """
+    steps = ((0, -1), (0, 1), (-1, 0), (1, 0))
+    rays = []
+    behind = []
+    for cell in range(49):
+        for row_step, column_step in steps:
+            row, column = divmod(cell, 7)
+            ray = []
+            while 0 <= row <= 6 and 0 <= column <= 6:
+                ray.append(row * 7 + column)
+                row += row_step
+                column += column_step
+            rays.append(tuple(ray))
+
+            row, column = divmod(cell, 7)
+            row -= row_step
+            column -= column_step
+            behind.append(row * 7 + column if 0 <= row <= 6 and 0 <= column <= 6 else -1)
+    return tuple(rays), tuple(behind)
+
+
+RAYS, BEHIND = build_rays()
+
+# ZOBRIST_KEYS flattened so that hashes match KubaGame.get_hash: cell keys by cell * 4 + marble code, and
+# forbidden move keys by the forbidden move code used in to_bytes (0 for none, else 1 + cell * 4 + direction index)
+CELL_KEYS = tuple(ZOBRIST_KEYS["cells"][(cell // 7, cell % 7, marble)] for cell in range(49) for marble in MARBLES)
+FORBIDDEN_KEYS = (0,) + tuple(ZOBRIST_KEYS["forbidden"][(divmod(cell, 7), direction)]
+                              for cell in range(49) for direction in DIRECTIONS)
+
+
+class CompactKubaGame:
+    """A Kuba game with the public API of KubaGame, kept small in memory.
+
+    Marble counts are counted from the board and the position hash is computed when asked for, rather than kept in
+    every game. The recorder, observers and undo stack are only created once they are used.
+
+    Data Members (private):
+        _cells : bytearray of 49 marble codes (MARBLE_CODES), row by row
+        _players : tuple of two tuples (playername, color), in get_playernames() order
+        _turn : index of the player to move in _players, or None before the first move
+        _winner : index of the winner in _players, or None
+        _captures : red marbles captured by the first player | those captured by the second player << 4
+        _forbidden : forbidden move code, 0 for none, else 1 + cell * 4 + direction index; an illegal move that
+            repeats the last position
+        _undo_records : list used as a stack of undo records, one per move made with apply_move, or None. Each is a
+            tuple (coordinates, direction, marbles in the pushed line before the push, previous _turn, previous
+            _winner, previous _captures, previous _forbidden)
+        _recorder : object with record_move(game, playername, coordinates, direction) called for every move made
+            with make_move, or None
+        _observers : list of functions called with the move event of every move made with make_move, or None
+
+    Methods:
+        get_current_turn() --> playername
+        set_current_turn(playername)
+        make_move(playername, coordinates, direction) --> boolean
+        set_recorder(recorder)
+        subscribe(observer)
+        unsubscribe(observer)
+        get_move_event(playername, coordinates, direction, displaced) --> dict
+        encode_move_event(event) --> bytes
+        apply_move(playername, coordinates, direction) --> boolean
+        undo_move() --> boolean
+        push_marble(coordinates, direction) --> tuple of displaced marbles
+        is_valid_move(playername, coordinates, direction) --> boolean
+        is_valid_playername(playername) --> boolean
+        is_valid_coordinates(coordinates) --> boolean
+        is_valid_direction(direction) --> boolean
+        set_forbidden_move(coordinates, direction)
+        is_forbidden_move(coordinates, direction) --> boolean
+        is_game_over() --> boolean
+        get_winner() --> playername
+        check_for_winner() --> boolean
+        can_current_player_move() --> boolean
+        legal_moves(playername) --> list of tuples (coordinates, direction)
+        get_pushed_off_marble(coordinates, direction) --> marble color ["W", "B", "R"] or "X"
+        can_marble_be_pushed(coordinates, direction) --> boolean
+        can_cell_be_pushed(cell, direction_index, marble_code) --> boolean
+        switch_turns()
+        get_playernames()
+        get_player_index(playername) --> 0, 1 or None
+        to_bytes() --> bytes
+        from_bytes(data, player_one, player_two) --> CompactKubaGame
+        get_captured(playername) --> captured pieces as int
+        get_color(playername) --> marble color ["W", "B"]
+        get_marble(coordinates) --> marble color ["W", "B", "R"]
+        get_marble_count() --> tuple of ints (num_white, num_black, num_red)
+        count_marbles() --> tuple of ints (num_white, num_black, num_red)
+        get_hash() --> int
+        compute_hash() --> int
+    """
+
+    __slots__ = ("_cells", "_players", "_turn", "_winner", "_captures", "_forbidden", "_undo_records", "_recorder",
+                 "_observers", "__weakref__")
+
+    def __init__(self, player_one, player_two, board=None):
+        """Initialize the CompactKubaGame data members
+        Parameters:
+            player_one : ('Player One Name', 'W')
+            player_two : ('Player Two Name', 'B')
+            board : board to start from as seven lists of strings; defaults to the starting position
+        Returns:
+            None
+        """
+        self._players = (tuple(player_one), tuple(player_two))
+        self._turn = None
+        self._winner = None
+        self._captures = 0
+        self._forbidden = 0
+        self._undo_records = None
+        self._recorder = None
+        self._observers = None
+        if board is None:
+            self._cells = bytearray(START_CELLS)
+        else:
+            self._board = board
+
+    @property
+    def _board(self):
+        """The board as seven lists of strings ["W", "B", "R", "X"], as KubaGame._board"""
+        return [[MARBLES[code] for code in self._cells[row * 7:row * 7 + 7]] for row in range(7)]
+
+    @_board.setter
+    def _board(self, board):
+        """Replaces the board with board, given as seven lists of strings"""
+        self._cells = bytearray(MARBLE_CODES[marble] for row in board for marble in row)
+
+    def __getstate__(self):
+        """Returns the state to pickle or copy; the recorder and observers are left behind, as in KubaGame"""
+        return {name: getattr(self, name) for name in self.__slots__
+                if name not in ("_recorder", "_observers", "__weakref__")}
+
+    def __setstate__(self, state):
+        """Restores the state returned by __getstate__"""
+        self._recorder = None
+        self._observers = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def get_current_turn(self):
+        """Returns the player name corresponding to who's turn it is, or None if game hasn't started yet"""
+        if self._turn is None:
+            return None
+        return self._players[self._turn][0]
+
+    def set_current_turn(self, playername):
+        """Sets the player to move next
+
+        Parameters:
+            playername : name of the player to move next, or None
+        Returns:
+            None
+        """
+        self._turn = None if playername is None else self.get_player_index(playername)
+
+    def make_move(self, playername, coordinates, direction):
+        """Attempts to make a move for playername by pushing marble at coordinates in the given direction.
+
+        Parameters:
+            playername : name of player attempting to make move
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            A boolean value based on if move was actually made
+        """
+        if not self.is_valid_move(playername, coordinates, direction):
+            return False
+
+        self.set_current_turn(playername)  # Needed for the first turn only
+        displaced = self.push_marble(coordinates, direction)
+        self.switch_turns()
+        self.check_for_winner()
+
+        if self._observers:
+            event = self.get_move_event(playername, coordinates, direction, displaced)
+            for observer in list(self._observers):
+                observer(event)
+
+        if self._recorder is not None:
+            self._recorder.record_move(self, playername, coordinates, direction)
+
+        return True
+
+    def set_recorder(self, recorder):
+        """Attaches a recorder that is told about every move made with make_move from now on, as in KubaGame
+
+        Parameters:
+            recorder : object with start_game(game) and record_move(game, playername, coordinates, direction)
+                methods, or None to detach the current recorder
+        Returns:
+            None
+        """
+        self._recorder = recorder
+        if recorder is not None:
+            recorder.start_game(self)
+
+    def subscribe(self, observer):
+        """Calls observer with the move event of every move made with make_move from now on
+
+        Parameters:
+            observer : function taking the dict returned by get_move_event
+        Returns:
+            None
+        """
+        if self._observers is None:
+            self._observers = []
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        """Stops calling an observer added with subscribe
+
+        Parameters:
+            observer : function passed to subscribe
+        Returns:
+            a boolean value based on if observer was subscribed
+        """
+        if not self._observers or observer not in self._observers:
+            return False
+        self._observers.remove(observer)
+        if not self._observers:
+            self._observers = None
+        return True
+
+    def get_move_event(self, playername, coordinates, direction, displaced):
+        """Describes what a move just made changed, as KubaGame.get_move_event
+
+        Parameters:
+            playername : name of player who made the move
+            coordinates : coordinates of the pushed marble as a tuple (row, column)
+            direction : direction of the push
+            displaced : the marbles push_marble returned for the move
+        Returns:
+            a dict with 'player', 'changes', 'captured', 'turn' and 'winner'
+        """
+        ray = RAYS[(coordinates[0] * 7 + coordinates[1]) * 4 + DIRECTION_INDEXES[direction]]
+        changes = [(coordinates, "X")]
+        for offset in range(1, len(displaced)):
+            if displaced[offset] != displaced[offset - 1]:
+                changes.append((divmod(ray[offset], 7), displaced[offset - 1]))
+
+        return {
+            "player": playername,
+            "changes": tuple(changes),
+            "captured": displaced[-1] if displaced[-1] != "X" else None,
+            "turn": self.get_current_turn(),
+            "winner": self.get_winner()
+        }
+
+    def encode_move_event(self, event):
+        """Packs a move event into the bytes of KubaGame.encode_move_event, for KubaGame.decode_move_event
+
+        Parameters:
+            event : dict returned by get_move_event
+        Returns:
+            bytes
+        """
+        captured = MARBLE_CODES[event["captured"] or "X"]
+        turn = self.get_player_index(event["turn"])
+        winner = 0 if event["winner"] is None else 1 + self.get_player_index(event["winner"])
+        data = bytearray((len(event["changes"]) | captured << 3 | turn << 5 | winner << 6,))
+        for (row, column), marble in event["changes"]:
+            data.append(row * 7 + column | MARBLE_CODES[marble] << 6)
+        return bytes(data)
+
+    def apply_move(self, playername, coordinates, direction):
+        """Makes a move like make_move, and keeps an undo record of it so undo_move can take it back
+
+        Parameters:
+            playername : name of player attempting to make move
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            A boolean value based on if move was actually made
+        """
+        if not self.is_valid_move(playername, coordinates, direction):
+            return False
+
+        turn = self._turn
+        winner = self._winner
+        captures = self._captures
+        forbidden = self._forbidden
+        self.set_current_turn(playername)
+        displaced = self.push_marble(coordinates, direction)
+        self.switch_turns()
+        self.check_for_winner()
+
+        if self._undo_records is None:
+            self._undo_records = []
+        self._undo_records.append((coordinates, direction, displaced, turn, winner, captures, forbidden))
+        return True
+
+    def undo_move(self):
+        """Takes back the last move made with apply_move, restoring the exact position before it
+
+        Parameters:
+            N/A
+
+        Returns:
+            A boolean value based on if there was a move to take back
+        """
+        if not self._undo_records:
+            return False
+
+        (coordinates, direction, displaced,
+         self._turn, self._winner, self._captures, self._forbidden) = self._undo_records.pop()
+        cells = self._cells
+        ray = RAYS[(coordinates[0] * 7 + coordinates[1]) * 4 + DIRECTION_INDEXES[direction]]
+        for offset, marble in enumerate(displaced):
+            cells[ray[offset]] = MARBLE_CODES[marble]
+        if not self._undo_records:
+            self._undo_records = None
+        return True
+
+    def push_marble(self, coordinates, direction):
+        """Pushes marble at 'coordinates' in 'direction', updating captures and the forbidden move
+
+        Parameters:
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            a tuple of the marbles that were in the pushed line before the push, starting at 'coordinates'.
+            The last one is "X" if the line moved into an empty cell, or the color of the marble pushed off.
+        """
+        cells = self._cells
+        direction_index = DIRECTION_INDEXES[direction]
+        ray = RAYS[(coordinates[0] * 7 + coordinates[1]) * 4 + direction_index]
+        end = 1
+        while end < len(ray) - 1 and cells[ray[end]] != 0:
+            end += 1
+        displaced = tuple(MARBLES[cells[ray[offset]]] for offset in range(end + 1))
+
+        captured = cells[ray[end]]
+        for offset in range(end, 0, -1):
+            cells[ray[offset]] = cells[ray[offset - 1]]
+        cells[ray[0]] = 0
+
+        if captured == 0:
+            # Pushing the marble at the end of the line back would repeat the position
+            self._forbidden = 1 + ray[end] * 4 + OPPOSITE_DIRECTION_INDEXES[direction_index]
+        else:
+            self._forbidden = 0  # No forbidden moves, piece can not come back
+            if captured == MARBLE_CODES["R"]:
+                self._captures += 1 << 4 * self._turn
+        return displaced
+
+    def is_valid_move(self, playername, coordinates, direction):
+        """Checks the validity of a potential move by checking parameters and game rules, as KubaGame.is_valid_move
+
+        Parameters:
+            playername : name of player attempting to make move
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            A boolean value based on if move is valid (input is acceptable and does not violate game rules)
+        """
+        if not (self.is_valid_playername(playername)
+                and self.is_valid_coordinates(coordinates)
+                and self.is_valid_direction(direction)):
+            return False
+
+        if self._winner is not None:
+            return False
+
+        player_index = self.get_player_index(playername)
+        if self.get_marble(coordinates) != self._players[player_index][1]:
+            return False
+
+        if self._turn is not None and self._turn != player_index:
+            return False
+
+        return self.can_marble_be_pushed(coordinates, direction)
+
+    def is_valid_playername(self, playername):
+        """Returns a boolean value based on if playername is one of the players"""
+        return self.get_player_index(playername) is not None
+
+    def is_valid_coordinates(self, coordinates):
+        """Returns a boolean value based on if the coordinates are a tuple (row, column) of integers from 0 to 6"""
+        return (isinstance(coordinates, tuple) and len(coordinates) == 2
+                and isinstance(coordinates[0], int) and isinstance(coordinates[1], int)
+                and 0 <= coordinates[0] <= 6 and 0 <= coordinates[1] <= 6)
+
+    def is_valid_direction(self, direction):
+        """Returns a boolean value based on if direction is one of DIRECTIONS"""
+        return direction in DIRECTION_INDEXES
+
+    def set_forbidden_move(self, coordinates, direction):
+        """Sets the forbidden move
+
+        Parameters:
+            coordinates : coordinates of marble that may not be pushed, as a tuple (row, column), or () for none
+            direction : one of DIRECTIONS, or "" for none
+        Returns:
+            None
+        """
+        if coordinates == ():
+            self._forbidden = 0
+        else:
+            self._forbidden = 1 + (coordinates[0] * 7 + coordinates[1]) * 4 + DIRECTION_INDEXES[direction]
+
+    def is_forbidden_move(self, coordinates, direction):
+        """Returns a boolean based on if the coordinates and direction are the forbidden move"""
+        if self._forbidden == 0:
+            return False
+        cell, direction_index = divmod(self._forbidden - 1, 4)
+        return coordinates == divmod(cell, 7) and direction == DIRECTIONS[direction_index]
+
+    def is_game_over(self):
+        """Returns a boolean value based on if the game is over"""
+        self.check_for_winner()
+        return self._winner is not None
+
+    def get_winner(self):
+        """Returns the name of the winner or None if no winner"""
+        if self._winner is None:
+            return None
+        return self._players[self._winner][0]
+
+    def check_for_winner(self):
+        """Checks for all possible win conditions and sets the winner if one is met, in the order of KubaGame
+
+        Note: runs after a move is played and turn has been switched.
+
+        Parameters:
+            N/A
+
+        Returns:
+            True if there is a winner, otherwise None
+        """
+        for player_index in range(2):
+            if (self._captures >> 4 * player_index) & 15 >= 7:
+                self._winner = player_index
+                return True
+
+        for color, winning_color in (("W", "B"), ("B", "W")):
+            if MARBLE_CODES[color] not in self._cells:
+                self._winner = 0 if self._players[0][1] == winning_color else 1
+                return True
+
+        if not self.can_current_player_move():
+            self._winner = 1 - self._turn
+            return True
+
+    def can_current_player_move(self):
+        """Determines if the player to move has any legal moves, stopping at the first one found
+
+        Parameters
+            N/A
+
+        Returns:
+            a boolean value based on if the player to move has any legal moves
+        """
+        if self._turn is None:
+            return True
+
+        cells = self._cells
+        marble_code = MARBLE_CODES[self._players[self._turn][1]]
+        for cell in range(49):
+            if cells[cell] == marble_code:
+                for direction_index in range(4):
+                    if (self._forbidden != 1 + cell * 4 + direction_index
+                            and self.can_cell_be_pushed(cell, direction_index, marble_code)):
+                        return True
+        return False
+
+    def legal_moves(self, playername):
+        """Returns every move playername could make right now
+
+        Follows the same rules as is_valid_move. Moves are listed cell by cell, so they are the moves of
+        KubaGame.legal_moves in a different order.
+
+        Parameters
+            playername : name of player whose moves are wanted
+
+        Returns:
+            a list of tuples (coordinates, direction) that make_move would accept for playername
+        """
+        player_index = self.get_player_index(playername)
+        if player_index is None or self._winner is not None:
+            return []
+
+        if self._turn is not None and self._turn != player_index:
+            return []
+
+        cells = self._cells
+        marble_code = MARBLE_CODES[self._players[player_index][1]]
+        moves = []
+        for cell in range(49):
+            if cells[cell] == marble_code:
+                for direction_index in range(4):
+                    if (self._forbidden != 1 + cell * 4 + direction_index
+                            and self.can_cell_be_pushed(cell, direction_index, marble_code)):
+                        moves.append((divmod(cell, 7), DIRECTIONS[direction_index]))
+        return moves
+
+    def get_pushed_off_marble(self, coordinates, direction):
+        """Returns the marble that pushing 'coordinates' in 'direction' would push off the board, without pushing
+
+        Parameters
+            coordinates : coordinates of marble as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            the color of the marble that would be pushed off ['W', 'B', 'R'], or "X" if none would be
+        """
+        cells = self._cells
+        ray = RAYS[(coordinates[0] * 7 + coordinates[1]) * 4 + DIRECTION_INDEXES[direction]]
+        for cell in ray[1:]:
+            if cells[cell] == 0:
+                return "X"
+        return MARBLES[cells[ray[-1]]]
+
+    def can_marble_be_pushed(self, coordinates, direction):
+        """Determines if marble at 'coordinates' can be pushed in 'direction'
+
+        Parameters
+            coordinates : coordinates of marble as a tuple (row, column)
+            direction : one of DIRECTIONS
+
+        Returns:
+            a boolean value based on if the marble at 'coordinates' can be pushed in 'direction'
+        """
+        if not self.is_valid_coordinates(coordinates) or not self.is_valid_direction(direction):
+            return False
+
+        if self.is_forbidden_move(coordinates, direction):
+            return False
+
+        cell = coordinates[0] * 7 + coordinates[1]
+        return self.can_cell_be_pushed(cell, DIRECTION_INDEXES[direction], self._cells[cell])
+
+    def can_cell_be_pushed(self, cell, direction_index, marble_code):
+        """Determines if the marble in 'cell' can be pushed, ignoring the forbidden move
+
+        The cell the push comes from must be empty or off the board, and ahead of the marble there must be an empty
+        cell or an edge marble that is not the pushing player's.
+
+        Parameters
+            cell : row * 7 + column of the marble
+            direction_index : index of the direction in DIRECTIONS
+            marble_code : code of the marble in 'cell' (MARBLE_CODES)
+
+        Returns:
+            a boolean value based on if the marble in 'cell' can be pushed
+        """
+        cells = self._cells
+        behind = BEHIND[cell * 4 + direction_index]
+        if behind != -1 and cells[behind] != 0:
+            return False
+
+        ray = RAYS[cell * 4 + direction_index]
+        for ahead in ray[1:]:
+            if cells[ahead] == 0:
+                return True
+        return len(ray) > 1 and cells[ray[-1]] != marble_code
+
+    def switch_turns(self):
+        """Switches the turn to the opposite player"""
+        self._turn = 1 if self._turn == 0 else 0
+
+    def get_playernames(self):
+        """Returns a list of playernames ["player 1", "player 2"]"""
+        return [self._players[0][0], self._players[1][0]]
+
+    def get_player_index(self, playername):
+        """Returns the index of playername in get_playernames(), or None if it is not one of the players"""
+        if playername == self._players[0][0]:
+            return 0
+        if playername == self._players[1][0]:
+            return 1
+        return None
+
+    def to_bytes(self):
+        """Packs the position into the POSITION_SIZE bytes of KubaGame.to_bytes
+
+        Parameters:
+            N/A
+
+        Returns:
+            bytes of length POSITION_SIZE
+        """
+        cells = 0
+        for cell, code in enumerate(self._cells):
+            cells |= code << 2 * cell
+
+        turn = 0 if self._turn is None else 1 + self._turn
+        winner = 0 if self._winner is None else 1 + self._winner
+        return cells.to_bytes(13, "little") + bytes((self._captures, self._forbidden, turn | winner << 2))
+
+    @classmethod
+    def from_bytes(cls, data, player_one, player_two):
+        """Creates a CompactKubaGame from a position packed by to_bytes (or KubaGame.to_bytes)
+
+        Parameters:
+            data : bytes, bytearray, or memoryview of length POSITION_SIZE
+            player_one : ('Player One Name', 'W'), as given when the packed game was created
+            player_two : ('Player Two Name', 'B'), as given when the packed game was created
+
+        Returns:
+            a CompactKubaGame at the packed position
+        """
+        if len(data) != POSITION_SIZE:
+            raise ValueError("packed position must be " + str(POSITION_SIZE) + " bytes")
+
+        game = cls.__new__(cls)
+        packed = int.from_bytes(data[:13], "little")
+        game._cells = bytearray((packed >> 2 * cell) & 3 for cell in range(49))
+        game._players = (tuple(player_one), tuple(player_two))
+        game._captures = data[13]
+        game._forbidden = data[14]
+        turn = data[15] & 3
+        winner = data[15] >> 2
+        game._turn = None if turn == 0 else turn - 1
+        game._winner = None if winner == 0 else winner - 1
+        game._undo_records = None
+        game._recorder = None
+        game._observers = None
+        return game
+
+    def get_captured(self, playername):
+        """Returns the number of red marbles captured by 'playername', or 0 if playername is not valid"""
+        player_index = self.get_player_index(playername)
+        if player_index is None:
+            return 0
+        return (self._captures >> 4 * player_index) & 15
+
+    def get_color(self, playername):
+        """Returns the color of the marbles played by 'playername' ('W' or 'B'), or None if playername is not valid"""
+        player_index = self.get_player_index(playername)
+        if player_index is None:
+            return None
+        return self._players[player_index][1]
+
+    def get_marble(self, coordinates):
+        """Returns the color of the marble ['W', 'B', 'R'] at the coordinates (row, column) or "X" if None
+
+        Parameters:
+            coordinates : coordinates of board where piece may be, as a tuple (row, column)
+
+        Returns:
+            a string representing a piece ['W', 'B', 'R'] or an empty square ['X'], or None for invalid coordinates
+        """
+        if self.is_valid_coordinates(coordinates):
+            return MARBLES[self._cells[coordinates[0] * 7 + coordinates[1]]]
+
+    def get_marble_count(self):
+        """Returns the number of white, black, and red marbles on the board as a tuple in the order (W, B, R)"""
+        return self.count_marbles()
+
+    def count_marbles(self):
+        """Counts the white, black, and red marbles on the board, returned as a tuple in the order (W, B, R)"""
+        cells = self._cells
+        return cells.count(MARBLE_CODES["W"]), cells.count(MARBLE_CODES["B"]), cells.count(MARBLE_CODES["R"])
+
+    def get_hash(self):
+        """Returns the Zobrist hash of the position, equal to KubaGame.get_hash for the same position"""
+        return self.compute_hash()
+
+    def compute_hash(self):
+        """Computes the Zobrist hash of the position from scratch
+
+        Parameters:
+            N/A
+
+        Returns:
+            a 64-bit int
+        """
+        position_hash = 0
+        for cell, code in enumerate(self._cells):
+            position_hash ^= CELL_KEYS[cell * 4 + code]
+
+        if self._turn is not None:
+            position_hash ^= ZOBRIST_KEYS["turn"][self._turn]
+        for player_index in range(2):
+            position_hash ^= ZOBRIST_KEYS["captures"][(player_index, (self._captures >> 4 * player_index) & 15)]
+        return position_hash ^ FORBIDDEN_KEYS[self._forbidden]
@@ -0,0 +1,340 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A computer player for KubaGame using iterative deepening alpha-beta (negamax) search.
+
+import time
+
+# Score for a won position; wins found sooner score higher
+WIN_SCORE = 1000000
+
+# Scores further from zero than this are wins or losses a known number of plies away, not evaluations
+WIN_BOUND = WIN_SCORE // 2
+
+# Transposition table entry flags: the stored score is exact, a lower bound, or an upper bound
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def evaluate_material(game, playername):
+    """Scores a position for playername from red marbles captured and marbles left on the board
+
+    Parameters:
+        game : KubaGame to score
+        playername : name of the player the score is for
+
+    Returns:
+        an int; higher is better for playername
+    """
+    playernames = game.get_playernames()
+    opponent = playernames[1] if playernames[0] == playername else playernames[0]
+    num_white, num_black, _ = game.get_marble_count()
+    marbles = {"W": num_white, "B": num_black}
+
+    captures = game.get_captured(playername) - game.get_captured(opponent)
+    material = marbles[game.get_color(playername)] - marbles[game.get_color(opponent)]
+    return 100 * captures + 60 * material
+
+
+def score_to_table(score, ply):
+    """Converts a search score to the form kept in the transposition table
+
+    A win or loss is scored by its distance from the root, but the same position can be reached at any ply, so the
+    table keeps its distance from the position itself.
+
+    Parameters:
+        score : score of the position for the side to move, as returned by KubaAI.negamax
+        ply : plies from the root to the position
+
+    Returns:
+        an int
+    """
+    if score > WIN_BOUND:
+        return score + ply
+    if score < -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """Converts a score kept in the transposition table back to a search score; the reverse of score_to_table
+
+    Parameters:
+        score : score read from the transposition table
+        ply : plies from the root to the position
+
+    Returns:
+        an int
+    """
+    if score > WIN_BOUND:
+        return score - ply
+    if score < -WIN_BOUND:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit for a move runs out"""
+    pass
+
+
+class KubaAI:
+    """A computer player that picks moves for a KubaGame with iterative deepening negamax alpha-beta search.
+
+    Moves are explored in place with KubaGame.apply_move and undo_move, positions are identified with
+    KubaGame.get_hash, and captures of red and opponent marbles are searched first.
+
+    Data Members (private):
+        _game : the KubaGame being played
+        _evaluate : function (game, playername) --> int scoring a position for playername
+        _table : transposition table; dict with position hash as key and (depth, score, flag, move) as value, with
+                 win and loss scores counted from the position (score_to_table)
+        _table_size : the most entries _table may hold; the oldest entry is dropped when it is full
+        _deadline : time.perf_counter() value at which the current search stops
+        _nodes : number of positions visited by the current search
+        _stats : dict with 'nodes', 'depth', 'seconds', and 'nodes per second' of the last search
+        _book : KubaBook.OpeningBook whose moves are played without searching, or None
+
+    Methods:
+        best_move(playername, time_limit, max_depth) --> tuple (coordinates, direction)
+        get_stats() --> dict
+        search_root(playername, depth, moves) --> tuple (score, move)
+        negamax(depth, alpha, beta, ply) --> int
+        order_moves(playername, moves, table_move) --> list of tuples (coordinates, direction)
+        store(position_hash, depth, score, flag, move, ply)
+    """
+
+    def __init__(self, game, evaluate=evaluate_material, table_size=1000000, book=None):
+        """Initialize the KubaAI data members
+
+        Parameters:
+            game : the KubaGame to pick moves for
+            evaluate : function (game, playername) --> int scoring a position for playername
+            table_size : the most positions kept in the transposition table
+            book : KubaBook.OpeningBook to take moves from while the position is in it, or None
+        Returns:
+            None
+        """
+        self._game = game
+        self._evaluate = evaluate
+        self._table = {}
+        self._table_size = table_size
+        self._deadline = None
+        self._nodes = 0
+        self._stats = {"nodes": 0, "depth": 0, "seconds": 0.0, "nodes per second": 0.0}
+        self._book = book
+
+    def best_move(self, playername=None, time_limit=1.0, max_depth=None):
+        """Searches the current position one ply deeper at a time until time runs out
+
+        If the position is in the opening book, the book move is returned without searching.
+
+        Parameters:
+            playername : player to move; defaults to the game's current turn (needed only before the first move)
+            time_limit : seconds to search for
+            max_depth : stop after searching this many plies, if given
+
+        Returns:
+            the best move found as a tuple (coordinates, direction), or None if playername has no legal moves
+        """
+        game = self._game
+        if playername is None:
+            playername = game.get_current_turn()
+
+        moves = game.legal_moves(playername)
+        if not moves:
+            return None
+
+        start = time.perf_counter()
+        if self._book is not None:
+            book_move = self._book.best_move(game, playername)
+            if book_move in moves:
+                self._stats = {"nodes": 0, "depth": 0, "seconds": time.perf_counter() - start,
+                               "nodes per second": 0.0}
+                return book_move
+
+        self._deadline = start + time_limit
+        self._nodes = 0
+        best = self.order_moves(playername, moves, None)[0]
+        depth_reached = 0
+        depth = 1
+        while max_depth is None or depth <= max_depth:
+            try:
+                score, best = self.search_root(playername, depth, moves)
+            except SearchTimeout:
+                break
+            depth_reached = depth
+            if abs(score) >= WIN_SCORE - depth:  # A forced result was found; deeper search won't change it
+                break
+            depth += 1
+
+        seconds = time.perf_counter() - start
+        self._stats = {
+            "nodes": self._nodes,
+            "depth": depth_reached,
+            "seconds": seconds,
+            "nodes per second": self._nodes / seconds if seconds > 0 else 0.0
+        }
+        return best
+
+    def get_stats(self):
+        """Returns the statistics of the last best_move search
+
+        Parameters:
+            N/A
+        Returns:
+            dict with 'nodes', 'depth', 'seconds', and 'nodes per second'
+        """
+        return self._stats
+
+    def search_root(self, playername, depth, moves):
+        """Searches every root move to 'depth' plies
+
+        Parameters:
+            playername : player to move
+            depth : plies to search
+            moves : legal moves of playername
+
+        Returns:
+            a tuple (score, move) with the best score for playername and the move that gets it
+        """
+        game = self._game
+        entry = self._table.get(game.get_hash())
+        table_move = entry[3] if entry is not None else None
+
+        alpha = -WIN_SCORE - 1
+        beta = WIN_SCORE + 1
+        best = None
+        for move in self.order_moves(playername, moves, table_move):
+            game.apply_move(playername, move[0], move[1])
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                game.undo_move()
+            if best is None or score > alpha:
+                alpha = score
+                best = move
+
+        self.store(game.get_hash(), depth, alpha, EXACT, best, 0)
+        return alpha, best
+
+    def negamax(self, depth, alpha, beta, ply):
+        """Scores the current position for the side to move with alpha-beta search
+
+        Parameters:
+            depth : plies left to search
+            alpha : score the side to move is already sure of
+            beta : score the opponent is already sure of
+            ply : plies searched from the root
+
+        Returns:
+            an int score for the side to move
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        game = self._game
+        playername = game.get_current_turn()
+        winner = game.get_winner()
+        if winner is not None:
+            if winner == playername:
+                return WIN_SCORE - ply
+            return -WIN_SCORE + ply
+
+        if depth <= 0:
+            return self._evaluate(game, playername)
+
+        position_hash = game.get_hash()
+        original_alpha = alpha
+        table_move = None
+        entry = self._table.get(position_hash)
+        if entry is not None:
+            table_depth, table_score, flag, table_move = entry
+            table_score = score_from_table(table_score, ply)
+            if table_depth >= depth:
+                if flag == EXACT:
+                    return table_score
+                if flag == LOWER_BOUND and table_score > alpha:
+                    alpha = table_score
+                elif flag == UPPER_BOUND and table_score < beta:
+                    beta = table_score
+                if alpha >= beta:
+                    return table_score
+
+        best_score = -WIN_SCORE - 1
+        best = None
+        for move in self.order_moves(playername, game.legal_moves(playername), table_move):
+            game.apply_move(playername, move[0], move[1])
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.undo_move()
+
+            if score > best_score:
+                best_score = score
+                best = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.store(position_hash, depth, best_score, flag, best, ply)
+        return best_score
+
+    def order_moves(self, playername, moves, table_move):
+        """Orders moves so the likely best are searched first: the transposition table move, then pushes that
+        capture a red marble, then pushes that knock off an opponent marble, then the rest
+
+        Parameters:
+            playername : player making the moves
+            moves : list of tuples (coordinates, direction)
+            table_move : best move stored in the transposition table for this position, or None
+
+        Returns:
+            a new list holding the same moves
+        """
+        game = self._game
+        own_color = game.get_color(playername)
+        captures = []
+        knock_offs = []
+        others = []
+        for move in moves:
+            if move == table_move:
+                continue
+
+            pushed_off = game.get_pushed_off_marble(move[0], move[1])
+            if pushed_off == "R":
+                captures.append(move)
+            elif pushed_off != "X" and pushed_off != own_color:
+                knock_offs.append(move)
+            else:
+                others.append(move)
+
+        if table_move is not None and table_move in moves:
+            return [table_move] + captures + knock_offs + others
+        return captures + knock_offs + others
+
+    def store(self, position_hash, depth, score, flag, move, ply):
+        """Saves a search result in the transposition table, dropping the oldest entry if it is full
+
+        Parameters:
+            position_hash : KubaGame.get_hash() of the position
+            depth : plies the position was searched to
+            score : score of the position for the side to move, as returned by negamax
+            flag : EXACT, LOWER_BOUND, or UPPER_BOUND
+            move : best move found, or None
+            ply : plies from the root to the position
+        Returns:
+            None
+        """
+        table = self._table
+        if position_hash not in table and len(table) >= self._table_size:
+            del table[next(iter(table))]
+        table[position_hash] = (depth, score_to_table(score, ply), flag, move)
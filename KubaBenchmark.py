@@ -0,0 +1,369 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Reproducible benchmarks of KubaGame hot paths, with JSON results compared against a saved baseline.
+#              Run with: python -m KubaBenchmark [--engine bitboard] [--baseline baseline.json] [--output out.json]
+#              which compares against benchmark_baseline_<engine>.json, taken on the reference machine, by default;
+#              or python -m KubaBenchmark --compare-engines to see how much faster the bitboard engine is
+
+from KubaGame import KubaGame, ENGINES
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+PLAYERS = (("player1", "W"), ("player2", "B"))
+
+# Results committed for the reference machine, compared against when no other baseline is given
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline_{}.json")
+
+# Options that change the work done by the benchmarks; results are only compared with a baseline that used the same
+WORKLOAD_OPTIONS = ("engine", "games", "playouts", "seed")
+
+# Fraction of baseline speed a benchmark may lose before it counts as a regression. The medians of separate runs of
+# every benchmark on the reference machine were as much as 25% below the median of eight such runs, which the
+# baselines record, so smaller regressions than this cannot be told from noise there.
+TOLERANCE = 0.3
+
+# Moves at the end of each seeded game whose positions the late-game can_current_player_move benchmark checks
+LATE_GAME_MOVES = 40
+
+# Late-game boards with few marbles left, where can_current_player_move has to look at most of the board
+LATE_GAME_BOARDS = [
+    [["X", "X", "X", "X", "X", "X", "X"],
+     ["X", "X", "X", "X", "X", "X", "X"],
+     ["X", "X", "X", "W", "X", "X", "X"],
+     ["X", "X", "W", "B", "W", "X", "X"],
+     ["X", "X", "X", "W", "X", "X", "X"],
+     ["X", "X", "X", "X", "X", "X", "X"],
+     ["X", "X", "X", "X", "X", "X", "X"]],
+    [["B", "W", "X", "X", "X", "W", "B"],
+     ["W", "X", "X", "R", "X", "X", "W"],
+     ["X", "X", "R", "X", "R", "X", "X"],
+     ["X", "R", "X", "X", "X", "R", "X"],
+     ["X", "X", "R", "X", "R", "X", "X"],
+     ["W", "X", "X", "R", "X", "X", "W"],
+     ["B", "W", "X", "X", "X", "W", "B"]],
+    [["X", "X", "X", "X", "X", "X", "B"],
+     ["X", "X", "X", "X", "X", "X", "B"],
+     ["X", "X", "X", "X", "X", "X", "B"],
+     ["W", "W", "W", "W", "W", "W", "R"],
+     ["X", "X", "X", "X", "X", "X", "B"],
+     ["X", "X", "X", "X", "X", "X", "B"],
+     ["X", "X", "X", "X", "X", "X", "B"]]
+]
+
+
+def make_move_sequences(count, seed, max_moves=200):
+    """Plays seeded random games and returns their moves, so every run benchmarks the same games
+
+    Parameters:
+        count : number of games
+        seed : seed for random.Random
+        max_moves : most moves per game
+    Returns:
+        a list of lists of tuples (playername, coordinates, direction)
+    """
+    rng = random.Random(seed)
+    sequences = []
+    for _ in range(count):
+        game = KubaGame(*PLAYERS)
+        playername = PLAYERS[0][0]
+        sequence = []
+        while game.get_winner() is None and len(sequence) < max_moves:
+            coordinates, direction = rng.choice(game.legal_moves(playername))
+            game.make_move(playername, coordinates, direction)
+            sequence.append((playername, coordinates, direction))
+            playername = game.get_current_turn()
+        sequences.append(sequence)
+    return sequences
+
+
+def late_game(engine, board):
+    """Returns a game on 'board' with player two to move"""
+    game = KubaGame(*PLAYERS, engine=engine, board=[list(row) for row in board])
+    game.set_current_turn(PLAYERS[1][0])
+    return game
+
+
+def time_operations(function, repeat, setup=None, min_seconds=0.1):
+    """Times function over 'repeat' runs of at least min_seconds each and keeps the median run
+
+    Each run calls function as many times as it takes to last min_seconds, worked out once before the runs, so
+    short benchmarks are not timed over a few milliseconds of a noisy clock. Garbage collection is off while a run
+    is timed, as in timeit.
+
+    Parameters:
+        function : callable returning the number of operations it did; it takes no arguments, or the value returned
+            by setup if setup is given
+        repeat : number of runs
+        setup : callable taking no arguments run untimed before each call of function, so every call starts from
+            the same state
+        min_seconds : shortest time one run may take
+    Returns:
+        a dict with 'operations', 'seconds', 'ops per second', and 'seconds per op' of the median run, and 'spread':
+        the fastest run's ops per second less the slowest run's, over the median run's
+    """
+    def run(calls):
+        operations = 0
+        seconds = 0.0
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(calls):
+                if setup is None:
+                    start = time.perf_counter()
+                    operations += function()
+                else:
+                    state = setup()
+                    start = time.perf_counter()
+                    operations += function(state)
+                seconds += time.perf_counter() - start
+        finally:
+            if collecting:
+                gc.enable()
+        return operations, seconds
+
+    calls = 1
+    operations, seconds = run(calls)
+    while seconds < min_seconds:
+        calls = max(calls * 2, int(calls * 1.2 * min_seconds / seconds)) if seconds > 0 else calls * 10
+        operations, seconds = run(calls)
+
+    speeds = sorted((operations / seconds if seconds > 0 else 0.0, operations, seconds)
+                    for operations, seconds in (run(calls) for _ in range(repeat)))
+    speed, operations, seconds = speeds[len(speeds) // 2]
+    return {
+        "operations": operations,
+        "seconds": seconds,
+        "ops per second": speed,
+        "seconds per op": seconds / operations if operations > 0 else 0.0,
+        "spread": (speeds[-1][0] - speeds[0][0]) / speed if speed > 0 else 0.0
+    }
+
+
+def run_benchmarks(engine="list", games=20, playouts=20, seed=2021, repeat=5, min_seconds=0.1):
+    """Runs every benchmark on the given board engine
+
+    Parameters:
+        engine : one of ENGINES
+        games : number of seeded games replayed by the move benchmarks
+        playouts : number of random games played by the playout benchmark
+        seed : seed for the move sequences and playouts
+        repeat : number of runs of each benchmark; the median is kept
+        min_seconds : shortest time one run of a benchmark may take
+    Returns:
+        a dict with benchmark names as keys and time_operations results as values
+    """
+    sequences = make_move_sequences(games, seed)
+
+    def replay_games():
+        moves = 0
+        for sequence in sequences:
+            game = KubaGame(*PLAYERS, engine=engine)
+            for playername, coordinates, direction in sequence:
+                game.make_move(playername, coordinates, direction)
+            moves += len(sequence)
+        return moves
+
+    # Positions and the move that was played from each, for the move checking benchmarks
+    positions = []
+    for sequence in sequences[:5]:
+        game = KubaGame(*PLAYERS, engine=engine)
+        for playername, coordinates, direction in sequence:
+            positions.append((KubaGame.from_bytes(game.to_bytes(), *PLAYERS, engine=engine),
+                              playername, coordinates, direction))
+            game.make_move(playername, coordinates, direction)
+
+    def check_valid_moves():
+        for game, playername, coordinates, direction in positions:
+            game.is_valid_move(playername, coordinates, direction)
+        return len(positions)
+
+    def check_pushes():
+        checks = 0
+        for game, _, _, _ in positions:
+            for row in range(7):
+                for column in range(7):
+                    for direction in "LRFB":
+                        game.can_marble_be_pushed((row, column), direction)
+            checks += 196
+        return checks
+
+    # The positions after each of the last moves of every game, and the fixed late-game boards. make_move has
+    # already answered can_current_player_move for each of them, so every run checks fresh copies: one check
+    # per position, with nothing cached from an earlier check.
+    late_positions = [late_game(engine, board).to_bytes() for board in LATE_GAME_BOARDS]
+    for sequence in sequences:
+        game = KubaGame(*PLAYERS, engine=engine)
+        for move_index, (playername, coordinates, direction) in enumerate(sequence):
+            game.make_move(playername, coordinates, direction)
+            if move_index >= len(sequence) - LATE_GAME_MOVES and game.get_winner() is None:
+                late_positions.append(game.to_bytes())
+
+    def copy_late_games():
+        return [KubaGame.from_bytes(position, *PLAYERS, engine=engine) for position in late_positions]
+
+    def check_late_games(late_games):
+        for game in late_games:
+            game.can_current_player_move()
+        return len(late_games)
+
+    def count_marbles():
+        for _ in range(100):
+            for game, _, _, _ in positions:
+                game.get_marble_count()
+        return 100 * len(positions)
+
+    def play_random_games():
+        rng = random.Random(seed)
+        for _ in range(playouts):
+            game = KubaGame(*PLAYERS, engine=engine)
+            playername = PLAYERS[0][0]
+            moves = 0
+            while game.get_winner() is None and moves < 200:
+                coordinates, direction = rng.choice(game.legal_moves(playername))
+                game.make_move(playername, coordinates, direction)
+                playername = game.get_current_turn()
+                moves += 1
+        return playouts
+
+    return {
+        "make_move": time_operations(replay_games, repeat, min_seconds=min_seconds),
+        "is_valid_move": time_operations(check_valid_moves, repeat, min_seconds=min_seconds),
+        "can_marble_be_pushed": time_operations(check_pushes, repeat, min_seconds=min_seconds),
+        "can_current_player_move (late game)": time_operations(check_late_games, repeat, copy_late_games,
+                                                               min_seconds),
+        "get_marble_count": time_operations(count_marbles, repeat, min_seconds=min_seconds),
+        "random playouts": time_operations(play_random_games, repeat, min_seconds=min_seconds)
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Compares benchmark results with a baseline
+
+    Parameters:
+        results : dict returned by run_benchmarks
+        baseline : dict returned by run_benchmarks for an earlier run
+        tolerance : fraction of baseline speed that may be lost before a benchmark counts as a regression
+    Returns:
+        a dict with benchmark names as keys and dicts with 'ratio' (current / baseline ops per second) and
+        'regression' (boolean) as values, for benchmarks found in both
+    """
+    comparison = {}
+    for name, result in results.items():
+        if name not in baseline or baseline[name]["ops per second"] <= 0:
+            continue
+        ratio = result["ops per second"] / baseline[name]["ops per second"]
+        comparison[name] = {"ratio": ratio, "regression": ratio < 1 - tolerance}
+    return comparison
+
+
+def compare_engines(results_by_engine, reference="list"):
+    """Works out how much faster each board engine is than the reference engine on every benchmark
+
+    Parameters:
+        results_by_engine : dict with engine names as keys and dicts returned by run_benchmarks as values
+        reference : engine the others are compared with
+    Returns:
+        a dict with the other engine names as keys and dicts of benchmark name --> speedup (engine ops per second
+        / reference ops per second) as values
+    """
+    speedups = {}
+    for engine, results in results_by_engine.items():
+        if engine == reference:
+            continue
+        speedups[engine] = {name: result["ops per second"] / results_by_engine[reference][name]["ops per second"]
+                            for name, result in results.items()
+                            if results_by_engine[reference].get(name, {}).get("ops per second", 0) > 0}
+    return speedups
+
+
+def main(arguments=None):
+    """Runs the benchmarks from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status: 0, or 1 if a benchmark regressed against the baseline
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaBenchmark", description="Benchmarks KubaGame hot paths.")
+    parser.add_argument("--engine", choices=ENGINES, default="list")
+    parser.add_argument("--games", type=int, default=20, help="seeded games replayed by the move benchmarks")
+    parser.add_argument("--playouts", type=int, default=20, help="random games in the playout benchmark")
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each benchmark; the median is kept")
+    parser.add_argument("--min-time", type=float, default=0.1, help="shortest time in seconds of one run")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against the results JSON in this file; defaults to the results "
+                                           "of the reference machine in benchmark_baseline_<engine>.json")
+    parser.add_argument("--no-baseline", action="store_true", help="do not compare against any baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="fraction of baseline speed that may be lost before it is a regression")
+    parser.add_argument("--compare-engines", action="store_true",
+                        help="run every engine and report its speedup over the list engine")
+    options = parser.parse_args(arguments)
+
+    if options.compare_engines:
+        results_by_engine = {engine: run_benchmarks(engine, options.games, options.playouts, options.seed,
+                                                    options.repeat, options.min_time)
+                             for engine in ENGINES}
+        speedups = compare_engines(results_by_engine)
+        if options.output:
+            with open(options.output, "w") as file:
+                json.dump({"python": platform.python_version(), "seed": options.seed, "engines": results_by_engine,
+                           "speedups": speedups}, file, indent=2)
+        for name, result in results_by_engine["list"].items():
+            line = "{:<40}{:>14,.0f} ops/s list".format(name, result["ops per second"])
+            for engine, engine_speedups in speedups.items():
+                line += "  {:>6.2f}x {}".format(engine_speedups[name], engine)
+            print(line)
+        return 0
+
+    results = run_benchmarks(options.engine, options.games, options.playouts, options.seed, options.repeat,
+                             options.min_time)
+    report = {
+        "engine": options.engine,
+        "games": options.games,
+        "playouts": options.playouts,
+        "seed": options.seed,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "results": results
+    }
+
+    comparison = {}
+    baseline_path = options.baseline or BASELINE_PATH.format(options.engine)
+    if not options.no_baseline and (options.baseline or os.path.exists(baseline_path)):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        if all(baseline.get(name, report[name]) == report[name] for name in WORKLOAD_OPTIONS):
+            comparison = compare(results, baseline["results"], options.tolerance)
+            report["comparison"] = comparison
+        else:
+            print("Not compared with {}: it was run with other options ({})".format(
+                baseline_path, ", ".join("--{} {}".format(name, baseline[name]) for name in WORKLOAD_OPTIONS
+                                         if name in baseline)))
+
+    if options.output:
+        with open(options.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    for name, result in results.items():
+        line = "{:<40}{:>14,.0f} ops/s".format(name, result["ops per second"])
+        if name in comparison:
+            line += "  {:>6.2f}x baseline{}".format(comparison[name]["ratio"],
+                                                     "  REGRESSION" if comparison[name]["regression"] else "")
+        print(line)
+
+    if any(entry["regression"] for entry in comparison.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A bitboard board engine for KubaGame, storing the 7x7 board as one integer per marble color.
+
+# Squares are numbered row * 8 + column. The eighth column of every row is a guard column that is never
+# occupied, so horizontal shifts can not carry a marble from one row into the next.
+ROW_WIDTH = 8
+BOARD_MASK = sum(1 << (row * ROW_WIDTH + column) for row in range(7) for column in range(7))
+COLORS = ("W", "B", "R")
+SHIFTS = {"L": -1, "R": 1, "F": -ROW_WIDTH, "B": ROW_WIDTH}
+OPPOSITE_DIRECTIONS = {"L": "R", "R": "L", "F": "B", "B": "F"}
+
+
+def square(coordinates):
+    """Returns the bit index of the cell at coordinates (row, column)"""
+    return coordinates[0] * ROW_WIDTH + coordinates[1]
+
+
+def square_coordinates(index):
+    """Returns the coordinates (row, column) of the cell at bit index"""
+    return (index // ROW_WIDTH, index % ROW_WIDTH)
+
+
+def shift(bits, direction):
+    """Shifts every marble in bits one cell in direction, dropping marbles that leave the board"""
+    step = SHIFTS[direction]
+    if step > 0:
+        return (bits << step) & BOARD_MASK
+    return (bits >> -step) & BOARD_MASK
+
+
+# Coordinates (row, column) of every bit index, for reading squares out of a bitboard without arithmetic
+SQUARE_COORDINATES = [square_coordinates(index) for index in range(7 * ROW_WIDTH)]
+
+
+# Tuples of the seven marbles of a row, keyed by the row's white, black and red bits; filled as rows are first seen
+ROW_MARBLES = {}
+
+
+def bit_coordinates(bits):
+    """Returns the coordinates (row, column) of every set bit in bits, lowest square first"""
+    coordinates = []
+    while bits:
+        lowest = bits & -bits
+        coordinates.append(SQUARE_COORDINATES[lowest.bit_length() - 1])
+        bits ^= lowest
+    return coordinates
+
+
+def _build_rays():
+    """Builds the ray, edge and behind lookup tables for every square and direction
+
+    Returns:
+        a tuple of dicts (rays, edges, behind) keyed by direction, each holding a list indexed by square.
+        rays : every cell strictly past the square in the direction, up to the board edge
+        edges : the board edge cell reached from the square in the direction (0 if the square is on the edge)
+        behind : the cell behind the square opposite to the direction (0 if the square is on the opposite edge)
+    """
+    moves = {"L": (0, -1), "R": (0, 1), "F": (-1, 0), "B": (1, 0)}
+    rays = {}
+    edges = {}
+    behind = {}
+    for direction, (row_step, column_step) in moves.items():
+        rays[direction] = [0] * (7 * ROW_WIDTH)
+        edges[direction] = [0] * (7 * ROW_WIDTH)
+        behind[direction] = [0] * (7 * ROW_WIDTH)
+        for row in range(7):
+            for column in range(7):
+                index = square((row, column))
+                pointer_row = row + row_step
+                pointer_column = column + column_step
+                while 0 <= pointer_row <= 6 and 0 <= pointer_column <= 6:
+                    rays[direction][index] |= 1 << square((pointer_row, pointer_column))
+                    edges[direction][index] = 1 << square((pointer_row, pointer_column))
+                    pointer_row += row_step
+                    pointer_column += column_step
+
+                behind_row = row - row_step
+                behind_column = column - column_step
+                if 0 <= behind_row <= 6 and 0 <= behind_column <= 6:
+                    behind[direction][index] = 1 << square((behind_row, behind_column))
+    return rays, edges, behind
+
+
+RAYS, EDGES, BEHIND = _build_rays()
+
+# The cells along the board edge a push in each direction moves towards
+EDGE_LINES = {
+    "L": sum(1 << square((row, 0)) for row in range(7)),
+    "R": sum(1 << square((row, 6)) for row in range(7)),
+    "F": sum(1 << square((0, column)) for column in range(7)),
+    "B": sum(1 << square((6, column)) for column in range(7))
+}
+
+
+def _build_fills():
+    """Builds the tables for shifting whole bitboards back against a direction and spreading edge cells along lines
+
+    Returns:
+        a tuple of dicts (back_shifts, spreads) keyed by direction.
+        back_shifts : list of (shift, mask) for moving every bit 1, 2 and 4 cells opposite to the direction; a
+            positive shift is a left shift, and mask drops bits that would wrap into the next row
+        spreads : (shift, multiplier) that turn the edge cells of the direction into the whole lines they end
+    """
+    columns_from = [sum(1 << square((row, column)) for row in range(7) for column in range(first, 7))
+                    for first in range(8)]
+    columns_up_to = [sum(1 << square((row, column)) for row in range(7) for column in range(last + 1))
+                     for last in range(7)]
+    row_spread = (1 << 7) - 1
+    column_spread = sum(1 << (row * ROW_WIDTH) for row in range(7))
+    back_shifts = {
+        "L": [(distance, columns_from[distance]) for distance in (1, 2, 4)],
+        "R": [(-distance, columns_up_to[6 - distance]) for distance in (1, 2, 4)],
+        "F": [(distance * ROW_WIDTH, BOARD_MASK) for distance in (1, 2, 4)],
+        "B": [(-distance * ROW_WIDTH, BOARD_MASK) for distance in (1, 2, 4)]
+    }
+    spreads = {"L": (0, row_spread), "R": (6, row_spread), "F": (0, column_spread), "B": (6 * ROW_WIDTH, column_spread)}
+    return back_shifts, spreads
+
+
+BACK_SHIFTS, SPREADS = _build_fills()
+
+
+def pushable(own, occupied, direction):
+    """Returns a bitboard of the marbles in own that can be pushed in direction, for all of them at once
+
+    A marble can be pushed if the cell behind it is empty (or the board edge), it is not on the edge it would be
+    pushed towards, and its line does not end in a full run of marbles up to an own edge marble. The cells with
+    only marbles ahead of them are found with one fill back along the direction, in three doubling steps.
+
+    Parameters:
+        own : bitboard of the pushing player's marbles
+        occupied : bitboard of every marble on the board
+        direction : one of ['L', 'R', 'F', 'B']
+    Returns:
+        an int with one bit set per pushable marble
+    """
+    edge = EDGE_LINES[direction]
+    free_behind = shift(BOARD_MASK & ~occupied, direction) | EDGE_LINES[OPPOSITE_DIRECTIONS[direction]]
+    movable = own & free_behind & ~edge
+    own_edge = own & edge
+    if not movable or not own_edge:
+        return movable  # Without an own marble on the edge, every push that has room is allowed
+
+    # Cells with only marbles between them and the edge: filled back from the edge through occupied cells
+    (first, first_mask), (second, second_mask), (third, third_mask) = BACK_SHIFTS[direction]
+    if first > 0:
+        through = (occupied << first) & first_mask
+        closed = edge | through & ((edge << first) & first_mask)
+        through &= (through << first) & first_mask
+        closed |= through & ((closed << second) & second_mask)
+        through &= (through << second) & second_mask
+        closed |= through & ((closed << third) & third_mask)
+    else:
+        through = (occupied >> -first) & first_mask
+        closed = edge | through & ((edge >> -first) & first_mask)
+        through &= (through >> -first) & first_mask
+        closed |= through & ((closed >> -second) & second_mask)
+        through &= (through >> -second) & second_mask
+        closed |= through & ((closed >> -third) & third_mask)
+
+    # Lines ending in an own edge marble, which may not be pushed off
+    spread_shift, multiplier = SPREADS[direction]
+    own_lines = (own_edge >> spread_shift) * multiplier
+    return movable & ~(closed & own_lines)
+
+
+class KubaBitboard:
+    """A Kuba board stored as three integer bitboards, one each for white, black, and red marbles.
+
+    Pushes, captures, and legality checks are done with shifts and masks instead of walking list cells.
+
+    Data Members (private):
+        _bitboards : dict with 'W', 'B', and 'R' as keys; each value is an int with one bit set per marble
+
+    Methods:
+        from_bitboards(white, black, red) --> KubaBitboard
+        set_board(board)
+        to_list() --> list of lists of strings
+        get_row(row) --> tuple of strings
+        get_marble(coordinates) --> marble color ["W", "B", "R"] or "X"
+        get_marble_count() --> tuple of ints (num_white, num_black, num_red)
+        get_coordinates(marble_color) --> list of coordinates
+        can_marble_be_pushed(coordinates, direction, marble_color) --> boolean
+        get_pushable(marble_color, direction) --> int
+        has_legal_move(marble_color, forbidden_coordinates, forbidden_direction) --> boolean
+        legal_moves(marble_color) --> list of tuples (coordinates, direction)
+        get_pushed_off_marble(coordinates, direction) --> marble color ["W", "B", "R"] or "X"
+        push_marble(coordinates, direction) --> tuple of displaced marbles
+        set_line(coordinates, direction, marbles)
+    """
+
+    def __init__(self, board):
+        """Initialize the bitboards from a board in KubaGame string representation
+
+        Parameters:
+            board : list of seven lists of seven strings ["W", "B", "R", "X"]
+        Returns:
+            None
+        """
+        self._bitboards = {"W": 0, "B": 0, "R": 0}
+        self.set_board(board)
+
+    @classmethod
+    def from_bitboards(cls, white, black, red):
+        """Creates a KubaBitboard straight from the bitboards of each color, without reading a board
+
+        Parameters:
+            white : int with one bit set per white marble, at square(coordinates)
+            black : int with one bit set per black marble
+            red : int with one bit set per red marble
+        Returns:
+            a KubaBitboard
+        """
+        engine = cls.__new__(cls)
+        engine._bitboards = {"W": white, "B": black, "R": red}
+        return engine
+
+    def set_board(self, board):
+        """Replaces the contents of the bitboards with board
+
+        Parameters:
+            board : list of seven lists of seven strings ["W", "B", "R", "X"]
+        Returns:
+            None
+        """
+        bitboards = {"W": 0, "B": 0, "R": 0}
+        for row in range(7):
+            for column in range(7):
+                marble = board[row][column]
+                if marble in bitboards:
+                    bitboards[marble] |= 1 << square((row, column))
+        self._bitboards = bitboards
+
+    def to_list(self):
+        """Returns the board in KubaGame string representation
+
+        Parameters:
+            N/A
+        Returns:
+            a list of seven lists of seven strings ["W", "B", "R", "X"]
+        """
+        return [[self.get_marble((row, column)) for column in range(7)] for row in range(7)]
+
+    def get_row(self, row):
+        """Returns one row of the board in KubaGame string representation
+
+        Parameters:
+            row : index of the row, 0-6
+        Returns:
+            a tuple of seven strings ["W", "B", "R", "X"]
+        """
+        shift = row * ROW_WIDTH
+        bitboards = self._bitboards
+        key = ((bitboards["W"] >> shift) & 127) | ((bitboards["B"] >> shift) & 127) << 7 | (
+            (bitboards["R"] >> shift) & 127) << 14
+        marbles = ROW_MARBLES.get(key)
+        if marbles is None:
+            marbles = tuple("W" if key >> column & 1 else "B" if key >> 7 + column & 1 else
+                            "R" if key >> 14 + column & 1 else "X" for column in range(7))
+            ROW_MARBLES[key] = marbles
+        return marbles
+
+    def get_marble(self, coordinates):
+        """Returns the color of the marble at coordinates, or "X" if the cell is empty
+
+        Parameters:
+            coordinates : coordinates of board where piece may be, as a tuple (row, column)
+        Returns:
+            a string representing a piece ['W', 'B', 'R'] or an empty square ['X']
+        """
+        bit = 1 << (coordinates[0] * ROW_WIDTH + coordinates[1])
+        bitboards = self._bitboards
+        if bitboards["W"] & bit:
+            return "W"
+        if bitboards["B"] & bit:
+            return "B"
+        if bitboards["R"] & bit:
+            return "R"
+        return "X"
+
+    def get_marble_count(self):
+        """Returns the number of white, black, and red marbles on the board as a tuple in the order (W, B, R)
+
+        Parameters:
+            N/A
+        Returns:
+            a tuple representing the int number of white, black, and red marbles (W, B, R)
+        """
+        return (self._bitboards["W"].bit_count(),
+                self._bitboards["B"].bit_count(),
+                self._bitboards["R"].bit_count())
+
+    def get_coordinates(self, marble_color):
+        """Returns the coordinates of every marble of marble_color
+
+        Parameters:
+            marble_color : one of ['W', 'B', 'R']
+        Returns:
+            a list of coordinates as tuples (row, column)
+        """
+        return bit_coordinates(self._bitboards[marble_color])
+
+    def can_marble_be_pushed(self, coordinates, direction, marble_color):
+        """Determines if marble at 'coordinates' can be pushed in 'direction'
+
+        Follows the same rules as KubaGame.can_marble_be_pushed_horizontal and can_marble_be_pushed_vertical:
+        the cell behind the marble must be empty (or the board edge), and the push may not drop a marble of
+        marble_color off the board.
+
+        Parameters:
+            coordinates : coordinates of marble as a tuple (row, column)
+            direction : one of ['L', 'R', 'F', 'B']
+            marble_color : the color of the marble at 'coordinates'
+        Returns:
+            a boolean value based on if the marble at 'coordinates' can be pushed in 'direction'
+        """
+        index = square(coordinates)
+        bitboards = self._bitboards
+        occupied = bitboards["W"] | bitboards["B"] | bitboards["R"]
+
+        if BEHIND[direction][index] & occupied:
+            return False
+
+        ray = RAYS[direction][index]
+        if not ray:
+            return False
+
+        if ray & ~occupied:
+            return True
+
+        return not EDGES[direction][index] & bitboards.get(marble_color, 0)
+
+    def get_pushable(self, marble_color, direction):
+        """Returns a bitboard of every marble_color marble that can be pushed in direction, for all marbles at once
+
+        Parameters:
+            marble_color : one of ['W', 'B', 'R']
+            direction : one of ['L', 'R', 'F', 'B']
+        Returns:
+            an int with one bit set per pushable marble
+        """
+        bitboards = self._bitboards
+        return pushable(bitboards[marble_color], bitboards["W"] | bitboards["B"] | bitboards["R"], direction)
+
+    def has_legal_move(self, marble_color, forbidden_coordinates, forbidden_direction):
+        """Determines if any marble_color marble can be pushed, leaving out the forbidden move
+
+        Parameters:
+            marble_color : one of ['W', 'B', 'R']
+            forbidden_coordinates : coordinates of the forbidden move as a tuple (row, column), or ()
+            forbidden_direction : direction of the forbidden move, or ""
+        Returns:
+            a boolean value based on if any push is allowed
+        """
+        bitboards = self._bitboards
+        own = bitboards[marble_color]
+        occupied = bitboards["W"] | bitboards["B"] | bitboards["R"]
+        for direction in ("L", "R", "F", "B"):
+            marbles = pushable(own, occupied, direction)
+            if direction == forbidden_direction:
+                marbles &= ~(1 << square(forbidden_coordinates))
+            if marbles:
+                return True
+        return False
+
+    def legal_moves(self, marble_color):
+        """Returns every push of a marble_color marble allowed by the board, for all marbles at once
+
+        The forbidden move is not known to the board and is not filtered out.
+
+        Parameters:
+            marble_color : one of ['W', 'B', 'R']
+        Returns:
+            a list of tuples (coordinates, direction)
+        """
+        bitboards = self._bitboards
+        own = bitboards[marble_color]
+        occupied = bitboards["W"] | bitboards["B"] | bitboards["R"]
+        moves = []
+        for direction in ("L", "R", "F", "B"):
+            marbles = pushable(own, occupied, direction)
+            while marbles:
+                lowest = marbles & -marbles
+                moves.append((SQUARE_COORDINATES[lowest.bit_length() - 1], direction))
+                marbles ^= lowest
+        return moves
+
+    def get_pushed_off_marble(self, coordinates, direction):
+        """Returns the marble that pushing 'coordinates' in 'direction' would push off the board, without pushing
+
+        Parameters:
+            coordinates : coordinates of marble as a tuple (row, column)
+            direction : one of ['L', 'R', 'F', 'B']
+        Returns:
+            the color of the marble that would be pushed off ['W', 'B', 'R'], or "X" if none would be
+        """
+        index = square(coordinates)
+        bitboards = self._bitboards
+        occupied = bitboards["W"] | bitboards["B"] | bitboards["R"]
+        if RAYS[direction][index] & ~occupied:
+            return "X"
+
+        edge = EDGES[direction][index] or 1 << index
+        for color in COLORS:
+            if bitboards[color] & edge:
+                return color
+        return "X"
+
+    def push_marble(self, coordinates, direction):
+        """Pushes marble at 'coordinates' and the line of marbles in front of it one cell in 'direction'
+
+        Parameters:
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one of ['L', 'R', 'F', 'B']
+        Returns:
+            a tuple of the marbles that were in the pushed line before the push, starting at 'coordinates'.
+            The last one is "X" if the line moved into an empty cell, or the color of the marble pushed off.
+        """
+        index = square(coordinates)
+        bitboards = self._bitboards
+        occupied = bitboards["W"] | bitboards["B"] | bitboards["R"]
+        ray = RAYS[direction][index]
+        line = ray | (1 << index)
+        empty_on_ray = ray & ~occupied
+
+        if empty_on_ray:
+            if SHIFTS[direction] > 0:
+                gap = empty_on_ray & -empty_on_ray
+                segment = (gap - (1 << index)) & line
+            else:
+                gap = 1 << (empty_on_ray.bit_length() - 1)
+                segment = ((1 << (index + 1)) - (gap << 1)) & line
+            end = gap
+        else:
+            segment = line
+            end = EDGES[direction][index]
+
+        white = bitboards["W"]
+        black = bitboards["B"]
+        red = bitboards["R"]
+        displaced = []
+        step = SHIFTS[direction]
+        for index in range(index, end.bit_length() - 1 + step, step):
+            bit = 1 << index
+            if white & bit:
+                displaced.append("W")
+            elif black & bit:
+                displaced.append("B")
+            elif red & bit:
+                displaced.append("R")
+            else:
+                displaced.append("X")
+
+        for color in COLORS:
+            moved = bitboards[color] & segment
+            if moved:
+                bitboards[color] = (bitboards[color] & ~segment) | shift(moved, direction)
+
+        return tuple(displaced)
+
+    def set_line(self, coordinates, direction, marbles):
+        """Writes marbles onto the board starting at 'coordinates' and stepping in 'direction'
+
+        Parameters:
+            coordinates : coordinates of the first cell as a tuple (row, column)
+            direction : one of ['L', 'R', 'F', 'B']
+            marbles : the marbles to write, as returned by push_marble
+
+        Returns:
+            None
+        """
+        bitboards = self._bitboards
+        index = square(coordinates)
+        for marble in marbles:
+            bit = 1 << index
+            for color in COLORS:
+                bitboards[color] &= ~bit
+            if marble != "X":
+                bitboards[marble] |= bit
+            index += SHIFTS[direction]
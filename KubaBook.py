@@ -0,0 +1,213 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: An opening book for Kuba built from recorded games. Positions are keyed by their canonical form,
+#              so symmetric positions share an entry, and the book file is memory-mapped and read through a hashed
+#              index so a lookup touches only a few bytes of it.
+
+from KubaGame import KubaGame
+from KubaSymmetry import canonical_form, invert_transform, transform_move
+import mmap
+import struct
+import zlib
+
+# A book file is a header, a hashed index of position slots, and the move entries the slots point to.
+#     header : BOOK_MAGIC, then the number of index slots and the number of move entries (little-endian uint32)
+#     slot : canonical_form key, index of the position's first move entry (uint32) and its number of moves
+#         (uint16; 0 for an empty slot). A key is looked for from slot crc32(key) % slot count onwards.
+#     move entry : move (direction index << 6 | row * 7 + column, in the canonical position), then plays, wins of
+#         the player who made it, and red marbles that player captured by the end of the game (uint32 each)
+BOOK_MAGIC = b"KUBB\x01"
+HEADER = struct.Struct("<5sII")
+SLOT = struct.Struct("<16sIH")
+MOVE_ENTRY = struct.Struct("<BIII")
+DIRECTIONS = ("L", "R", "F", "B")
+
+
+def position_key(game, playername=None):
+    """Returns the canonical_form key and transform of the position in 'game' with 'playername' to move
+
+    Parameters:
+        game : KubaGame
+        playername : player to move; needed only before the first move, when the game has no current turn
+
+    Returns:
+        a tuple (key, transform) as returned by canonical_form
+    """
+    current_turn = game.get_current_turn()
+    if current_turn is not None or playername is None:
+        return canonical_form(game)
+
+    game.set_current_turn(playername)
+    try:
+        return canonical_form(game)
+    finally:
+        game.set_current_turn(current_turn)
+
+
+def build_book(records, max_plies=12):
+    """Adds up the moves played in the first plies of recorded games
+
+    Parameters:
+        records : iterable of KubaRecord.GameRecord, such as read_archive(path)
+        max_plies : number of moves at the start of each game to count
+
+    Returns:
+        a dict with canonical_form keys as keys; the key value is a dict with moves (coordinates, direction) in
+        the canonical position as keys and lists [plays, wins, red marbles captured] as values
+    """
+    book = {}
+    for record in records:
+        game = KubaGame.from_bytes(record.position, record.player_one, record.player_two)
+        played = []
+        for ply, (playername, coordinates, direction) in enumerate(record.get_moves()):
+            if ply < max_plies:
+                key, transform = position_key(game, playername)
+                played.append((key, transform_move((coordinates, direction), transform), playername))
+            # The rest of the game is played too, since the moves are scored by its result
+            if not game.make_move(playername, coordinates, direction):
+                raise ValueError("recorded move " + str((playername, coordinates, direction)) + " can not be made")
+
+        for key, move, playername in played:
+            stats = book.setdefault(key, {}).setdefault(move, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += game.get_winner() == playername
+            stats[2] += game.get_captured(playername)
+    return book
+
+
+def write_book(path, book):
+    """Writes a book from build_book to a file that OpeningBook can read
+
+    Parameters:
+        path : path of the book file
+        book : dict returned by build_book
+
+    Returns:
+        None
+    """
+    slot_count = max(1, 2 * len(book))
+    slots = [None] * slot_count
+    entries = bytearray()
+    entry_count = 0
+    for key in sorted(book):
+        moves = book[key]
+        slot = zlib.crc32(key) % slot_count
+        while slots[slot] is not None:
+            slot = (slot + 1) % slot_count
+        slots[slot] = SLOT.pack(key, entry_count, len(moves))
+        for (coordinates, direction), (plays, wins, captures) in sorted(moves.items()):
+            entries += MOVE_ENTRY.pack(DIRECTIONS.index(direction) << 6 | coordinates[0] * 7 + coordinates[1],
+                                       plays, wins, captures)
+            entry_count += 1
+
+    empty = SLOT.pack(bytes(16), 0, 0)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(BOOK_MAGIC, slot_count, entry_count))
+        file.write(b"".join(empty if slot is None else slot for slot in slots))
+        file.write(entries)
+
+
+class OpeningBook:
+    """An opening book file, memory-mapped and read one position at a time.
+
+    Data Members (private):
+        _file : the open book file
+        _map : read-only mmap of the book file
+        _slot_count : number of slots in the hashed index
+        _entry_count : number of move entries
+        _entries_start : offset of the first move entry in the file
+
+    Methods:
+        get_position_count() --> int
+        get_moves(game, playername) --> list of tuples (move, plays, wins, average captures)
+        best_move(game, playername, min_plays) --> tuple (coordinates, direction)
+        close()
+    """
+
+    def __init__(self, path):
+        """Opens and memory-maps a book file written by write_book
+
+        Parameters:
+            path : path of the book file
+        Returns:
+            None
+        """
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._slot_count, self._entry_count = HEADER.unpack_from(self._map, 0)
+        if magic != BOOK_MAGIC:
+            self.close()
+            raise ValueError("not a Kuba opening book")
+        self._entries_start = HEADER.size + self._slot_count * SLOT.size
+
+    def __enter__(self):
+        """Returns self so the file is closed at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the file"""
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the book file
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        self._map.close()
+        self._file.close()
+
+    def get_position_count(self):
+        """Returns the number of positions in the book"""
+        return sum(SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)[2] > 0
+                   for slot in range(self._slot_count))
+
+    def get_moves(self, game, playername=None):
+        """Looks up the book moves for the position in 'game'
+
+        Parameters:
+            game : KubaGame at the position to look up; it is left unchanged
+            playername : player to move; defaults to the game's current turn (needed only before the first move)
+
+        Returns:
+            a list of tuples (move, plays, wins, average captures), most played first, with moves as tuples
+            (coordinates, direction) for 'game' itself; an empty list if the position is not in the book
+        """
+        key, transform = position_key(game, playername)
+        slot = zlib.crc32(key) % self._slot_count
+        while True:
+            slot_key, first_entry, move_count = SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)
+            if move_count == 0:
+                return []
+            if slot_key == key:
+                break
+            slot = (slot + 1) % self._slot_count
+
+        inverse = invert_transform(transform)
+        moves = []
+        for entry in range(first_entry, first_entry + move_count):
+            move, plays, wins, captures = MOVE_ENTRY.unpack_from(self._map,
+                                                                 self._entries_start + entry * MOVE_ENTRY.size)
+            coordinates = divmod(move & 63, 7)
+            moves.append((transform_move((coordinates, DIRECTIONS[move >> 6]), inverse),
+                          plays, wins, captures / plays))
+        moves.sort(key=lambda stats: (-stats[1], -stats[2]))
+        return moves
+
+    def best_move(self, game, playername=None, min_plays=1):
+        """Returns the book move with the best winning rate for the position in 'game'
+
+        Parameters:
+            game : KubaGame at the position to look up; it is left unchanged
+            playername : player to move; defaults to the game's current turn (needed only before the first move)
+            min_plays : fewest plays a move needs to be picked
+
+        Returns:
+            a tuple (coordinates, direction), or None if the book has no move with min_plays for the position
+        """
+        moves = [stats for stats in self.get_moves(game, playername) if stats[1] >= min_plays]
+        if not moves:
+            return None
+        return max(moves, key=lambda stats: (stats[2] / stats[1], stats[1]))[0]
@@ -0,0 +1,133 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A heuristic evaluator that scores a whole batch of Kuba positions in one NumPy pass, for search and
+#              MCTS leaves that would otherwise call a Python scoring function once per position. Needs numpy.
+
+from BatchKubaGame import find_pushes, BLACK, EMPTY, RED, WHITE
+from KubaGame import MARBLE_CODES, POSITION_SIZE, games_to_bytes
+import numpy as np
+
+# Features of a position for the side being scored, each its own count minus the opponent's:
+#     material : marbles of its color on the board (KubaGame.get_marble_count)
+#     captures : red marbles captured (KubaGame.get_captured)
+#     mobility : pushes it could make, not counting the forbidden move rule
+#     edge exposure : marbles of its color on the edge of the board, where they can be pushed off
+#     red threats : pushes that would push a red marble off
+#     marble threats : pushes that would push a marble of the other color off
+FEATURES = ("material", "captures", "mobility", "edge exposure", "red threats", "marble threats")
+DEFAULT_WEIGHTS = {"material": 60.0, "captures": 100.0, "mobility": 2.0, "edge exposure": -4.0,
+                   "red threats": 12.0, "marble threats": 8.0}
+
+EDGE = np.ones((7, 7), dtype=bool)
+EDGE[1:6, 1:6] = False
+
+
+def side_features(boards, colors):
+    """Counts the features that depend only on the board for one side on every board
+
+    Parameters:
+        boards : (N, 7, 7) array of cell codes
+        colors : (N,) array of the marble code of the side on each board (WHITE or BLACK)
+    Returns:
+        an (N, 5) int array of material, mobility, edge exposure, red threats and marble threats
+    """
+    colors = np.asarray(colors)[:, np.newaxis, np.newaxis]
+    own = boards == colors
+    other = (boards != colors) & (boards != EMPTY) & (boards != RED)
+    pushable, pushes_off = find_pushes(boards, colors)
+
+    # The marble a push would push off is the edge marble at the end of its line in that direction
+    edges = np.stack([np.repeat(boards[:, :, :1], 7, axis=2), np.repeat(boards[:, :, 6:], 7, axis=2),
+                      np.repeat(boards[:, :1, :], 7, axis=1), np.repeat(boards[:, 6:, :], 7, axis=1)], axis=1)
+    other_edge = np.stack([np.repeat(other[:, :, :1], 7, axis=2), np.repeat(other[:, :, 6:], 7, axis=2),
+                           np.repeat(other[:, :1, :], 7, axis=1), np.repeat(other[:, 6:, :], 7, axis=1)], axis=1)
+
+    return np.stack([own.sum(axis=(1, 2)),
+                     pushable.sum(axis=(1, 2, 3)),
+                     (own & EDGE).sum(axis=(1, 2)),
+                     (pushes_off & (edges == RED)).sum(axis=(1, 2, 3)),
+                     (pushes_off & other_edge).sum(axis=(1, 2, 3))], axis=1)
+
+
+def evaluate_features(boards, colors, captures=None):
+    """Works out every feature in FEATURES for a batch of positions
+
+    Parameters:
+        boards : (N, 7, 7) array of cell codes (MARBLE_CODES)
+        colors : marble code of the side scored on every board, or an (N,) array of one per board
+        captures : (N, 2) array of red marbles captured by the side scored and by its opponent, or None for none
+    Returns:
+        an (N, len(FEATURES)) float array, in the order of FEATURES
+    """
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, 7, 7)
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.int8), (len(boards),))
+    opponents = np.where(colors == WHITE, BLACK, WHITE).astype(np.int8)
+    own = side_features(boards, colors)
+    other = side_features(boards, opponents)
+
+    features = np.zeros((len(boards), len(FEATURES)))
+    features[:, 0] = own[:, 0] - other[:, 0]
+    if captures is not None:
+        captures = np.asarray(captures).reshape(-1, 2)
+        features[:, 1] = captures[:, 0] - captures[:, 1]
+    features[:, 2:] = own[:, 1:] - other[:, 1:]
+    return features
+
+
+def evaluate_boards(boards, colors=WHITE, captures=None, weights=None):
+    """Scores a batch of positions for one side
+
+    Parameters:
+        boards : (N, 7, 7) array of cell codes (MARBLE_CODES)
+        colors : marble code of the side scored on every board, or an (N,) array of one per board
+        captures : (N, 2) array of red marbles captured by the side scored and by its opponent, or None for none
+        weights : dict with a weight for each name in FEATURES; defaults to DEFAULT_WEIGHTS
+    Returns:
+        an (N,) float array of scores; higher is better for the side scored
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    return evaluate_features(boards, colors, captures) @ np.array([weights[name] for name in FEATURES])
+
+
+def games_to_arrays(games, playernames=None):
+    """Gathers the boards, side colors and captures of KubaGame objects into arrays, through their packed positions
+
+    Parameters:
+        games : list of KubaGame (or CompactKubaGame)
+        playernames : list of the player to score in each game; defaults to each game's current turn, or its first
+            player before the first move
+    Returns:
+        a tuple (boards, colors, captures) of arrays for evaluate_boards
+    """
+    count = len(games)
+    positions = np.frombuffer(games_to_bytes(games), dtype=np.uint8).reshape(count, POSITION_SIZE)
+    cells = ((positions[:, :13, np.newaxis] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).reshape(count, 52)
+    boards = cells[:, :49].reshape(count, 7, 7).astype(np.int8)
+
+    colors = np.empty(count, dtype=np.int8)
+    captures = np.empty((count, 2), dtype=np.int16)
+    for index, game in enumerate(games):
+        playernames_of_game = game.get_playernames()
+        playername = playernames[index] if playernames is not None else game.get_current_turn()
+        if playername is None:
+            playername = playernames_of_game[0]
+        opponent = playernames_of_game[1] if playername == playernames_of_game[0] else playernames_of_game[0]
+        colors[index] = MARBLE_CODES[game.get_color(playername)]
+        captures[index] = (game.get_captured(playername), game.get_captured(opponent))
+    return boards, colors, captures
+
+
+def evaluate_games(games, playernames=None, weights=None):
+    """Scores a batch of games in one pass
+
+    Parameters:
+        games : list of KubaGame (or CompactKubaGame)
+        playernames : list of the player to score in each game; defaults to each game's current turn
+        weights : dict with a weight for each name in FEATURES; defaults to DEFAULT_WEIGHTS
+    Returns:
+        an (N,) float array of scores; higher is better for the player scored
+    """
+    if not games:
+        return np.zeros(0)
+    boards, colors, captures = games_to_arrays(games, playernames)
+    return evaluate_boards(boards, colors, captures, weights)
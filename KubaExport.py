@@ -0,0 +1,196 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Exports recorded Kuba games as training data for evaluation models: fixed-size NumPy shards of
+#              position feature planes with the move played and the game's outcome, streamed so memory stays flat
+#              however many games are converted. Needs numpy.
+#              Run with: python -m KubaExport ARCHIVE [ARCHIVE ...] --output PREFIX [--shard-size 65536]
+
+from KubaGame import KubaGame, POSITION_SIZE
+from KubaRecord import read_archive
+import argparse
+import numpy as np
+import sys
+
+# Feature planes of one position, each 7 x 7 (uint8):
+#     0-2 : 1 where a white, black or red marble is
+#     3 : 1 + direction index (of DIRECTIONS) at the cell of the forbidden move, 0 elsewhere
+#     4 : 1 everywhere if white is to move, 0 if black is
+#     5-6 : red marbles captured by the white and the black player, everywhere
+PLANES = 7
+DIRECTIONS = ("L", "R", "F", "B")
+
+# Labels: the move played from the position as direction index * 49 + row * 7 + column (int16), and the outcome
+# for the side to move (int8): 1 for a win, -1 for a loss, 0 for a game that ended without a winner
+MOVE_COUNT = 4 * 49
+
+# Every shard is three files: PREFIX-NNNNN-features.npy (N, PLANES, 7, 7), PREFIX-NNNNN-moves.npy (N,) and
+# PREFIX-NNNNN-outcomes.npy (N,), with N = shard size in every shard but the last
+SHARD_PARTS = ("features", "moves", "outcomes")
+
+
+def encode_positions(positions, colors):
+    """Turns packed positions of one game into feature planes
+
+    Parameters:
+        positions : (N, POSITION_SIZE) uint8 array of KubaGame.to_bytes() positions, each with a side to move
+        colors : tuple of the colors of player one and player two, such as ("W", "B")
+    Returns:
+        (N, PLANES, 7, 7) uint8 array
+    """
+    positions = np.asarray(positions, dtype=np.uint8).reshape(-1, POSITION_SIZE)
+    count = len(positions)
+    cells = ((positions[:, :13, np.newaxis] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3).reshape(count, 52)[:, :49]
+    features = np.zeros((count, PLANES, 49), dtype=np.uint8)
+    for plane, code in enumerate((1, 2, 3)):  # MARBLE_CODES of W, B and R
+        features[:, plane] = cells == code
+
+    forbidden = positions[:, 14].astype(np.int64)
+    rows = np.nonzero(forbidden)[0]
+    features[rows, 3, (forbidden[rows] - 1) // 4] = (forbidden[rows] - 1) % 4 + 1
+
+    white_index = colors.index("W")
+    turn = positions[:, 15] & 3
+    features[:, 4] = (turn == white_index + 1)[:, np.newaxis]
+    captures = (positions[:, 13, np.newaxis] >> np.array([0, 4], dtype=np.uint8)) & 15
+    features[:, 5] = captures[:, white_index, np.newaxis]
+    features[:, 6] = captures[:, 1 - white_index, np.newaxis]
+    return features.reshape(count, PLANES, 7, 7)
+
+
+def game_samples(record):
+    """Replays one recorded game and returns a training sample for every position a move was played from
+
+    Parameters:
+        record : KubaRecord.GameRecord
+    Returns:
+        a tuple (features, moves, outcomes) of arrays as described for the shard files, one row per move
+    """
+    game = KubaGame.from_bytes(record.position, record.player_one, record.player_two)
+    count = record.get_move_count()
+    positions = np.empty((count, POSITION_SIZE), dtype=np.uint8)
+    moves = np.empty(count, dtype=np.int16)
+    movers = []
+    for index, (playername, coordinates, direction) in enumerate(record.get_moves()):
+        game.set_current_turn(playername)  # Before the first move the position has no side to move
+        positions[index] = np.frombuffer(game.to_bytes(), dtype=np.uint8)
+        moves[index] = DIRECTIONS.index(direction) * 49 + coordinates[0] * 7 + coordinates[1]
+        movers.append(playername)
+        if not game.make_move(playername, coordinates, direction):
+            raise ValueError("recorded move " + str((playername, coordinates, direction)) + " can not be made")
+
+    winner = game.get_winner()
+    outcomes = np.array([0 if winner is None else 1 if mover == winner else -1 for mover in movers], dtype=np.int8)
+    return encode_positions(positions, (record.player_one[1], record.player_two[1])), moves, outcomes
+
+
+def iter_samples(records):
+    """Streams the training samples of many games, one game at a time
+
+    Parameters:
+        records : iterable of KubaRecord.GameRecord, such as read_archive(path)
+    Returns:
+        a generator of (features, moves, outcomes) tuples from game_samples
+    """
+    for record in records:
+        if record.get_move_count() > 0:
+            yield game_samples(record)
+
+
+def iter_shards(samples, shard_size):
+    """Gathers streamed samples into shards of shard_size rows, reusing one buffer
+
+    The arrays yielded are views of the buffer, so each shard must be used (written out) before the next is asked
+    for.
+
+    Parameters:
+        samples : iterable of (features, moves, outcomes) tuples, such as iter_samples(records)
+        shard_size : rows per shard; the last shard holds what is left
+    Returns:
+        a generator of (features, moves, outcomes) tuples with shard_size rows
+    """
+    features = np.empty((shard_size, PLANES, 7, 7), dtype=np.uint8)
+    moves = np.empty(shard_size, dtype=np.int16)
+    outcomes = np.empty(shard_size, dtype=np.int8)
+    filled = 0
+    for game_features, game_moves, game_outcomes in samples:
+        start = 0
+        while start < len(game_moves):
+            taken = min(shard_size - filled, len(game_moves) - start)
+            features[filled:filled + taken] = game_features[start:start + taken]
+            moves[filled:filled + taken] = game_moves[start:start + taken]
+            outcomes[filled:filled + taken] = game_outcomes[start:start + taken]
+            filled += taken
+            start += taken
+            if filled == shard_size:
+                yield features, moves, outcomes
+                filled = 0
+    if filled:
+        yield features[:filled], moves[:filled], outcomes[:filled]
+
+
+def shard_path(prefix, index, part):
+    """Returns the path of one part ('features', 'moves' or 'outcomes') of shard 'index'"""
+    return "{}-{:05d}-{}.npy".format(prefix, index, part)
+
+
+def write_shards(records, prefix, shard_size=65536):
+    """Exports recorded games to .npy shards
+
+    Parameters:
+        records : iterable of KubaRecord.GameRecord, such as read_archive(path)
+        prefix : path prefix of the shard files
+        shard_size : positions per shard
+    Returns:
+        a dict with 'shards' written and 'positions' exported
+    """
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+
+    shards = 0
+    positions = 0
+    for shard in iter_shards(iter_samples(records), shard_size):
+        for part, array in zip(SHARD_PARTS, shard):
+            np.save(shard_path(prefix, shards, part), array)
+        shards += 1
+        positions += len(shard[1])
+    return {"shards": shards, "positions": positions}
+
+
+def load_shard(prefix, index):
+    """Memory-maps one shard written by write_shards
+
+    Parameters:
+        prefix : path prefix of the shard files
+        index : shard number
+    Returns:
+        a tuple (features, moves, outcomes) of read-only memory-mapped arrays
+    """
+    return tuple(np.load(shard_path(prefix, index, part), mmap_mode="r") for part in SHARD_PARTS)
+
+
+def main(arguments=None):
+    """Exports game record archives from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status 0
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaExport",
+                                     description="Exports recorded Kuba games as NumPy training shards.")
+    parser.add_argument("archives", nargs="+", help="KubaRecord archive files")
+    parser.add_argument("--output", required=True, help="path prefix of the shard files")
+    parser.add_argument("--shard-size", type=int, default=65536, help="positions per shard")
+    options = parser.parse_args(arguments)
+
+    def records():
+        for path in options.archives:
+            yield from read_archive(path)
+
+    totals = write_shards(records(), options.output, options.shard_size)
+    print("{:,} positions in {:,} shards".format(totals["positions"], totals["shards"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
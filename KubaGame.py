@@ -2,12 +2,122 @@
 # Date: 05/20/2021
 # Description: The game Kuba represented as a class KubaGame that is playable with various commands.
 
+from KubaBitboard import KubaBitboard
+import contextlib
+import random
+import threading
+
+# Board engines KubaGame can store its board in
+ENGINES = ("list", "bitboard")
+
+# (row step, column step) of a push in each direction, and the direction that undoes it
+DIRECTION_STEPS = {"L": (0, -1), "R": (0, 1), "F": (-1, 0), "B": (1, 0)}
+OPPOSITE_DIRECTIONS = {"L": "R", "R": "L", "F": "B", "B": "F"}
+
+# Packed position encoding used by to_bytes and from_bytes: 2 bits per cell in bytes 0-12, capture counts in
+# byte 13 (a nibble per player), forbidden move in byte 14 (0 for none, else 1 + cell * 4 + direction index), and
+# side to move and winner in byte 15 (2 bits each; 0 for None, else 1 + player index)
+POSITION_SIZE = 16
+MARBLE_CODES = {"X": 0, "W": 1, "B": 2, "R": 3}
+MARBLES = ("X", "W", "B", "R")
+# Stands in for the write lock of games that do not publish snapshots
+NO_LOCK = contextlib.nullcontext()
+# The four cells packed into each possible byte value, lowest bits first
+BYTE_CELLS = [tuple(MARBLES[(value >> shift) & 3] for shift in (0, 2, 4, 6)) for value in range(256)]
+
+
+def build_zobrist_keys(seed=20210520):
+    """Builds the random 64-bit keys XORed together to make a KubaGame position hash
+
+    Parameters:
+        seed : seed for the random keys, so hashes are the same in every process
+
+    Returns:
+        a dict with keys 'cells', 'turn', 'captures' and 'forbidden'.
+        cells : dict keyed by (row, column, marble); empty cells ("X") have key 0
+        turn : list of two keys, one per player in get_playernames() order
+        captures : dict keyed by (player index, red marbles captured)
+        forbidden : dict keyed by (coordinates, direction); no forbidden move ((), "") has key 0
+    """
+    rng = random.Random(seed)
+    cells = {}
+    forbidden = {((), ""): 0}
+    for row in range(7):
+        for column in range(7):
+            cells[(row, column, "X")] = 0
+            for marble in ("W", "B", "R"):
+                cells[(row, column, marble)] = rng.getrandbits(64)
+            for direction in ("L", "R", "F", "B"):
+                forbidden[((row, column), direction)] = rng.getrandbits(64)
+
+    turn = [rng.getrandbits(64), rng.getrandbits(64)]
+    captures = {}
+    for player_index in range(2):
+        for count in range(14):
+            captures[(player_index, count)] = rng.getrandbits(64)
+
+    return {"cells": cells, "turn": turn, "captures": captures, "forbidden": forbidden}
+
+
+ZOBRIST_KEYS = build_zobrist_keys()
+
+
+def build_byte_tables():
+    """Builds the tables from_bytes uses to decode each packed board byte with one lookup
+
+    Returns:
+        a list with one list per board byte (0-12) of 256 tuples (white, black, red, hash): the KubaBitboard
+        bitboards of the four cells of that byte value and the XOR of their Zobrist cell keys. Cells past the last
+        one on the board are left out.
+    """
+    cell_keys = ZOBRIST_KEYS["cells"]
+    tables = []
+    for byte_index in range(13):
+        table = []
+        for value in range(256):
+            bitboards = {"W": 0, "B": 0, "R": 0, "X": 0}
+            position_hash = 0
+            for offset, marble in enumerate(BYTE_CELLS[value]):
+                cell = byte_index * 4 + offset
+                if cell >= 49:
+                    break
+                row, column = divmod(cell, 7)
+                bitboards[marble] |= 1 << (row * 8 + column)  # KubaBitboard squares are 8 to a row
+                position_hash ^= cell_keys[(row, column, marble)]
+            table.append((bitboards["W"], bitboards["B"], bitboards["R"], position_hash))
+        tables.append(table)
+    return tables
+
+
+BYTE_TABLES = build_byte_tables()
+
+
 class KubaGame:
     """A class representing a Kuba game.
 
     Data Members (private):
         _players : dict, with playername as key. Key value is a dict with 'name', 'color', and 'capture count'
-        _board : holds the state of the board in string representation
+        _board : holds the state of the board in string representation (a property over the board engine)
+        _grid : list of seven lists of strings holding the board when using the 'list' engine
+        _engine : KubaBitboard holding the board when using the 'bitboard' engine, otherwise None
+        _marble_counts : dict with 'W', 'B', and 'R' as keys; number of marbles of each color on the board,
+            kept up to date as marbles are pushed off instead of being counted from the board
+        _verify : boolean; if True, get_marble_count checks _marble_counts against a full count of the board
+        _undo_records : list used as a stack of undo records, one per move made with apply_move
+        _recorder : object with record_move(game, playername, coordinates, direction) called for every move made
+            with make_move (such as KubaRecord.GameRecordWriter), or None
+        _observers : list of functions called with the move event of every move made with make_move
+        _snapshot : GameSnapshot of the position after the last move made with make_move, read by get_marble,
+            get_marble_count, get_captured, get_winner and get_current_turn in every thread but _writer; None
+            unless snapshots are turned on
+        _writer : threading.get_ident() of the thread changing the position, which reads it directly, or None
+        _write_lock : threading.RLock taken by make_move, apply_move and undo_move while snapshots are turned on, so
+            moves are made one at a time; None until snapshots are turned on
+        _search_lock : _write_lock while it is held for the undo records of apply_move, from the apply_move that
+            starts them until the undo_move that takes back the last one, so other threads wait to move; else None
+        _player_indexes : dict, with playername as key and the player's index in get_playernames() as value
+        _hash : 64-bit Zobrist hash of the board, side to move, capture counts and _forbidden_move, updated as
+            they change
         _valid_directions : lists the valid directions a player can push ['L', 'R', 'F', 'B']
         _winner : the winner of the game; initialized as None
         _current_turn : the player who is allowed to make a move; initialized as None
@@ -15,10 +125,23 @@ class KubaGame:
 
     Methods:
         get_current_turn() --> playername
+        set_current_turn(playername)
         make_move(playername, coordinates, direction) --> boolean
-        push_marble(coordinates, direction)
-        push_marble_horizontal(coordinates, direction)
-        push_marble_vertical(coordinates, direction)
+        set_recorder(recorder)
+        subscribe(observer)
+        unsubscribe(observer)
+        get_move_event(playername, coordinates, direction, displaced) --> dict
+        encode_move_event(event) --> bytes
+        publish_snapshot()
+        get_snapshot() --> GameSnapshot
+        apply_move(playername, coordinates, direction) --> boolean
+        undo_move() --> boolean
+        push_marble(coordinates, direction) --> tuple of displaced marbles
+        push_marble_horizontal(coordinates, direction) --> tuple of displaced marbles
+        get_displaced_horizontal(row, column, pointer) --> tuple of displaced marbles
+        push_marble_vertical(coordinates, direction) --> tuple of displaced marbles
+        push_marble_bitboard(coordinates, direction) --> tuple of displaced marbles
+        set_line(coordinates, direction, marbles)
         is_valid_move(playername, coordinates, direction) --> boolean
         is_valid_playername(playername) --> boolean
         is_valid_coordinates(coordinates) --> boolean
@@ -32,25 +155,54 @@ class KubaGame:
         check_for_player_with_no_pieces() --> boolean
         check_for_player_that_cannot_move() --> boolean
         can_current_player_move() --> boolean
+        legal_moves(playername) --> list of tuples (coordinates, direction)
+        get_pushed_off_marble(coordinates, direction) --> marble color ["W", "B", "R"] or "X"
+        get_marble_pushes(coordinates, marble_color) --> list of directions
+        get_line_pushes(line, marble_color) --> tuple of lists (towards start, towards end)
         can_marble_be_pushed(coordinates, direction) --> boolean
         can_marble_be_pushed_horizontal(coordinates, direction, marble_color) --> boolean
         can_marble_be_pushed_vertical(coordinates, direction, marble_color) --> boolean
         switch_turns()
+        get_engine() --> engine name ["list", "bitboard"]
         get_playernames()
+        to_bytes() --> bytes
+        from_bytes(data, player_one, player_two, engine) --> KubaGame
         get_captured(playername) --> captured pieces as int
+        get_color(playername) --> marble color ["W", "B"]
         handle_captured_piece(captured_piece_color)
         get_marble(coordinates) --> marble color ["W", "B", "R"]
         get_marble_count() --> tuple of ints (num_white, num_black, num_red)
+        count_marbles() --> tuple of ints (num_white, num_black, num_red)
+        get_hash() --> int
+        compute_hash() --> int
+        hash_push(coordinates, direction, displaced)
+        get_turn_key(playername) --> int
+        get_capture_key(playername) --> int
     """
 
-    def __init__(self, player_one, player_two):
+    def __init__(self, player_one, player_two, engine="list", verify=False, board=None, snapshots=False):
         """Initialize the KubaGame data members
         Parameters:
             player_one : ('Player One Name', 'W')
             player_two : ('Player Two Name', 'B')
+            engine : one of ENGINES; 'list' stores the board as lists of strings, 'bitboard' as integer bitboards
+            verify : if True, check the incrementally kept marble counts against the board whenever they are read
+            board : board to start from as seven lists of strings; defaults to the starting position
+            snapshots : if True, publish a snapshot after every move for other threads to read (publish_snapshot)
         Returns:
             None
         """
+        if engine not in ENGINES:
+            raise ValueError("engine must be one of " + ", ".join(ENGINES))
+
+        self._grid = None
+        self._engine = None
+        self._marble_counts = {"W": 0, "B": 0, "R": 0}
+        self._verify = verify
+        self._hash = 0
+        if engine == "bitboard":
+            self._engine = KubaBitboard([["X"] * 7 for _ in range(7)])
+
         self._players = {
             player_one[0]: {
                 "name": player_one[0],
@@ -63,19 +215,51 @@ class KubaGame:
                 "capture count": 0
             }
         }
-        self._board = [["W", "W", "X", "X", "X", "B", "B"],
-                       ["W", "W", "X", "R", "X", "B", "B"],
-                       ["X", "X", "R", "R", "R", "X", "X"],
-                       ["X", "R", "R", "R", "R", "R", "X"],
-                       ["X", "X", "R", "R", "R", "X", "X"],
-                       ["B", "B", "X", "R", "X", "W", "W"],
-                       ["B", "B", "X", "X", "X", "W", "W"]]
+        self._player_indexes = {player_one[0]: 0, player_two[0]: 1}
         self._valid_directions = ["L", "R", "F", "B"]  # Left, Right, Forward, Back
         self._winner = None
         self._current_turn = None
         # Forbidden move is an illegal move that repeats the previous position
         self._forbidden_move = {"coordinates": (),
                                 "direction": ""}
+        self._undo_records = []
+        self._recorder = None
+        self._observers = []
+        self._snapshot = None
+        self._writer = None
+        self._write_lock = None
+        self._search_lock = None
+        if board is not None:
+            self._board = board
+        else:
+            self._board = [["W", "W", "X", "X", "X", "B", "B"],
+                           ["W", "W", "X", "R", "X", "B", "B"],
+                           ["X", "X", "R", "R", "R", "X", "X"],
+                           ["X", "R", "R", "R", "R", "R", "X"],
+                           ["X", "X", "R", "R", "R", "X", "X"],
+                           ["B", "B", "X", "R", "X", "W", "W"],
+                           ["B", "B", "X", "X", "X", "W", "W"]]
+        if snapshots:
+            self.publish_snapshot()
+
+    @property
+    def _board(self):
+        """The board as seven lists of strings ["W", "B", "R", "X"], read from whichever engine holds it"""
+        if self._engine is not None:
+            return self._engine.to_list()
+        return self._grid
+
+    @_board.setter
+    def _board(self, board):
+        """Replaces the board held by the engine with board, then recounts the marbles and rehashes the position"""
+        if self._engine is not None:
+            self._engine.set_board(board)
+        else:
+            self._grid = board
+
+        num_white, num_black, num_red = self.count_marbles()
+        self._marble_counts = {"W": num_white, "B": num_black, "R": num_red}
+        self._hash = self.compute_hash()
 
     def get_current_turn(self):
         """Returns the player name corresponding to who's turn it is, or None if game hasn't started yet
@@ -85,8 +269,22 @@ class KubaGame:
         Returns:
             string value playername stored in _current_turn, or None if game hasn't started
         """
+        snapshot = self._snapshot
+        if snapshot is not None and threading.get_ident() != self._writer:
+            return snapshot.get_current_turn()
         return self._current_turn
 
+    def set_current_turn(self, playername):
+        """Sets _current_turn to playername, keeping _hash up to date
+
+        Parameters:
+            playername : name of the player to move next, or None
+        Returns:
+            None
+        """
+        self._hash ^= self.get_turn_key(self._current_turn) ^ self.get_turn_key(playername)
+        self._current_turn = playername
+
     def make_move(self, playername, coordinates, direction):
         """Attempts to make a move for playername by pushing marble at coordinates in the given direction.
 
@@ -98,16 +296,265 @@ class KubaGame:
         Returns:
             A boolean value based on if move was actually made
         """
-        if not self.is_valid_move(playername, coordinates, direction):
-            return False
+        with self._write_lock if self._snapshot is not None else NO_LOCK:
+            if self._snapshot is not None:
+                self._writer = threading.get_ident()  # Validate against the position, not the snapshot
+            if not self.is_valid_move(playername, coordinates, direction):
+                if not self._undo_records:
+                    self._writer = None
+                return False
+
+            self.set_current_turn(playername)  # Needed for the first turn only
+            displaced = self.push_marble(coordinates, direction)
+            self.switch_turns()
+            self.check_for_winner()
+            if self._snapshot is not None:
+                row = coordinates[0]
+                if direction in ("L", "R"):
+                    changed_rows = (row,)
+                elif direction == "F":
+                    changed_rows = range(row - len(displaced) + 1, row + 1)
+                else:
+                    changed_rows = range(row, row + len(displaced))
+                self.publish_snapshot(changed_rows)
+                if not self._undo_records:
+                    self._writer = None
+
+            if self._observers:
+                event = self.get_move_event(playername, coordinates, direction, displaced)
+                for observer in list(self._observers):
+                    observer(event)
+
+            if self._recorder is not None:
+                self._recorder.record_move(self, playername, coordinates, direction)
 
-        self._current_turn = playername  # Needed for the first turn only
-        self.push_marble(coordinates, direction)
-        self.switch_turns()
-        self.check_for_winner()
+            return True
+
+    def set_recorder(self, recorder):
+        """Attaches a recorder that is told about every move made with make_move from now on
+
+        The recorder's start_game(game) is called first, so it can note the players and the current position.
+
+        Parameters:
+            recorder : object with start_game(game) and record_move(game, playername, coordinates, direction)
+                methods, or None to detach the current recorder
+        Returns:
+            None
+        """
+        self._recorder = recorder
+        if recorder is not None:
+            recorder.start_game(self)
+
+    def __getstate__(self):
+        """Returns the state to pickle or copy; the recorder and observers are left behind, since they usually hold
+        open files or connections, and so are snapshots, which belong to the threads sharing this game"""
+        state = self.__dict__.copy()
+        state["_recorder"] = None
+        state["_observers"] = []
+        state["_snapshot"] = None
+        state["_writer"] = None
+        state["_write_lock"] = None
+        state["_search_lock"] = None
+        return state
+
+    def publish_snapshot(self, changed_rows=None):
+        """Publishes the current position as an immutable GameSnapshot, and turns snapshots on if they were off
+
+        While snapshots are on, get_marble, get_marble_count, get_captured, get_winner and get_current_turn read the
+        latest snapshot without locking in every thread except the one changing the position, so they never see a
+        move half made. make_move publishes a snapshot after every move, sharing the rows the move did not change
+        with the snapshot before it; the positions searched with apply_move and undo_move are not published. Call
+        this after changing the position any other way, such as with set_current_turn.
 
+        Parameters:
+            changed_rows : indexes of the rows changed since the last snapshot, or None (the default) to copy every
+                row
+        Returns:
+            None
+        """
+        if self._write_lock is None:
+            self._write_lock = threading.RLock()
+        previous = self._snapshot
+        if previous is None or changed_rows is None:
+            board = [None] * 7
+            changed_rows = range(7)
+        else:
+            board = list(previous.get_board())
+        if self._engine is None:
+            for row in changed_rows:
+                board[row] = tuple(self._grid[row])
+        else:
+            for row in changed_rows:
+                board[row] = self._engine.get_row(row)
+
+        self._snapshot = GameSnapshot(
+            0 if previous is None else previous.get_version() + 1,
+            tuple(board),
+            (self._marble_counts["W"], self._marble_counts["B"], self._marble_counts["R"]),
+            {name: player["capture count"] for name, player in self._players.items()},
+            self._winner,
+            self._current_turn)
+
+    def get_snapshot(self):
+        """Returns the latest GameSnapshot, for reading several things from one position, or None if snapshots are
+        off
+
+        Parameters:
+            N/A
+        Returns:
+            GameSnapshot or None
+        """
+        return self._snapshot
+
+    def subscribe(self, observer):
+        """Calls observer with the move event of every move made with make_move from now on
+
+        Parameters:
+            observer : function taking the dict returned by get_move_event
+        Returns:
+            None
+        """
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        """Stops calling an observer added with subscribe
+
+        Parameters:
+            observer : function passed to subscribe
+        Returns:
+            a boolean value based on if observer was subscribed
+        """
+        if observer not in self._observers:
+            return False
+        self._observers.remove(observer)
         return True
 
+    def get_move_event(self, playername, coordinates, direction, displaced):
+        """Describes what a move just made changed, so observers need not read the whole board
+
+        Parameters:
+            playername : name of player who made the move
+            coordinates : coordinates of the pushed marble as a tuple (row, column)
+            direction : direction of the push
+            displaced : the marbles push_marble returned for the move
+        Returns:
+            a dict with 'player', 'changes' (tuple of ((row, column), marble) for every cell whose marble changed),
+            'captured' (color of the marble pushed off, or None), 'turn' (player to move next) and 'winner'
+        """
+        row, column = coordinates
+        row_step, column_step = DIRECTION_STEPS[direction]
+        changes = [(coordinates, "X")]
+        # Every other cell of the line now holds the marble that was before it
+        for offset in range(1, len(displaced)):
+            if displaced[offset] != displaced[offset - 1]:
+                changes.append(((row + row_step * offset, column + column_step * offset), displaced[offset - 1]))
+
+        return {
+            "player": playername,
+            "changes": tuple(changes),
+            "captured": displaced[-1] if displaced[-1] != "X" else None,
+            "turn": self._current_turn,
+            "winner": self._winner
+        }
+
+    def encode_move_event(self, event):
+        """Packs a move event into 1 byte plus 1 byte per changed cell
+
+        The first byte is the number of changes, the captured marble code << 3, the index of the player to move
+        next << 5, and 0 or 1 + the index of the winner << 6. Each change is row * 7 + column | marble code << 6.
+
+        Parameters:
+            event : dict returned by get_move_event
+        Returns:
+            bytes; decode_move_event turns them back into the event
+        """
+        captured = MARBLE_CODES[event["captured"] or "X"]
+        turn = self._player_indexes[event["turn"]]
+        winner = 0 if event["winner"] is None else 1 + self._player_indexes[event["winner"]]
+        data = bytearray((len(event["changes"]) | captured << 3 | turn << 5 | winner << 6,))
+        for (row, column), marble in event["changes"]:
+            data.append(row * 7 + column | MARBLE_CODES[marble] << 6)
+        return bytes(data)
+
+    def apply_move(self, playername, coordinates, direction):
+        """Makes a move like make_move, and records what it changed so undo_move can take it back.
+
+        While snapshots are turned on, the calling thread holds _write_lock until undo_move has taken back every
+        move it applied, and make_move, apply_move and undo_move in other threads wait for it.
+
+        The undo record is a tuple (playername, coordinates, direction, displaced marbles, captured color,
+        previous forbidden coordinates, previous forbidden direction, previous _current_turn, previous _winner).
+
+        Parameters:
+            playername : name of player attempting to make move
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one index in _valid_directions
+
+        Returns:
+            A boolean value based on if move was actually made
+        """
+        with self._write_lock if self._snapshot is not None else NO_LOCK:
+            if self._snapshot is not None:
+                self._writer = threading.get_ident()  # Validate against the position, not the snapshot
+            if not self.is_valid_move(playername, coordinates, direction):
+                if not self._undo_records:
+                    self._writer = None
+                return False
+
+            forbidden_coordinates = self._forbidden_move["coordinates"]
+            forbidden_direction = self._forbidden_move["direction"]
+            current_turn = self._current_turn
+            winner = self._winner
+
+            self.set_current_turn(playername)  # Needed for the first turn only
+            displaced = self.push_marble(coordinates, direction)
+            self.switch_turns()
+            self.check_for_winner()
+
+            self._undo_records.append((playername, coordinates, direction, displaced, displaced[-1],
+                                       forbidden_coordinates, forbidden_direction, current_turn, winner))
+            if self._snapshot is not None and self._search_lock is None:
+                # Held until undo_move takes back the last record, so no other thread moves on a searched position
+                self._search_lock = self._write_lock
+                self._search_lock.acquire()
+            return True
+
+    def undo_move(self):
+        """Takes back the last move made with apply_move, restoring the exact position before it
+
+        Parameters:
+            N/A
+
+        Returns:
+            A boolean value based on if there was a move to take back
+        """
+        with self._write_lock if self._snapshot is not None else NO_LOCK:
+            if not self._undo_records:
+                return False
+
+            (playername, coordinates, direction, displaced, captured_piece_color,
+             forbidden_coordinates, forbidden_direction, current_turn, winner) = self._undo_records.pop()
+
+            self.set_line(coordinates, direction, displaced)
+            self.hash_push(coordinates, direction, displaced)
+            if captured_piece_color != "X":
+                self._marble_counts[captured_piece_color] += 1
+                if captured_piece_color == "R":
+                    self._hash ^= self.get_capture_key(playername)
+                    self._players[playername]["capture count"] -= 1
+                    self._hash ^= self.get_capture_key(playername)
+
+            self.set_forbidden_move(forbidden_coordinates, forbidden_direction)
+            self.set_current_turn(current_turn)
+            self._winner = winner
+            if not self._undo_records:
+                self._writer = None  # Back at the published position, so every thread can read the snapshot again
+                if self._search_lock is not None:
+                    search_lock = self._search_lock
+                    self._search_lock = None
+                    search_lock.release()
+            return True
+
     def push_marble(self, coordinates, direction):
         """Pushes marble at 'coordinates' in 'direction' on _board
 
@@ -115,14 +562,43 @@ class KubaGame:
             coordinates : coordinates of marble to be pushed as a tuple (row, column)
             direction : one index in _valid_directions
 
+        Returns:
+            a tuple of the marbles that were in the pushed line before the push, starting at 'coordinates'.
+            The last one is "X" if the line moved into an empty cell, or the color of the marble pushed off.
+        """
+        if self._engine is not None:
+            displaced = self.push_marble_bitboard(coordinates, direction)
+        elif direction == "L" or direction == "R":
+            displaced = self.push_marble_horizontal(coordinates, direction)
+        else:
+            displaced = self.push_marble_vertical(coordinates, direction)
+
+
+        self.hash_push(coordinates, direction, displaced)
+        return displaced
+
+    def set_line(self, coordinates, direction, marbles):
+        """Writes marbles onto the board starting at 'coordinates' and stepping in 'direction'
+
+        Parameters:
+            coordinates : coordinates of the first cell as a tuple (row, column)
+            direction : one index in _valid_directions
+            marbles : the marbles to write, as returned by push_marble
+
         Returns:
             None
         """
-        if direction == "L" or direction == "R":
-            self.push_marble_horizontal(coordinates, direction)
+        if self._engine is not None:
+            self._engine.set_line(coordinates, direction, marbles)
+            return None
 
-        if direction == "F" or direction == "B":
-            self.push_marble_vertical(coordinates, direction)
+        row, column = coordinates
+        row_step, column_step = DIRECTION_STEPS[direction]
+        for marble in marbles:
+            self._grid[row][column] = marble
+            row += row_step
+            column += column_step
+        return None
 
     def push_marble_horizontal(self, coordinates, direction):
         """Pushes marble at 'coordinates' in direction 'L' or 'R' on _board
@@ -132,7 +608,7 @@ class KubaGame:
             direction : 'L' or 'R'
 
         Returns:
-            None
+            a tuple of the marbles that were in the pushed line before the push, as in push_marble
         """
         row = coordinates[0]
         column = coordinates[1]
@@ -154,19 +630,36 @@ class KubaGame:
 
         while 0 <= pointer <= 6:
             pointer += step
-            if self._board[row][pointer] == "X":
-                self._board[row].pop(pointer)
-                self._board[row].insert(column, "X")
+            if self._grid[row][pointer] == "X":
+                displaced = self.get_displaced_horizontal(row, column, pointer)
+                self._grid[row].pop(pointer)
+                self._grid[row].insert(column, "X")
                 self.set_forbidden_move((row, pointer), variable_dict[direction]["forbidden direction"])
-                return None
+                return displaced
 
             if pointer == boundary:
+                displaced = self.get_displaced_horizontal(row, column, pointer)
                 captured_piece_color = self.get_marble((row, pointer))
                 self.handle_captured_piece(captured_piece_color)
-                self._board[row].pop(pointer)
-                self._board[row].insert(column, "X")
+                self._grid[row].pop(pointer)
+                self._grid[row].insert(column, "X")
                 self.set_forbidden_move((), "")  # No forbidden moves, piece can not come back
-                return None
+                return displaced
+
+    def get_displaced_horizontal(self, row, column, pointer):
+        """Returns the marbles in 'row' from 'column' to 'pointer' (inclusive), starting at 'column'
+
+        Parameters:
+            row : row of the pushed line
+            column : column of the pushed marble
+            pointer : column where the pushed line ends
+
+        Returns:
+            a tuple of marble colors ['W', 'B', 'R', 'X']
+        """
+        if pointer > column:
+            return tuple(self._grid[row][column:pointer + 1])
+        return tuple(reversed(self._grid[row][pointer:column + 1]))
 
     def push_marble_vertical(self, coordinates, direction):
         """Pushes marble at 'coordinates' in direction 'F' or 'B' on _board
@@ -176,7 +669,7 @@ class KubaGame:
             direction : 'F' or 'B'
 
         Returns:
-            None
+            a tuple of the marbles that were in the pushed line before the push, as in push_marble
         """
         row = coordinates[0]
         column = coordinates[1]
@@ -198,23 +691,49 @@ class KubaGame:
 
         while 0 <= pointer <= 6:
             pointer += step
-            if self._board[pointer][column] == "X":
+            if self._grid[pointer][column] == "X":
+                displaced = tuple(self._grid[index][column] for index in range(row, pointer + step, step))
                 self.set_forbidden_move((pointer, column), variable_dict[direction]["forbidden direction"])
                 while pointer != row:
-                    self._board[pointer][column] = self._board[pointer - step][column]
+                    self._grid[pointer][column] = self._grid[pointer - step][column]
                     pointer -= step
-                self._board[row][column] = "X"
-                return None
+                self._grid[row][column] = "X"
+                return displaced
 
             if pointer == boundary:
+                displaced = tuple(self._grid[index][column] for index in range(row, pointer + step, step))
                 captured_piece_color = self.get_marble((pointer, column))
                 self.handle_captured_piece(captured_piece_color)  # fix this to handle all captured pieces
                 self.set_forbidden_move((), "")  # No forbidden moves, piece can not come back
                 while pointer != row:
-                    self._board[pointer][column] = self._board[pointer - step][column]
+                    self._grid[pointer][column] = self._grid[pointer - step][column]
                     pointer -= step
-                self._board[row][column] = "X"
-                return None
+                self._grid[row][column] = "X"
+                return displaced
+
+    def push_marble_bitboard(self, coordinates, direction):
+        """Pushes marble at 'coordinates' in 'direction' on the bitboard engine
+
+        Parameters:
+            coordinates : coordinates of marble to be pushed as a tuple (row, column)
+            direction : one index in _valid_directions
+
+        Returns:
+            a tuple of the marbles that were in the pushed line before the push, as in push_marble
+        """
+        displaced = self._engine.push_marble(coordinates, direction)
+        captured_piece_color = displaced[-1]
+
+        if captured_piece_color == "X":
+            row_step, column_step = DIRECTION_STEPS[direction]
+            end = (coordinates[0] + row_step * (len(displaced) - 1),
+                   coordinates[1] + column_step * (len(displaced) - 1))
+            self.set_forbidden_move(end, OPPOSITE_DIRECTIONS[direction])
+            return displaced
+
+        self.handle_captured_piece(captured_piece_color)
+        self.set_forbidden_move((), "")  # No forbidden moves, piece can not come back
+        return displaced
 
     def is_valid_move(self, playername, coordinates, direction):
         """Checks the validity of a potential move by checking parameters and game rules
@@ -239,7 +758,8 @@ class KubaGame:
             return False
 
         # Players may only move their own color
-        if self.get_marble(coordinates) != self._players[playername]["color"]:
+        marble_color = self._players[playername]["color"]
+        if self.get_marble(coordinates) != marble_color:
             return False
 
         # Players may only move on their turn
@@ -247,11 +767,18 @@ class KubaGame:
         ) is not None and self.get_current_turn() != playername:
             return False
 
-        # Players may not push their pieces off the board or repeat the previous position
-        if not self.can_marble_be_pushed(coordinates, direction):
+        # Players may not push their pieces off the board or repeat the previous position. The inputs were checked
+        # above, so the push is checked without going through can_marble_be_pushed.
+        if self.is_forbidden_move(coordinates, direction):
             return False
 
-        return True
+        if self._engine is not None:
+            return self._engine.can_marble_be_pushed(coordinates, direction, marble_color)
+
+        if direction == "L" or direction == "R":
+            return self.can_marble_be_pushed_horizontal(coordinates, direction, marble_color)
+
+        return self.can_marble_be_pushed_vertical(coordinates, direction, marble_color)
 
     def is_valid_playername(self, playername):
         """Verifies that one of the two given player names is being called
@@ -316,6 +843,9 @@ class KubaGame:
         Returns:
             None
         """
+        forbidden_keys = ZOBRIST_KEYS["forbidden"]
+        self._hash ^= forbidden_keys[(self._forbidden_move["coordinates"], self._forbidden_move["direction"])]
+        self._hash ^= forbidden_keys[(coordinates, direction)]
         self._forbidden_move["coordinates"] = coordinates
         self._forbidden_move["direction"] = direction
 
@@ -357,6 +887,9 @@ class KubaGame:
         Returns:
             _winner (playername string)
         """
+        snapshot = self._snapshot
+        if snapshot is not None and threading.get_ident() != self._writer:
+            return snapshot.get_winner()
         return self._winner
 
     def check_for_winner(self):
@@ -444,6 +977,9 @@ class KubaGame:
     def can_current_player_move(self):
         """Determines if _current_turn player has any legal moves
 
+        On the 'list' engine the board is scanned until a marble that can be pushed is found. On the 'bitboard'
+        engine every marble is checked at once with KubaBitboard.has_legal_move.
+
         Parameters
             N/A
 
@@ -454,14 +990,156 @@ class KubaGame:
             return True
 
         current_turn_color = self._players[self._current_turn]["color"]
+        if self._engine is not None:
+            return self._engine.has_legal_move(current_turn_color, self._forbidden_move["coordinates"],
+                                               self._forbidden_move["direction"])
+
+        forbidden_move = (self._forbidden_move["coordinates"], self._forbidden_move["direction"])
         for row in range(7):
-            for column in range(7):
-                if self._board[row][column] == current_turn_color:
-                    for direction in self._valid_directions:
-                        if self.can_marble_be_pushed((row, column), direction):
+            for column, marble in enumerate(self._grid[row]):
+                if marble == current_turn_color:
+                    for direction in self.get_marble_pushes((row, column), current_turn_color):
+                        if ((row, column), direction) != forbidden_move:
                             return True
         return False
 
+    def legal_moves(self, playername):
+        """Returns every move playername could make right now, in a single pass over the board
+
+        Follows the same rules as is_valid_move: no moves are returned once the game is over, when it is not
+        playername's turn, or for the forbidden move.
+
+        Parameters
+            playername : name of player whose moves are wanted
+
+        Returns:
+            a list of tuples (coordinates, direction) that make_move would accept for playername
+        """
+        if not self.is_valid_playername(playername) or self.get_winner() is not None:
+            return []
+
+        if self._current_turn is not None and self._current_turn != playername:
+            return []
+
+        marble_color = self._players[playername]["color"]
+        if self._engine is not None:
+            moves = self._engine.legal_moves(marble_color)
+        else:
+            moves = []
+            for row in range(7):
+                left, right = self.get_line_pushes(self._grid[row], marble_color)
+                for column in left:
+                    moves.append(((row, column), "L"))
+                for column in right:
+                    moves.append(((row, column), "R"))
+
+            for column in range(7):
+                line = [self._grid[row][column] for row in range(7)]
+                forward, back = self.get_line_pushes(line, marble_color)
+                for row in forward:
+                    moves.append(((row, column), "F"))
+                for row in back:
+                    moves.append(((row, column), "B"))
+
+        forbidden_move = (self._forbidden_move["coordinates"], self._forbidden_move["direction"])
+        if forbidden_move in moves:
+            moves.remove(forbidden_move)
+        return moves
+
+    def get_marble_pushes(self, coordinates, marble_color):
+        """Finds the directions the marble_color marble at 'coordinates' can be pushed in, on the 'list' engine
+
+        Uses the same rules as get_line_pushes, for one marble along its row and column.
+
+        Parameters
+            coordinates : coordinates of the marble as a tuple (row, column)
+            marble_color : the color of the marble at 'coordinates'
+
+        Returns:
+            a list of directions, ignoring the forbidden move
+        """
+        row, column = coordinates
+        grid = self._grid
+        line = grid[row]
+        directions = []
+        if (column == 6 or line[column + 1] == "X") and (
+                "X" in line[:column] or (column != 0 and line[0] != marble_color)):
+            directions.append("L")
+        if (column == 0 or line[column - 1] == "X") and (
+                "X" in line[column + 1:] or (column != 6 and line[6] != marble_color)):
+            directions.append("R")
+
+        if row == 0 or row == 6 or grid[row - 1][column] == "X" or grid[row + 1][column] == "X":
+            line = [grid[index][column] for index in range(7)]
+            if (row == 6 or line[row + 1] == "X") and (
+                    "X" in line[:row] or (row != 0 and line[0] != marble_color)):
+                directions.append("F")
+            if (row == 0 or line[row - 1] == "X") and (
+                    "X" in line[row + 1:] or (row != 6 and line[6] != marble_color)):
+                directions.append("B")
+        return directions
+
+    def get_line_pushes(self, line, marble_color):
+        """Finds which marble_color marbles in one row or column can be pushed along it
+
+        Uses the same rules as can_marble_be_pushed_horizontal and can_marble_be_pushed_vertical, worked out for
+        the whole line at once: the cell behind a marble must be empty (or the board edge), and ahead of it there
+        must be an empty cell or an edge marble that is not marble_color.
+
+        Parameters
+            line : the seven cells of a row (left to right) or column (front to back)
+            marble_color : the color of the marbles to be pushed
+
+        Returns:
+            a tuple of lists of indexes into line (can be pushed towards index 0, can be pushed towards index 6)
+        """
+        # There is an empty cell before index if the first empty cell is before it, and after index if the last is
+        if "X" in line:
+            first_gap = line.index("X")
+            last_gap = 6 - line[::-1].index("X")
+        else:
+            first_gap = 7
+            last_gap = -1
+        start_is_other = line[0] != marble_color
+        end_is_other = line[6] != marble_color
+
+        towards_start = []
+        towards_end = []
+        for index in range(7):
+            if line[index] != marble_color:
+                continue
+
+            if (index == 6 or line[index + 1] == "X") and (first_gap < index or (index != 0 and start_is_other)):
+                towards_start.append(index)
+
+            if (index == 0 or line[index - 1] == "X") and (last_gap > index or (index != 6 and end_is_other)):
+                towards_end.append(index)
+
+        return towards_start, towards_end
+
+    def get_pushed_off_marble(self, coordinates, direction):
+        """Returns the marble that pushing 'coordinates' in 'direction' would push off the board, without pushing
+
+        Parameters
+            coordinates : coordinates of marble as a tuple (row, column)
+            direction : one index in _valid_directions
+
+        Returns:
+            the color of the marble that would be pushed off ['W', 'B', 'R'], or "X" if none would be
+        """
+        if self._engine is not None:
+            return self._engine.get_pushed_off_marble(coordinates, direction)
+
+        row, column = coordinates
+        row_step, column_step = DIRECTION_STEPS[direction]
+        while 0 <= row + row_step <= 6 and 0 <= column + column_step <= 6:
+            row += row_step
+            column += column_step
+            if self._grid[row][column] == "X":
+                return "X"
+
+        return self._grid[row][column]
+
     def can_marble_be_pushed(self, coordinates, direction):
         """Determines if marble at 'coordinates' can be pushed in 'direction'
 
@@ -479,6 +1157,9 @@ class KubaGame:
             return False
 
         marble_color = self.get_marble(coordinates)
+        if self._engine is not None:
+            return self._engine.can_marble_be_pushed(coordinates, direction, marble_color)
+
         if direction == "L" or direction == "R":
             return self.can_marble_be_pushed_horizontal(coordinates, direction, marble_color)
 
@@ -515,19 +1196,19 @@ class KubaGame:
         opposite_boundary = variable_dict[direction]["opposite boundary"]
 
         # Checks the opposite direction of the push for the board edge (boundary) or an empty adjacent space
-        if column == opposite_boundary or self._board[row][column - step] == "X":
+        if column == opposite_boundary or self._grid[row][column - step] == "X":
 
             # Check that we're not pushing our own piece off the board in the direction of the push
             pointer = column + step
             while 0 <= pointer <= 6:
 
                 # If we find a blank space in the push direction, we can push the stack of marbles this direction
-                if self._board[row][pointer] == "X":
+                if self._grid[row][pointer] == "X":
                     return True
 
                 # If we reach the edge of the board and the edge marble isn't the current_player's color,
                 # Then we can push the stack of marbles this direction
-                if pointer == boundary and self._board[row][pointer] != marble_color:
+                if pointer == boundary and self._grid[row][pointer] != marble_color:
                     return True
 
                 pointer += step
@@ -563,19 +1244,19 @@ class KubaGame:
         opposite_boundary = variable_dict[direction]["opposite boundary"]
 
         # Checks the opposite direction of the push for the board edge (boundary) or an empty adjacent space
-        if row == opposite_boundary or self._board[row - step][column] == "X":
+        if row == opposite_boundary or self._grid[row - step][column] == "X":
 
             # Check that we're not pushing our own piece off the board in the direction of the push
             pointer = row + step
             while 0 <= pointer <= 6:
 
                 # If we find a blank space in the push direction, we can push the stack of marbles this direction
-                if self._board[pointer][column] == "X":
+                if self._grid[pointer][column] == "X":
                     return True
 
                 # If we reach the edge of the board and the edge marble isn't the current_player's color,
                 # Then we can push the stack of marbles this direction
-                if pointer == boundary and self._board[pointer][column] != marble_color:
+                if pointer == boundary and self._grid[pointer][column] != marble_color:
                     return True
 
                 pointer += step
@@ -592,12 +1273,23 @@ class KubaGame:
         """
         playernames = self.get_playernames()
         if self._current_turn == playernames[0]:
-            self._current_turn = playernames[1]
+            self.set_current_turn(playernames[1])
             return None
 
-        self._current_turn = playernames[0]
+        self.set_current_turn(playernames[0])
         return None
 
+    def get_engine(self):
+        """Returns the board engine of the game, one of ENGINES, so copies can be made on the same engine
+
+        Parameters:
+            N/A
+
+        Returns:
+            'list' or 'bitboard'
+        """
+        return "list" if self._engine is None else "bitboard"
+
     def get_playernames(self):
         """Returns a list of playernames in _players
 
@@ -623,14 +1315,150 @@ class KubaGame:
         Returns:
             int representing number of red marbles captured by 'playername'
         """
+        snapshot = self._snapshot
+        if snapshot is not None and threading.get_ident() != self._writer:
+            return snapshot.get_captured(playername)
+
         if self.is_valid_playername(playername):
             return self._players[playername]["capture count"]
 
         # If playername is not valid, return 0
         return 0
 
+    def to_bytes(self):
+        """Packs the position into POSITION_SIZE bytes: board, capture counts, forbidden move, side to move and winner
+
+        Player names and colors are not included; they are passed back in to from_bytes. The undo stack of
+        apply_move is not included either.
+
+        Parameters:
+            N/A
+
+        Returns:
+            bytes of length POSITION_SIZE
+        """
+        board = self._board
+        cells = 0
+        shift = 0
+        for row in range(7):
+            for marble in board[row]:
+                cells |= MARBLE_CODES[marble] << shift
+                shift += 2
+
+        playernames = self.get_playernames()
+        captures = self.get_captured(playernames[0]) | self.get_captured(playernames[1]) << 4
+
+        forbidden = 0
+        coordinates = self._forbidden_move["coordinates"]
+        if coordinates != ():
+            direction_index = self._valid_directions.index(self._forbidden_move["direction"])
+            forbidden = 1 + (coordinates[0] * 7 + coordinates[1]) * 4 + direction_index
+
+        turn = 0 if self._current_turn is None else 1 + self._player_indexes[self._current_turn]
+        winner = 0 if self._winner is None else 1 + self._player_indexes[self._winner]
+
+        return cells.to_bytes(13, "little") + bytes((captures, forbidden, turn | winner << 2))
+
+    @classmethod
+    def from_bytes(cls, data, player_one, player_two, engine="list"):
+        """Creates a KubaGame from a position packed by to_bytes
+
+        Parameters:
+            data : bytes, bytearray, or memoryview of length POSITION_SIZE
+            player_one : ('Player One Name', 'W'), as given when the packed game was created
+            player_two : ('Player Two Name', 'B'), as given when the packed game was created
+            engine : one of ENGINES
+
+        Returns:
+            a KubaGame at the packed position
+        """
+        if len(data) != POSITION_SIZE:
+            raise ValueError("packed position must be " + str(POSITION_SIZE) + " bytes")
+        if engine not in ENGINES:
+            raise ValueError("engine must be one of " + ", ".join(ENGINES))
+        captures = (data[13] & 15, data[13] >> 4)
+        turn = data[15] & 3
+        winner = data[15] >> 2
+        if data[12] > 3:
+            raise ValueError("packed cells past the end of the board must be empty")
+        if max(captures) > 13:
+            raise ValueError("packed capture counts must be at most 13")
+        if data[14] > 49 * 4:
+            raise ValueError("packed forbidden move must be on the board")
+        if turn > 2 or winner > 2:
+            raise ValueError("packed side to move and winner must be 0, 1 or 2")
+
+        # The object is filled in directly instead of through __init__, so the board is decoded, counted and hashed
+        # once, a byte at a time from BYTE_TABLES
+        game = cls.__new__(cls)
+        cells = []
+        white = black = red = position_hash = 0
+        for byte_index in range(13):
+            value = data[byte_index]
+            cells.extend(BYTE_CELLS[value])
+            byte_white, byte_black, byte_red, byte_hash = BYTE_TABLES[byte_index][value]
+            white |= byte_white
+            black |= byte_black
+            red |= byte_red
+            position_hash ^= byte_hash
+
+        if engine == "bitboard":
+            game._grid = None
+            game._engine = KubaBitboard.from_bitboards(white, black, red)
+        else:
+            game._grid = [cells[start:start + 7] for start in range(0, 49, 7)]
+            game._engine = None
+        game._marble_counts = {"W": white.bit_count(), "B": black.bit_count(), "R": red.bit_count()}
+        game._verify = False
+
+        playernames = (player_one[0], player_two[0])
+        game._players = {
+            name: {"name": name, "color": color, "capture count": captures[index]}
+            for index, (name, color) in enumerate((player_one, player_two))
+        }
+        game._player_indexes = {player_one[0]: 0, player_two[0]: 1}
+        game._valid_directions = ["L", "R", "F", "B"]
+        game._current_turn = None if turn == 0 else playernames[turn - 1]
+        game._winner = None if winner == 0 else playernames[winner - 1]
+        if data[14]:
+            cell, direction_index = divmod(data[14] - 1, 4)
+            game._forbidden_move = {"coordinates": divmod(cell, 7),
+                                    "direction": game._valid_directions[direction_index]}
+        else:
+            game._forbidden_move = {"coordinates": (), "direction": ""}
+        game._undo_records = []
+        game._recorder = None
+        game._observers = []
+        game._snapshot = None
+        game._writer = None
+        game._write_lock = None
+        game._search_lock = None
+
+        capture_keys = ZOBRIST_KEYS["captures"]
+        position_hash ^= capture_keys[(0, captures[0])] ^ capture_keys[(1, captures[1])]
+        position_hash ^= 0 if turn == 0 else ZOBRIST_KEYS["turn"][turn - 1]
+        position_hash ^= ZOBRIST_KEYS["forbidden"][(game._forbidden_move["coordinates"],
+                                                    game._forbidden_move["direction"])]
+        game._hash = position_hash
+        return game
+
+    def get_color(self, playername):
+        """Returns the color of the marbles played by 'playername'
+
+        Parameters:
+            playername : name of a player in _players
+
+        Returns:
+            'W' or 'B', or None if playername is not valid
+        """
+        if self.is_valid_playername(playername):
+            return self._players[playername]["color"]
+
+        return None
+
     def handle_captured_piece(self, captured_piece_color):
-        """Increments the number of red marbles captured by _current_turn player
+        """Removes the captured piece from _marble_counts and increments the number of red marbles captured by
+        _current_turn player
 
         Parameters:
             captured_piece_color : the color of the captured piece ['W', 'B', 'R']
@@ -638,9 +1466,13 @@ class KubaGame:
         Returns:
             None
         """
+        self._marble_counts[captured_piece_color] -= 1
+
         if captured_piece_color == "R":
             current_turn = self.get_current_turn()
+            self._hash ^= self.get_capture_key(current_turn)
             self._players[current_turn]["capture count"] += 1
+            self._hash ^= self.get_capture_key(current_turn)
 
     def get_marble(self, coordinates):
         """Returns the color of the marble ['W', 'B', 'R'] at the coordinates (row, column) or "X" if None
@@ -651,20 +1483,53 @@ class KubaGame:
         Returns:
             a string representing a piece ['W', 'B', 'R'] or an empty square ['X']
         """
+        snapshot = self._snapshot
+        if snapshot is not None and threading.get_ident() != self._writer:
+            return snapshot.get_marble(coordinates)
+
         if self.is_valid_coordinates(coordinates):
+            if self._engine is not None:
+                return self._engine.get_marble(coordinates)
+
             row = coordinates[0]
             column = coordinates[1]
-            return self._board[row][column]
+            return self._grid[row][column]
 
     def get_marble_count(self):
         """Returns the number of white, black, and red marbles on the board as a tuple in the order (W, B, R)
 
+        The counts are kept up to date by handle_captured_piece, so the board is not scanned unless _verify is set.
+
         Parameters:
             N/A
 
         Returns:
             a tuple representing the int number of white, black, and red marbles (W, B, R)
         """
+        snapshot = self._snapshot
+        if snapshot is not None and threading.get_ident() != self._writer:
+            return snapshot.get_marble_count()
+
+        marble_count = (self._marble_counts["W"], self._marble_counts["B"], self._marble_counts["R"])
+
+        if self._verify and marble_count != self.count_marbles():
+            raise AssertionError("Marble count " + str(marble_count) + " does not match the board "
+                                 + str(self.count_marbles()))
+
+        return marble_count
+
+    def count_marbles(self):
+        """Counts the white, black, and red marbles on the board, returned as a tuple in the order (W, B, R)
+
+        Parameters:
+            N/A
+
+        Returns:
+            a tuple representing the int number of white, black, and red marbles (W, B, R)
+        """
+        if self._engine is not None:
+            return self._engine.get_marble_count()
+
         num_white = 0
         num_black = 0
         num_red = 0
@@ -672,20 +1537,231 @@ class KubaGame:
         for row in range(7):
             for column in range(7):
 
-                if self._board[row][column] == "W":
+                if self._grid[row][column] == "W":
                     num_white += 1
                     continue
 
-                if self._board[row][column] == "B":
+                if self._grid[row][column] == "B":
                     num_black += 1
                     continue
 
-                if self._board[row][column] == "R":
+                if self._grid[row][column] == "R":
                     num_red += 1
                     continue
 
         return (num_white, num_black, num_red)
 
+    def get_hash(self):
+        """Returns the Zobrist hash of the position: board, side to move, capture counts and forbidden move
+
+        The hash is kept up to date as moves are made and undone, so this does not look at the board unless _verify
+        is set.
+
+        Parameters:
+            N/A
+
+        Returns:
+            a 64-bit int; equal positions have equal hashes
+        """
+        if self._verify and self._hash != self.compute_hash():
+            raise AssertionError("Position hash does not match the board")
+
+        return self._hash
+
+    def compute_hash(self):
+        """Computes the Zobrist hash of the position from scratch
+
+        Parameters:
+            N/A
+
+        Returns:
+            a 64-bit int
+        """
+        cell_keys = ZOBRIST_KEYS["cells"]
+        board = self._board
+        position_hash = 0
+        for row in range(7):
+            for column in range(7):
+                position_hash ^= cell_keys[(row, column, board[row][column])]
+
+        position_hash ^= self.get_turn_key(self._current_turn)
+        for playername in self.get_playernames():
+            position_hash ^= self.get_capture_key(playername)
+        position_hash ^= ZOBRIST_KEYS["forbidden"][(self._forbidden_move["coordinates"],
+                                                    self._forbidden_move["direction"])]
+        return position_hash
+
+    def hash_push(self, coordinates, direction, displaced):
+        """Updates _hash for the cells changed by pushing the line 'displaced' from 'coordinates' in 'direction'
+
+        Each cell of the line held displaced[index] before the push and displaced[index - 1] after it (the first
+        cell ends up empty). XOR undoes itself, so the same call also updates _hash when the push is taken back.
+
+        Parameters:
+            coordinates : coordinates of the pushed marble as a tuple (row, column)
+            direction : one index in _valid_directions
+            displaced : the marbles in the line before the push, as returned by push_marble
+
+        Returns:
+            None
+        """
+        cell_keys = ZOBRIST_KEYS["cells"]
+        row, column = coordinates
+        row_step, column_step = DIRECTION_STEPS[direction]
+        previous = "X"
+        for marble in displaced:
+            self._hash ^= cell_keys[(row, column, marble)] ^ cell_keys[(row, column, previous)]
+            previous = marble
+            row += row_step
+            column += column_step
+
+    def get_turn_key(self, playername):
+        """Returns the Zobrist key for playername being the side to move
+
+        Parameters:
+            playername : name of a player in _players, or None before the first move
+
+        Returns:
+            a 64-bit int, 0 for None
+        """
+        if playername is None:
+            return 0
+        return ZOBRIST_KEYS["turn"][self._player_indexes[playername]]
+
+    def get_capture_key(self, playername):
+        """Returns the Zobrist key for the number of red marbles playername has captured
+
+        Parameters:
+            playername : name of a player in _players
+
+        Returns:
+            a 64-bit int
+        """
+        return ZOBRIST_KEYS["captures"][(self._player_indexes[playername], self._players[playername]["capture count"])]
+
+
+class GameSnapshot:
+    """An immutable copy of the position of a KubaGame, published by KubaGame.publish_snapshot for other threads.
+
+    Data Members (private):
+        _version : number of snapshots the game published before this one
+        _board : seven tuples of seven strings ["W", "B", "R", "X"]
+        _marble_count : tuple of ints (num_white, num_black, num_red)
+        _captured : dict with playername as key and red marbles captured as value
+        _winner : the winner of the game, or None
+        _current_turn : the player to move, or None
+
+    Methods:
+        get_version() --> int
+        get_board() --> tuple of tuples of strings
+        get_marble(coordinates) --> marble color ["W", "B", "R"] or "X"
+        get_marble_count() --> tuple of ints (num_white, num_black, num_red)
+        get_captured(playername) --> captured pieces as int
+        get_winner() --> playername
+        get_current_turn() --> playername
+    """
+
+    __slots__ = ("_version", "_board", "_marble_count", "_captured", "_winner", "_current_turn")
+
+    def __init__(self, version, board, marble_count, captured, winner, current_turn):
+        """Initialize the GameSnapshot data members; the arguments are the data members and are not copied"""
+        self._version = version
+        self._board = board
+        self._marble_count = marble_count
+        self._captured = captured
+        self._winner = winner
+        self._current_turn = current_turn
+
+    def get_version(self):
+        """Returns the number of snapshots the game published before this one"""
+        return self._version
+
+    def get_board(self):
+        """Returns the board as seven tuples of seven strings ["W", "B", "R", "X"]; rows may be shared with other
+        snapshots of the same game"""
+        return self._board
+
+    def get_marble(self, coordinates):
+        """Returns the marble at coordinates (row, column) like KubaGame.get_marble, or None for invalid
+        coordinates"""
+        if (isinstance(coordinates, tuple) and len(coordinates) == 2 and isinstance(coordinates[0], int)
+                and isinstance(coordinates[1], int) and 0 <= coordinates[0] <= 6 and 0 <= coordinates[1] <= 6):
+            return self._board[coordinates[0]][coordinates[1]]
+        return None
+
+    def get_marble_count(self):
+        """Returns the number of white, black, and red marbles on the board as a tuple in the order (W, B, R)"""
+        return self._marble_count
+
+    def get_captured(self, playername):
+        """Returns the number of red marbles captured by 'playername', or 0 for a name that is not a player"""
+        return self._captured.get(playername, 0)
+
+    def get_winner(self):
+        """Returns the name of the winner or None if no winner"""
+        return self._winner
+
+    def get_current_turn(self):
+        """Returns the name of the player to move, or None if the game hasn't started"""
+        return self._current_turn
+
+
+def games_to_bytes(games):
+    """Packs many games into one buffer of POSITION_SIZE bytes per game, in order
+
+    Parameters:
+        games : iterable of KubaGame
+
+    Returns:
+        a bytearray
+    """
+    buffer = bytearray()
+    for game in games:
+        buffer += game.to_bytes()
+    return buffer
+
+
+def games_from_bytes(buffer, player_one, player_two, engine="list"):
+    """Unpacks games packed by games_to_bytes one at a time, without copying the buffer
+
+    Parameters:
+        buffer : bytes, bytearray, memoryview, mmap, or any other object supporting the buffer protocol
+        player_one : ('Player One Name', 'W')
+        player_two : ('Player Two Name', 'B')
+        engine : one of ENGINES
+
+    Returns:
+        a generator of KubaGame
+    """
+    view = memoryview(buffer).cast("B")
+    for start in range(0, len(view) - POSITION_SIZE + 1, POSITION_SIZE):
+        yield KubaGame.from_bytes(view[start:start + POSITION_SIZE], player_one, player_two, engine)
+
+
+def decode_move_event(data, player_one, player_two):
+    """Unpacks a move event packed by KubaGame.encode_move_event
+
+    Parameters:
+        data : bytes from encode_move_event
+        player_one : name of the game's first player
+        player_two : name of the game's second player
+    Returns:
+        a dict like the one returned by KubaGame.get_move_event
+    """
+    playernames = (player_one, player_two)
+    header = data[0]
+    winner = header >> 6
+    captured = MARBLES[(header >> 3) & 3]
+    turn = playernames[(header >> 5) & 1]
+    changes = tuple((divmod(value & 63, 7), MARBLES[value >> 6]) for value in data[1:1 + (header & 7)])
+    return {
+        "player": playernames[1 - playernames.index(turn)],  # Turns always pass to the other player
+        "changes": changes,
+        "captured": captured if captured != "X" else None,
+        "turn": turn,
+        "winner": None if winner == 0 else playernames[winner - 1]
+    }
+
 
 def main():
     """The main function for KubaGame.py"""
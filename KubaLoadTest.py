@@ -0,0 +1,222 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A load generator for KubaServer. Concurrent clients play random games over the JSON line protocol
+#              and the moves per second and move latency percentiles are reported.
+#              Run with: python -m KubaLoadTest [--host 127.0.0.1 --port 8765 | --unix PATH] [--clients 50]
+#              Without an address, a server is started in this process for the test.
+
+from KubaServer import KubaServer
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+
+def percentile(values, fraction):
+    """Returns the value below which 'fraction' of the sorted list 'values' falls (nearest rank), or 0.0 if empty"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class LoadClient:
+    """One connection to a KubaServer playing random games one after another.
+
+    Data Members (private):
+        _reader : asyncio.StreamReader of the connection
+        _writer : asyncio.StreamWriter of the connection
+        _next_id : id given to the next request
+        _events : number of subscription event lines received
+
+    Methods:
+        connect(address) --> LoadClient
+        request(message) --> dict
+        play_game(rng, max_moves, subscribe, latencies) --> int
+        get_events() --> int
+        close()
+    """
+
+    def __init__(self, reader, writer):
+        """Initialize the LoadClient data members"""
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 1
+        self._events = 0
+
+    @classmethod
+    async def connect(cls, address):
+        """Opens a connection to a server
+
+        Parameters:
+            address : tuple (host, port) for TCP, or a Unix socket path
+        Returns:
+            a LoadClient
+        """
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        return cls(reader, writer)
+
+    async def request(self, message):
+        """Sends a request and waits for its response, counting any event lines that arrive first
+
+        Parameters:
+            message : dict to send; an 'id' is added
+        Returns:
+            the response as a dict
+        """
+        message["id"] = self._next_id
+        self._next_id += 1
+        self._writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            response = json.loads(line)
+            if "event" in response:
+                self._events += 1
+                continue
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            return response
+
+    async def play_game(self, rng, max_moves, subscribe, latencies):
+        """Creates a game on the server and plays random legal moves until it is won or max_moves are made
+
+        Parameters:
+            rng : random.Random choosing the moves
+            max_moves : most moves to make
+            subscribe : if True, subscribe to the game's events first
+            latencies : list the seconds taken by each move request are appended to
+        Returns:
+            the number of moves made
+        """
+        game_id = (await self.request({"op": "create"}))["game"]
+        if subscribe:
+            await self.request({"op": "subscribe", "game": game_id})
+
+        playername = "player1"
+        moves = (await self.request({"op": "moves", "game": game_id, "player": playername}))["moves"]
+        count = 0
+        while moves and count < max_moves:
+            coordinates, direction = rng.choice(moves)
+            start = time.perf_counter()
+            response = await self.request({"op": "move", "game": game_id, "player": playername,
+                                           "coordinates": coordinates, "direction": direction,
+                                           "include_moves": True})
+            latencies.append(time.perf_counter() - start)
+            count += 1
+            if response["winner"] is not None:
+                break
+            playername = response["turn"]
+            moves = response["moves"]
+
+        await self.request({"op": "close", "game": game_id})
+        return count
+
+    def get_events(self):
+        """Returns the number of subscription event lines received"""
+        return self._events
+
+    async def close(self):
+        """Closes the connection"""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def run_load_test(address=None, clients=10, games=100, max_moves=200, seed=2021, subscribe=False):
+    """Plays games on a server from concurrent clients and measures the moves made
+
+    Parameters:
+        address : tuple (host, port) or Unix socket path of the server; None starts a server in this process
+        clients : number of concurrent connections
+        games : total number of games, shared between the clients
+        max_moves : most moves per game
+        seed : seed for the clients' move choices
+        subscribe : if True, every client subscribes to the events of its own games
+    Returns:
+        a dict with 'games', 'moves', 'events', 'seconds', 'moves per second', 'p50 latency' and 'p99 latency'
+        (seconds per move request)
+    """
+    server = None
+    if address is None:
+        server = KubaServer()
+        await server.start()
+        address = server.get_address()
+
+    rng = random.Random(seed)
+    shares = [games // clients + (index < games % clients) for index in range(clients)]
+    latencies = []
+
+    async def run_client(share, client_seed):
+        client = await LoadClient.connect(address)
+        client_rng = random.Random(client_seed)
+        try:
+            moves = 0
+            for _ in range(share):
+                moves += await client.play_game(client_rng, max_moves, subscribe, latencies)
+            return moves, client.get_events()
+        finally:
+            await client.close()
+
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_client(share, rng.getrandbits(64)) for share in shares))
+        seconds = time.perf_counter() - start
+    finally:
+        if server is not None:
+            await server.close()
+
+    moves = sum(result[0] for result in results)
+    latencies.sort()
+    return {
+        "games": games,
+        "moves": moves,
+        "events": sum(result[1] for result in results),
+        "seconds": seconds,
+        "moves per second": moves / seconds if seconds > 0 else 0.0,
+        "p50 latency": percentile(latencies, 0.5),
+        "p99 latency": percentile(latencies, 0.99)
+    }
+
+
+def main(arguments=None):
+    """Runs a load test from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status 0
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaLoadTest", description="Load tests a KubaServer.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port of a running server; without it or --unix, one is started")
+    parser.add_argument("--unix", help="Unix socket path of a running server")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--max-moves", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--subscribe", action="store_true", help="clients subscribe to their games' events")
+    options = parser.parse_args(arguments)
+
+    address = options.unix
+    if address is None and options.port is not None:
+        address = (options.host, options.port)
+    results = asyncio.run(run_load_test(address, options.clients, options.games, options.max_moves, options.seed,
+                                        options.subscribe))
+
+    print("{:,} games, {:,} moves in {:.2f} s".format(results["games"], results["moves"], results["seconds"]))
+    print("{:,.0f} moves/s, p50 {:.2f} ms, p99 {:.2f} ms".format(results["moves per second"],
+                                                                 results["p50 latency"] * 1000,
+                                                                 results["p99 latency"] * 1000))
+    if options.subscribe:
+        print("{:,} events received".format(results["events"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A Monte Carlo Tree Search player for KubaGame that spreads random playouts across processes.
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import random
+import time
+
+
+class Node:
+    """A position in a search tree, reached by 'move' from its parent.
+
+    Data Members:
+        move : tuple (coordinates, direction) that led here, or None at the root
+        playername : the player who made 'move', or None at the root
+        parent : the parent Node, or None at the root
+        children : list of child Nodes already expanded
+        untried : list of legal moves not yet expanded into children
+        visits : number of playouts through this node
+        wins : playouts through this node won by 'playername' (draws count as half)
+    """
+
+    def __init__(self, move, playername, parent, untried):
+        """Initialize the Node data members"""
+        self.move = move
+        self.playername = playername
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        """Returns the child with the highest UCT score"""
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+
+def random_playout(game, playername, rng, max_moves):
+    """Plays random legal moves from the current position until the game ends or max_moves are made
+
+    The moves are made with apply_move, and are left on the game for the caller to undo.
+
+    Parameters:
+        game : KubaGame to play on
+        playername : player to move
+        rng : random.Random used to pick moves
+        max_moves : most moves to play before calling the game a draw
+
+    Returns:
+        a tuple (winner or None for a draw, number of moves made)
+    """
+    moves_made = 0
+    while game.get_winner() is None and moves_made < max_moves:
+        moves = game.legal_moves(playername)
+        if not moves:
+            break
+        coordinates, direction = rng.choice(moves)
+        game.apply_move(playername, coordinates, direction)
+        moves_made += 1
+        playername = game.get_current_turn()
+    return game.get_winner(), moves_made
+
+
+def run_playout(game, root, playername, rng, exploration=1.4, max_playout_moves=200, expand=True):
+    """Runs one playout through a search tree, growing it by one node, and leaves game back at the root position
+
+    Parameters:
+        game : KubaGame at the position of root
+        root : Node of the search tree
+        playername : player to move at root
+        rng : random.Random used to pick moves
+        exploration : UCT exploration constant
+        max_playout_moves : most moves in one playout before it is called a draw
+        expand : False to run the playout without adding a node, for a tree that has grown as large as allowed
+
+    Returns:
+        the winner of the playout, or None for a draw
+    """
+    node = root
+    moves_made = 0
+    mover = playername
+
+    # Selection: follow the best children down to a node that still has unexpanded moves
+    while not node.untried and node.children:
+        node = node.select_child(exploration)
+        game.apply_move(node.playername, node.move[0], node.move[1])
+        moves_made += 1
+        mover = game.get_current_turn()
+
+    # Expansion: add one child for an untried move
+    if expand and node.untried and game.get_winner() is None:
+        move = node.untried.pop(rng.randrange(len(node.untried)))
+        game.apply_move(mover, move[0], move[1])
+        moves_made += 1
+        child = Node(move, mover, node, game.legal_moves(game.get_current_turn()))
+        node.children.append(child)
+        node = child
+        mover = game.get_current_turn()
+
+    # Simulation
+    winner, playout_moves = random_playout(game, mover, rng, max_playout_moves)
+    moves_made += playout_moves
+    for _ in range(moves_made):
+        game.undo_move()
+
+    # Backpropagation
+    while node is not None:
+        node.visits += 1
+        if winner is None:
+            node.wins += 0.5
+        elif winner == node.playername:
+            node.wins += 1
+        node = node.parent
+    return winner
+
+
+def search_tree(game, playername, playouts, seed, exploration=1.4, max_playout_moves=200):
+    """Builds a UCT search tree from the current position of game with 'playouts' random playouts
+
+    This is the work done by one worker process; game is the worker's own copy of the position.
+
+    Parameters:
+        game : KubaGame at the root position
+        playername : player to move at the root
+        playouts : number of playouts to run
+        seed : seed for this worker's random.Random
+        exploration : UCT exploration constant
+        max_playout_moves : most moves in one playout before it is called a draw
+
+    Returns:
+        dict with root moves as keys and (visits, wins for playername) as values
+    """
+    rng = random.Random(seed)
+    root = Node(None, None, None, game.legal_moves(playername))
+    for _ in range(playouts):
+        run_playout(game, root, playername, rng, exploration, max_playout_moves)
+
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+class KubaMCTS:
+    """A computer player for KubaGame using Monte Carlo Tree Search with root parallelism.
+
+    Every worker process builds its own search tree for the current position with a share of the playout budget,
+    and the visit counts of the root moves are added up across workers to pick the move.
+
+    Data Members (private):
+        _game : the KubaGame being played
+        _workers : number of worker processes
+        _playouts : total number of playouts per move, shared between the workers
+        _exploration : UCT exploration constant
+        _max_playout_moves : most moves in one playout before it is called a draw
+        _seed : seed for the workers' random number generators, or None for a random seed
+        _executor : ProcessPoolExecutor running the workers, created on first use; None when _workers is 1
+        _stats : dict with 'playouts', 'workers', 'seconds', and 'playouts per second' of the last search
+        _book : KubaBook.OpeningBook whose moves are played without searching, or None
+
+    Methods:
+        best_move(playername) --> tuple (coordinates, direction)
+        get_stats() --> dict
+        close()
+    """
+
+    def __init__(self, game, workers=None, playouts=1000, exploration=1.4, max_playout_moves=200, seed=None,
+                 book=None):
+        """Initialize the KubaMCTS data members
+
+        Parameters:
+            game : the KubaGame to pick moves for
+            workers : number of worker processes; defaults to the number of CPUs. 1 searches in this process
+            playouts : total number of playouts per move
+            exploration : UCT exploration constant
+            max_playout_moves : most moves in one playout before it is called a draw
+            seed : seed for the workers' random number generators, or None for a random seed
+            book : KubaBook.OpeningBook to take moves from while the position is in it, or None
+        Returns:
+            None
+        """
+        self._game = game
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._playouts = playouts
+        self._exploration = exploration
+        self._max_playout_moves = max_playout_moves
+        self._seed = seed
+        self._executor = None
+        self._stats = {"playouts": 0, "workers": self._workers, "seconds": 0.0, "playouts per second": 0.0}
+        self._book = book
+
+    def __enter__(self):
+        """Returns self so the worker processes are shut down at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Shuts down the worker processes"""
+        self.close()
+
+    def close(self):
+        """Shuts down the worker processes, if they were started
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def best_move(self, playername=None):
+        """Searches the current position and returns the most visited root move
+
+        If the position is in the opening book, the book move is returned without searching.
+
+        Parameters:
+            playername : player to move; defaults to the game's current turn (needed only before the first move)
+
+        Returns:
+            the chosen move as a tuple (coordinates, direction), or None if playername has no legal moves
+        """
+        game = self._game
+        if playername is None:
+            playername = game.get_current_turn()
+
+        moves = game.legal_moves(playername)
+        if not moves:
+            return None
+
+        if self._book is not None:
+            book_move = self._book.best_move(game, playername)
+            if book_move in moves:
+                self._stats = {"playouts": 0, "workers": self._workers, "seconds": 0.0, "playouts per second": 0.0}
+                return book_move
+
+        rng = random.Random(self._seed)
+        seeds = [rng.getrandbits(64) for _ in range(self._workers)]
+        shares = [self._playouts // self._workers + (index < self._playouts % self._workers)
+                  for index in range(self._workers)]
+
+        start = time.perf_counter()
+        if self._workers == 1:
+            results = [search_tree(game, playername, shares[0], seeds[0], self._exploration,
+                                   self._max_playout_moves)]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            futures = [self._executor.submit(search_tree, game, playername, shares[index], seeds[index],
+                                             self._exploration, self._max_playout_moves)
+                       for index in range(self._workers) if shares[index] > 0]
+            results = [future.result() for future in futures]
+        seconds = time.perf_counter() - start
+
+        totals = {}
+        for result in results:
+            for move, (visits, wins) in result.items():
+                total_visits, total_wins = totals.get(move, (0, 0.0))
+                totals[move] = (total_visits + visits, total_wins + wins)
+
+        self._stats = {
+            "playouts": sum(shares),
+            "workers": self._workers,
+            "seconds": seconds,
+            "playouts per second": sum(shares) / seconds if seconds > 0 else 0.0
+        }
+        if not totals:
+            return moves[0]
+        return max(totals, key=lambda move: (totals[move][0], totals[move][1]))
+
+    def get_stats(self):
+        """Returns the statistics of the last best_move search
+
+        Parameters:
+            N/A
+        Returns:
+            dict with 'playouts', 'workers', 'seconds', and 'playouts per second'
+        """
+        return self._stats
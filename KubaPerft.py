@@ -0,0 +1,117 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Perft move-tree counting for KubaGame, for checking move generation against the rules and for
+#              measuring raw move generation and application speed. Root moves can be split across processes.
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def count_tree(game, depth, playername):
+    """Counts the move sequences of length 'depth' from the current position, undoing every move it makes
+
+    Parameters:
+        game : KubaGame at the position to count from
+        depth : number of moves in each sequence
+        playername : player to move
+
+    Returns:
+        a dict with 'nodes' (sequences counted), 'captures' (of those, ones whose last move pushed a marble off),
+        'red captures' (ones whose last move captured a red marble), and 'wins' (ones that end the game)
+    """
+    counts = {"nodes": 0, "captures": 0, "red captures": 0, "wins": 0}
+    moves = game.legal_moves(playername)
+    if depth == 1:
+        for coordinates, direction in moves:
+            pushed_off = game.get_pushed_off_marble(coordinates, direction)
+            game.apply_move(playername, coordinates, direction)
+            counts["nodes"] += 1
+            if pushed_off != "X":
+                counts["captures"] += 1
+            if pushed_off == "R":
+                counts["red captures"] += 1
+            if game.get_winner() is not None:
+                counts["wins"] += 1
+            game.undo_move()
+        return counts
+
+    for coordinates, direction in moves:
+        game.apply_move(playername, coordinates, direction)
+        subtree = count_tree(game, depth - 1, game.get_current_turn())
+        game.undo_move()
+        for key in counts:
+            counts[key] += subtree[key]
+    return counts
+
+
+def count_subtree(game, depth, playername, move):
+    """Makes 'move' and counts the tree below it; the work done by one worker process
+
+    Parameters:
+        game : the worker's copy of the KubaGame
+        depth : number of moves in each sequence, including 'move'
+        playername : player making 'move'
+        move : tuple (coordinates, direction)
+
+    Returns:
+        the counts dict of count_tree for the sequences starting with 'move'
+    """
+    pushed_off = game.get_pushed_off_marble(move[0], move[1])
+    game.apply_move(playername, move[0], move[1])
+    if depth == 1:
+        counts = {"nodes": 1, "captures": int(pushed_off != "X"), "red captures": int(pushed_off == "R"),
+                  "wins": int(game.get_winner() is not None)}
+    else:
+        counts = count_tree(game, depth - 1, game.get_current_turn())
+    game.undo_move()
+    return counts
+
+
+def divide(game, depth, playername=None, workers=1):
+    """Counts the move tree separately below each root move
+
+    Parameters:
+        game : KubaGame at the position to count from; it is left unchanged
+        depth : number of moves in each sequence (at least 1)
+        playername : player to move; defaults to the current turn, or the first player before the first move
+        workers : number of worker processes the root moves are split across; 1 counts in this process
+
+    Returns:
+        a dict with root moves (coordinates, direction) as keys and count_tree counts dicts as values
+    """
+    if playername is None:
+        playername = game.get_current_turn() or game.get_playernames()[0]
+
+    moves = game.legal_moves(playername)
+    if workers == 1:
+        return {move: count_subtree(game, depth, playername, move) for move in moves}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(count_subtree, [game] * len(moves), [depth] * len(moves),
+                               [playername] * len(moves), moves)
+        return dict(zip(moves, results))
+
+
+def perft(game, depth, playername=None, workers=1, breakdown=False):
+    """Counts the move sequences of length 'depth' that make_move would accept from the current position
+
+    Parameters:
+        game : KubaGame at the position to count from; it is left unchanged
+        depth : number of moves in each sequence
+        playername : player to move; defaults to the current turn, or the first player before the first move
+        workers : number of worker processes the root moves are split across; 1 counts in this process
+        breakdown : if True, also count captures and wins
+
+    Returns:
+        the number of sequences, or if breakdown is True a dict with 'nodes', 'captures', 'red captures', and 'wins'
+    """
+    counts = {"nodes": 0, "captures": 0, "red captures": 0, "wins": 0}
+    if depth == 0:
+        counts["nodes"] = 1
+    else:
+        for subtree in divide(game, depth, playername, workers).values():
+            for key in counts:
+                counts[key] += subtree[key]
+
+    if breakdown:
+        return counts
+    return counts["nodes"]
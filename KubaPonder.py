@@ -0,0 +1,321 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A computer player for live KubaGame matches that keeps searching in a background thread, on the
+#              opponent's time as well as its own, and answers best_move within a hard wall-clock deadline.
+
+from KubaMCTS import Node, run_playout
+import random
+import threading
+import time
+
+
+class KubaPonder:
+    """A computer player that ponders: a background thread runs Monte Carlo Tree Search playouts on the current
+    position of a KubaGame for as long as the player is running.
+
+    The player subscribes to the game, so every move made with make_move (by either player) moves the search to
+    the position after it. The subtree under that move is kept with its playouts and the rest of the tree is
+    dropped, so the time spent pondering the opponent's likely replies is not lost. best_move waits until its
+    deadline and returns the most visited move, whatever the search has reached by then.
+
+    The search runs on its own copy of the position, so the game may be used freely by the caller. The search
+    thread shares the interpreter lock with the caller, so it mostly runs while the caller waits, such as for the
+    opponent's move or in best_move.
+
+    Data Members (private):
+        _game : the KubaGame being played
+        _players : tuple of (name, color) tuples of player one and player two, for rebuilding positions
+        _game_options : keyword arguments of from_bytes when rebuilding positions, so they use the game's engine
+        _playername : the player this player picks moves for
+        _exploration : UCT exploration constant
+        _max_playout_moves : most moves in one playout before it is called a draw
+        _max_nodes : most nodes the search tree may grow to; playouts go on without growing it after that
+        _rng : random.Random of the search thread
+        _condition : threading.Condition guarding _position and _stopping, and signalling new playouts
+        _position : to_bytes() of the game's latest position, set when a move is made
+        _stopping : True once close has been called
+        _error : the exception that stopped the search thread, raised again by best_move; None while it runs
+        _thread : the search thread, or None before start
+        _search_game : the search thread's copy of the game, at the position of _root
+        _root : Node at the root of the search tree
+        _root_position : to_bytes() of the position of _root
+        _root_player : player to move at the root
+        _nodes : number of nodes in the search tree, counted when the root moves and then by the playouts
+        _reused : playouts that the root already had when the tree was last moved to a new position
+        _stats : dict with 'playouts', 'reused playouts', 'nodes' and 'seconds' of the last best_move
+
+    Methods:
+        start()
+        close()
+        best_move(playername, time_limit, playouts) --> tuple (coordinates, direction)
+        get_stats() --> dict
+        update_position(event)
+        search()
+        run_search()
+        move_root(position)
+        find_descendant(node, position, depth) --> list of Nodes
+    """
+
+    def __init__(self, game, playername, exploration=1.4, max_playout_moves=200, max_nodes=100000, seed=None):
+        """Initialize the KubaPonder data members
+
+        Parameters:
+            game : the KubaGame (or CompactKubaGame) to pick moves for
+            playername : name of the player to pick moves for; searched for first if the game has no turn yet
+            exploration : UCT exploration constant
+            max_playout_moves : most moves in one playout before it is called a draw
+            max_nodes : most nodes the search tree may grow to
+            seed : seed for the search's random number generator, or None for a random seed
+        Returns:
+            None
+        """
+        self._game = game
+        self._players = tuple((name, game.get_color(name)) for name in game.get_playernames())
+        self._game_options = {"engine": game.get_engine()} if hasattr(game, "get_engine") else {}
+        self._playername = playername
+        self._exploration = exploration
+        self._max_playout_moves = max_playout_moves
+        self._max_nodes = max_nodes
+        self._rng = random.Random(seed)
+        self._condition = threading.Condition()
+        self._position = game.to_bytes()
+        self._stopping = False
+        self._error = None
+        self._thread = None
+        self._search_game = None
+        self._root = None
+        self._root_position = None
+        self._root_player = None
+        self._nodes = 0
+        self._reused = 0
+        self._stats = {"playouts": 0, "reused playouts": 0, "nodes": 0, "seconds": 0.0}
+
+    def __enter__(self):
+        """Starts pondering and returns self, so the search thread is stopped at the end of a with block"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the search thread"""
+        self.close()
+
+    def start(self):
+        """Subscribes to the game and starts the search thread, if it is not running
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        if self._thread is not None:
+            return
+        self._game.subscribe(self.update_position)
+        self._position = self._game.to_bytes()
+        self._thread = threading.Thread(target=self.search, name="KubaPonder", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the search thread and unsubscribes from the game
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+        self._stopping = False
+        self._error = None
+        self._game.unsubscribe(self.update_position)
+
+    def best_move(self, playername=None, time_limit=1.0, playouts=None):
+        """Returns the most visited move of the search when time_limit seconds have passed
+
+        The search started when the position was reached, so all of the time since then counts. If the search has
+        not caught up with the position or tried any move by the deadline, the first legal move is returned. If the
+        search thread has failed, the exception that stopped it is raised; close and start again to search anew.
+
+        Parameters:
+            playername : player to move; defaults to the game's current turn, or the player of this KubaPonder
+            time_limit : seconds to wait before answering
+            playouts : answer as soon as the root has had this many playouts, if given
+
+        Returns:
+            the chosen move as a tuple (coordinates, direction), or None if playername has no legal moves
+        """
+        start = time.perf_counter()
+        deadline = start + time_limit
+        game = self._game
+        if playername is None:
+            playername = game.get_current_turn() or self._playername
+
+        moves = game.legal_moves(playername)
+        if not moves:
+            return None
+        self.start()
+
+        position = game.to_bytes()
+        with self._condition:
+            while True:
+                if self._error is not None:
+                    raise self._error
+                root = self._root
+                caught_up = self._root_position == position and self._root_player == playername
+                if caught_up and playouts is not None and root.visits >= playouts:
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+        children = list(root.children) if caught_up else []
+        self._stats = {
+            "playouts": root.visits if caught_up else 0,
+            "reused playouts": self._reused if caught_up else 0,
+            "nodes": self._nodes,
+            "seconds": time.perf_counter() - start
+        }
+        if not children:
+            return moves[0]
+        return max(children, key=lambda child: (child.visits, child.wins)).move
+
+    def get_stats(self):
+        """Returns the statistics of the last best_move
+
+        Parameters:
+            N/A
+        Returns:
+            dict with 'playouts' at the root, 'reused playouts' the root had from pondering before its position was
+            reached, 'nodes' in the tree, and 'seconds' best_move took
+        """
+        return self._stats
+
+    def update_position(self, event):
+        """Observer of the game: tells the search thread about the position after a move
+
+        Parameters:
+            event : move event from KubaGame.get_move_event
+        Returns:
+            None
+        """
+        with self._condition:
+            self._position = self._game.to_bytes()
+            self._condition.notify_all()
+
+    def search(self):
+        """Runs playouts on the latest position until close is called; the body of the search thread
+
+        An exception stops the thread and is kept in _error for best_move to raise.
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        try:
+            self.run_search()
+        except Exception as error:
+            with self._condition:
+                self._error = error
+                self._condition.notify_all()
+
+    def run_search(self):
+        """Runs playouts on the latest position until close is called, for search
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                position = self._position
+            if position != self._root_position:
+                self.move_root(position)
+
+            root = self._root
+            if not root.untried and not root.children or self._search_game.get_winner() is not None:
+                with self._condition:  # Nothing to search until the position changes
+                    if self._position == position and not self._stopping:
+                        self._condition.wait()
+                continue
+
+            expand = self._nodes < self._max_nodes
+            run_playout(self._search_game, root, self._root_player, self._rng, self._exploration,
+                        self._max_playout_moves, expand=expand)
+            with self._condition:
+                self._nodes += expand
+                self._condition.notify_all()
+
+    def move_root(self, position):
+        """Moves the search tree to a new position, keeping the subtree that reaches it if there is one
+
+        The position is looked for up to two moves below the root, which covers a move by each player made while
+        one playout was running. Otherwise the search starts again from a new tree.
+
+        Parameters:
+            position : to_bytes() of the new position
+        Returns:
+            None
+        """
+        path = self.find_descendant(self._root, position, 2) if self._root is not None else None
+        if path:
+            game = self._search_game
+            for node in path:
+                game.apply_move(node.playername, node.move[0], node.move[1])
+            root = path[-1]
+            root.parent = None
+            root_player = game.get_current_turn()
+
+            nodes = 0
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                nodes += 1
+                stack.extend(node.children)
+        else:
+            game = type(self._game).from_bytes(position, *self._players, **self._game_options)
+            root_player = game.get_current_turn() or self._playername
+            root = Node(None, None, None, game.legal_moves(root_player))
+            nodes = 1
+
+        with self._condition:
+            self._search_game = game
+            self._root = root
+            self._root_position = position
+            self._root_player = root_player
+            self._nodes = nodes
+            self._reused = root.visits
+            self._condition.notify_all()
+
+    def find_descendant(self, node, position, depth):
+        """Looks for the node below 'node' whose position is 'position', by playing its moves on the search game
+
+        Parameters:
+            node : Node at the position of the search game
+            position : to_bytes() of the position looked for
+            depth : most moves below node to look
+        Returns:
+            list of the Nodes from a child of node down to the node found, or None if it was not found
+        """
+        if depth == 0:
+            return None
+        game = self._search_game
+        for child in node.children:
+            game.apply_move(child.playername, child.move[0], child.move[1])
+            if game.to_bytes() == position:
+                path = [child]
+            else:
+                path = self.find_descendant(child, position, depth - 1)
+                path = None if path is None else [child] + path
+            game.undo_move()
+            if path is not None:
+                return path
+        return None
@@ -0,0 +1,290 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: An append-only binary record format for Kuba games, with a writer KubaGame can attach to and a
+#              streaming reader that replays games without loading whole archives into memory.
+
+from KubaGame import KubaGame, POSITION_SIZE
+import mmap
+import weakref
+
+# An archive starts with FILE_MAGIC, followed by any number of games. Each game is a header:
+#     GAME_TAG, then for each player a name length byte, the UTF-8 name and a color byte,
+#     then the POSITION_SIZE byte KubaGame.to_bytes() position the game was recorded from
+# followed by one MOVE_SIZE record per move: a big-endian 16-bit value
+#     player index << 8 | direction index << 6 | row * 7 + column
+# whose first byte is never GAME_TAG, so the next game header can be found by reading moves until it appears.
+# Games recorded in turn are split up: each game's header is written again, with its position, before its moves
+# that follow another game's moves.
+FILE_MAGIC = b"KUBR\x01"
+GAME_TAG = 0x80
+MOVE_SIZE = 2
+DIRECTIONS = ("L", "R", "F", "B")
+
+
+def encode_move(player_index, coordinates, direction):
+    """Packs a move into a MOVE_SIZE byte record
+
+    Parameters:
+        player_index : 0 for player one, 1 for player two
+        coordinates : coordinates of the pushed marble as a tuple (row, column)
+        direction : one of DIRECTIONS
+    Returns:
+        bytes of length MOVE_SIZE
+    """
+    value = player_index << 8 | DIRECTIONS.index(direction) << 6 | coordinates[0] * 7 + coordinates[1]
+    return value.to_bytes(MOVE_SIZE, "big")
+
+
+def decode_move(high, low):
+    """Unpacks the two bytes of a move record
+
+    Parameters:
+        high : first byte of the record
+        low : second byte of the record
+    Returns:
+        a tuple (player index, coordinates, direction)
+    """
+    return high, divmod(low & 63, 7), DIRECTIONS[low >> 6]
+
+
+def encode_game_header(game, position=None):
+    """Packs the game header of a game: GAME_TAG, the players and the game's position
+
+    Parameters:
+        game : KubaGame, or any game with get_playernames, get_color and to_bytes
+        position : the POSITION_SIZE byte position to record the game from; defaults to game.to_bytes()
+    Returns:
+        bytes
+    """
+    header = bytearray((GAME_TAG,))
+    for playername in game.get_playernames():
+        name = playername.encode("utf-8")
+        if len(name) > 255:
+            raise ValueError("player names must be at most 255 bytes to be recorded")
+        header.append(len(name))
+        header += name
+        header += game.get_color(playername).encode("ascii")
+    header += game.to_bytes() if position is None else position
+    return bytes(header)
+
+
+def decode_game_header(view, position):
+    """Unpacks the game header that starts at 'position'
+
+    Parameters:
+        view : memoryview of bytes holding the header
+        position : index of the header's GAME_TAG byte
+    Returns:
+        a tuple (player_one, player_two, game position, index of the byte after the header), with the game
+        position as a memoryview into 'view'
+    """
+    if view[position] != GAME_TAG:
+        raise ValueError("expected a game header at byte " + str(position))
+    position += 1
+
+    players = []
+    for _ in range(2):
+        length = view[position]
+        name = bytes(view[position + 1:position + 1 + length]).decode("utf-8")
+        color = chr(view[position + 1 + length])
+        players.append((name, color))
+        position += length + 2
+
+    return players[0], players[1], view[position:position + POSITION_SIZE], position + POSITION_SIZE
+
+
+class GameRecordWriter:
+    """Appends Kuba games to a record file. Attach it to a game with KubaGame.set_recorder.
+
+    Data Members (private):
+        _file : the binary file being appended to
+        _games : weakref.WeakKeyDictionary with the game as key and its player names as value, for unfinished games
+                 being recorded; a game is dropped when it is won or garbage collected
+        _current : weakref.ref to the game whose header was written last, which the next move records belong to;
+                   None before the first header
+        _positions : weakref.WeakKeyDictionary with the game as key and its position as value, for the recorded
+                     games another game's header was written after; the header written again before their next
+                     move records the game from this position
+
+    Methods:
+        start_game(game)
+        record_move(game, playername, coordinates, direction)
+        flush()
+        close()
+    """
+
+    def __init__(self, path):
+        """Opens path for appending, writing FILE_MAGIC first if the file is new
+
+        Parameters:
+            path : path of the record file
+        Returns:
+            None
+        """
+        self._file = open(path, "ab")
+        self._games = weakref.WeakKeyDictionary()
+        self._current = None
+        self._positions = weakref.WeakKeyDictionary()
+        if self._file.tell() == 0:
+            self._file.write(FILE_MAGIC)
+
+    def __enter__(self):
+        """Returns self so the file is closed at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the file"""
+        self.close()
+
+    def start_game(self, game):
+        """Writes the header of a new game: the players and the game's current position
+
+        Parameters:
+            game : the KubaGame being recorded
+        Returns:
+            None
+        """
+        self._positions.pop(game, None)
+        self._write_header(game, None)
+        self._games[game] = game.get_playernames()
+
+    def _write_header(self, game, position):
+        """Writes a game header, first saving the position of the game whose header was written before
+
+        Parameters:
+            game : the KubaGame being recorded
+            position : position to record the game from, or None for its current position
+        Returns:
+            None
+        """
+        current = self._current() if self._current is not None else None
+        if current is not None and current is not game and current in self._games:
+            self._positions[current] = current.to_bytes()
+        self._file.write(encode_game_header(game, position))
+        self._current = weakref.ref(game)
+
+    def record_move(self, game, playername, coordinates, direction):
+        """Writes one move record; called by KubaGame.make_move after the move is made
+
+        A move belongs to the game whose header was written last, so when games being recorded take turns, the
+        header of the game is written again, with its position before the move, ahead of the move record.
+
+        Parameters:
+            game : the KubaGame the move was made in
+            playername : name of player who made the move
+            coordinates : coordinates of the pushed marble as a tuple (row, column)
+            direction : direction of the push
+        Returns:
+            None
+        """
+        player_index = self._games[game].index(playername)
+        if self._current is None or self._current() is not game:
+            self._write_header(game, self._positions.pop(game))
+        self._file.write(encode_move(player_index, coordinates, direction))
+        if game.get_winner() is not None:
+            del self._games[game]
+
+    def flush(self):
+        """Flushes written records to the file"""
+        self._file.flush()
+
+    def close(self):
+        """Closes the file"""
+        self._file.close()
+
+
+class GameRecord:
+    """One recorded game, read from an archive. The moves are a view into the archive and are decoded lazily.
+
+    Data Members:
+        player_one : ('Player One Name', 'W')
+        player_two : ('Player Two Name', 'B')
+        position : the POSITION_SIZE byte position the game was recorded from
+        moves : memoryview of the game's move records
+
+    Methods:
+        get_move_count() --> int
+        get_moves() --> generator of tuples (playername, coordinates, direction)
+        replay(engine) --> generator of tuples (game, (playername, coordinates, direction))
+    """
+
+    def __init__(self, player_one, player_two, position, moves):
+        """Initialize the GameRecord data members"""
+        self.player_one = player_one
+        self.player_two = player_two
+        self.position = position
+        self.moves = moves
+
+    def get_move_count(self):
+        """Returns the number of moves in the game"""
+        return len(self.moves) // MOVE_SIZE
+
+    def get_moves(self):
+        """Decodes the game's moves one at a time
+
+        Returns:
+            a generator of tuples (playername, coordinates, direction)
+        """
+        playernames = (self.player_one[0], self.player_two[0])
+        moves = self.moves
+        for start in range(0, len(moves), MOVE_SIZE):
+            player_index, coordinates, direction = decode_move(moves[start], moves[start + 1])
+            yield playernames[player_index], coordinates, direction
+
+    def replay(self, engine="list"):
+        """Replays the game into a new KubaGame, one move at a time
+
+        The same KubaGame is yielded after every move; copy it if it is needed after the next move.
+
+        Parameters:
+            engine : one of KubaGame.ENGINES
+        Returns:
+            a generator of tuples (game, move) with the game just after move was made
+        """
+        game = KubaGame.from_bytes(self.position, self.player_one, self.player_two, engine)
+        for move in self.get_moves():
+            if not game.make_move(*move):
+                raise ValueError("recorded move " + str(move) + " can not be made")
+            yield game, move
+
+
+def read_games(buffer):
+    """Reads the games in an archive one at a time, without copying it
+
+    Parameters:
+        buffer : bytes, bytearray, memoryview, mmap, or any other object supporting the buffer protocol
+    Returns:
+        a generator of GameRecord
+    """
+    view = memoryview(buffer).cast("B")
+    if bytes(view[:len(FILE_MAGIC)]) != FILE_MAGIC:
+        raise ValueError("not a Kuba game record archive")
+
+    position = len(FILE_MAGIC)
+    end = len(view)
+    while position < end:
+        player_one, player_two, game_position, position = decode_game_header(view, position)
+
+        moves_start = position
+        while position < end and view[position] != GAME_TAG:
+            position += MOVE_SIZE
+        yield GameRecord(player_one, player_two, game_position, view[moves_start:position])
+
+
+def read_archive(path):
+    """Memory-maps an archive file and reads the games in it one at a time
+
+    Parameters:
+        path : path of the record file
+    Returns:
+        a generator of GameRecord
+    """
+    with open(path, "rb") as file:
+        archive = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield from read_games(archive)
+    finally:
+        try:
+            archive.close()
+        except BufferError:  # A GameRecord is still being used; the map is closed once it is freed
+            pass
@@ -0,0 +1,368 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: An asyncio server hosting many KubaGame matches at once, played over a line-delimited JSON protocol
+#              on a TCP port or a Unix socket, with move updates pushed to subscribed connections.
+#              Run with: python -m KubaServer [--host 127.0.0.1] [--port 8765] [--unix PATH]
+
+from KubaGame import KubaGame, ENGINES
+import argparse
+import asyncio
+import functools
+import json
+import sys
+
+# Every request is one JSON object on one line, with an 'op' and an optional 'id' that is copied into the response:
+#     {"op": "create", "players": [["Ann", "W"], ["Bob", "B"]], "engine": "list"}  --> {"game": game id}
+#     {"op": "move", "game": id, "player": "Ann", "coordinates": [6, 6], "direction": "F", "include_moves": false}
+#         --> {"moved": boolean, "turn": playername, "winner": playername, "moves": [...] if include_moves}
+#     {"op": "moves", "game": id, "player": "Ann"}  --> {"moves": [[[row, column], direction], ...]}
+#     {"op": "state", "game": id}  --> {"board": [...], "turn": ..., "winner": ..., "captured": {playername: count}}
+#     {"op": "subscribe", "game": id} / {"op": "unsubscribe", "game": id}
+#     {"op": "close", "game": id}
+# Responses are one line each, with "ok": true, or "ok": false and an "error". Subscribed connections are also sent
+# one line per move made in the game, holding only the cells it changed rather than the whole board:
+#     {"event": "move", "game": id, "player": "Ann", "changes": [[[row, column], marble], ...], "captured": color or
+#     null, "turn": playername, "winner": playername}
+# Event lines have no 'id', so they can be told apart from responses. A request line longer than LINE_LIMIT bytes
+# gets an error response and the connection is closed.
+LINE_LIMIT = 65536
+# Bytes of event lines that may wait to be sent to one subscriber before it is taken to be lagging and disconnected
+EVENT_BUFFER_LIMIT = 1 << 20
+
+
+class RequestError(Exception):
+    """Raised while handling a request that can not be carried out; the message is sent back as the error"""
+    pass
+
+
+class KubaServer:
+    """Hosts KubaGame matches for clients connected over TCP or a Unix socket.
+
+    All games live in one event loop, so requests are handled one at a time and games need no locking.
+
+    Data Members (private):
+        _event_buffer_limit : bytes of event lines that may wait to be sent to a subscriber before it is disconnected
+        _games : dict with game id as key and KubaGame as value
+        _subscribers : dict with game id as key and a set of the asyncio.StreamWriter of subscribed connections, for
+            games with at least one subscriber
+        _publishers : dict with game id as key and the observer the game calls with its move events, for games in
+            _subscribers; games without subscribers have no observer, so their moves build no events
+        _next_game_id : id given to the next game created
+        _moves : number of moves made on the server
+        _server : the asyncio server once started, otherwise None
+        _connections : set of the asyncio.StreamWriter of every open connection
+
+    Methods:
+        start(host, port, path)
+        get_address() --> tuple (host, port) or path
+        serve_forever()
+        close()
+        handle_connection(reader, writer)
+        handle_request(request, writer) --> dict
+        create_game(players, engine) --> int
+        get_game(request) --> KubaGame
+        add_subscriber(game_id, writer)
+        remove_subscriber(game_id, writer)
+        publish(game_id, event)
+        publish_move(game_id, event)
+        get_stats() --> dict
+    """
+
+    def __init__(self, event_buffer_limit=EVENT_BUFFER_LIMIT):
+        """Initialize the KubaServer data members
+
+        Parameters:
+            event_buffer_limit : bytes of event lines that may wait to be sent to a subscriber before it is
+                disconnected
+        Returns:
+            None
+        """
+        self._event_buffer_limit = event_buffer_limit
+        self._games = {}
+        self._subscribers = {}
+        self._publishers = {}
+        self._next_game_id = 1
+        self._moves = 0
+        self._server = None
+        self._connections = set()
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """Starts listening for connections
+
+        Parameters:
+            host : address to listen on for TCP connections
+            port : TCP port to listen on; 0 picks a free port
+            path : if given, listen on this Unix socket path instead of TCP
+        Returns:
+            None
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self.handle_connection, path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT)
+
+    def get_address(self):
+        """Returns the (host, port) or Unix socket path the server is listening on"""
+        address = self._server.sockets[0].getsockname()
+        if isinstance(address, tuple):
+            return address[:2]
+        return address
+
+    async def serve_forever(self):
+        """Handles connections until the server is closed"""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops listening and closes the open connections
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle_connection(self, reader, writer):
+        """Reads requests from one connection and writes back a response to each, until the client disconnects
+
+        Parameters:
+            reader : asyncio.StreamReader of the connection
+            writer : asyncio.StreamWriter of the connection
+        Returns:
+            None
+        """
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Longer than LINE_LIMIT; the rest of the line can not be told from a request
+                    error = "request line longer than {} bytes".format(LINE_LIMIT)
+                    writer.write(json.dumps({"ok": False, "error": error}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RequestError("request must be a JSON object")
+                    response = self.handle_request(request, writer)
+                    response["ok"] = True
+                except (ValueError, TypeError, RequestError) as error:
+                    response = {"ok": False, "error": str(error)}
+                if isinstance(request, dict) and "id" in request:
+                    response["id"] = request["id"]
+
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            for game_id in [game_id for game_id, subscribers in self._subscribers.items() if writer in subscribers]:
+                self.remove_subscriber(game_id, writer)
+            writer.close()
+
+    def handle_request(self, request, writer):
+        """Carries out one request
+
+        Parameters:
+            request : dict decoded from the request line
+            writer : asyncio.StreamWriter of the connection the request came from, for subscriptions
+        Returns:
+            a dict with the fields of the response
+        """
+        op = request.get("op")
+        if op == "create":
+            players = request.get("players", [["player1", "W"], ["player2", "B"]])
+            return {"game": self.create_game(players, request.get("engine", "list"))}
+
+        game = self.get_game(request)
+        game_id = request["game"]
+        if op == "move":
+            playername = request.get("player")
+            coordinates = tuple(request.get("coordinates", ()))
+            direction = request.get("direction")
+            moved = game.make_move(playername, coordinates, direction)
+            if moved:
+                self._moves += 1
+            response = {"moved": moved, "turn": game.get_current_turn(), "winner": game.get_winner()}
+            if request.get("include_moves"):
+                response["moves"] = game.legal_moves(game.get_current_turn())
+            return response
+
+        if op == "moves":
+            return {"moves": game.legal_moves(request.get("player"))}
+
+        if op == "state":
+            board = [[game.get_marble((row, column)) for column in range(7)] for row in range(7)]
+            return {"board": board, "turn": game.get_current_turn(), "winner": game.get_winner(),
+                    "captured": {playername: game.get_captured(playername) for playername in game.get_playernames()}}
+
+        if op == "subscribe":
+            self.add_subscriber(game_id, writer)
+            return {}
+
+        if op == "unsubscribe":
+            self.remove_subscriber(game_id, writer)
+            return {}
+
+        if op == "close":
+            for writer in list(self._subscribers.get(game_id, ())):
+                self.remove_subscriber(game_id, writer)
+            del self._games[game_id]
+            return {}
+
+        raise RequestError("unknown op " + str(op))
+
+    def create_game(self, players, engine="list"):
+        """Creates a game and returns its id
+
+        Parameters:
+            players : list of two [playername, color] pairs
+            engine : one of ENGINES
+        Returns:
+            the game id as an int
+        """
+        if engine not in ENGINES:
+            raise RequestError("engine must be one of " + ", ".join(ENGINES))
+        if len(players) != 2 or sorted(color for _, color in players) != ["B", "W"]:
+            raise RequestError("players must be two [name, color] pairs, one 'W' and one 'B'")
+        if players[0][0] == players[1][0]:
+            raise RequestError("player names must be different")
+
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        self._games[game_id] = KubaGame(tuple(players[0]), tuple(players[1]), engine=engine)
+        return game_id
+
+    def get_game(self, request):
+        """Returns the game named by the request's 'game' field
+
+        Parameters:
+            request : dict decoded from the request line
+        Returns:
+            KubaGame
+        """
+        game = self._games.get(request.get("game"))
+        if game is None:
+            raise RequestError("no game " + str(request.get("game")))
+        return game
+
+    def add_subscriber(self, game_id, writer):
+        """Subscribes a connection to a game's move events, subscribing the server to the game's moves first if it is
+        the game's first subscriber
+
+        Parameters:
+            game_id : id of a game in _games
+            writer : asyncio.StreamWriter of the connection
+        Returns:
+            None
+        """
+        if game_id not in self._subscribers:
+            self._subscribers[game_id] = set()
+            self._publishers[game_id] = functools.partial(self.publish_move, game_id)
+            self._games[game_id].subscribe(self._publishers[game_id])
+        self._subscribers[game_id].add(writer)
+
+    def remove_subscriber(self, game_id, writer):
+        """Unsubscribes a connection from a game's move events, unsubscribing the server from the game's moves if it
+        was the game's last subscriber
+
+        Parameters:
+            game_id : id of the game
+            writer : asyncio.StreamWriter of the connection
+        Returns:
+            None
+        """
+        subscribers = self._subscribers.get(game_id)
+        if subscribers is None:
+            return None
+        subscribers.discard(writer)
+        if not subscribers:
+            del self._subscribers[game_id]
+            self._games[game_id].unsubscribe(self._publishers.pop(game_id))
+        return None
+
+    def publish(self, game_id, event):
+        """Sends an event line to every connection subscribed to a game
+
+        Events are queued on each connection without waiting for it to be sent, so a slow subscriber does not hold
+        up the game. Connections that have closed are dropped, and so are connections with more than
+        _event_buffer_limit bytes still waiting to be sent, which are closed rather than left to buffer without end.
+
+        Parameters:
+            game_id : id of the game
+            event : dict to send
+        Returns:
+            None
+        """
+        subscribers = self._subscribers.get(game_id)
+        if not subscribers:
+            return None
+
+        line = json.dumps(event).encode("utf-8") + b"\n"
+        for writer in list(subscribers):
+            if writer.is_closing():
+                self.remove_subscriber(game_id, writer)
+            elif writer.transport.get_write_buffer_size() > self._event_buffer_limit:
+                self.remove_subscriber(game_id, writer)
+                writer.close()
+            else:
+                writer.write(line)
+        return None
+
+    def publish_move(self, game_id, event):
+        """Sends a game's move event from KubaGame.get_move_event to its subscribers
+
+        Parameters:
+            game_id : id of the game
+            event : dict returned by KubaGame.get_move_event
+        Returns:
+            None
+        """
+        self.publish(game_id, dict(event, event="move", game=game_id))
+
+    def get_stats(self):
+        """Returns a dict with the number of 'games' hosted and 'moves' made"""
+        return {"games": len(self._games), "moves": self._moves}
+
+
+async def serve(host, port, path):
+    """Runs a server until it is interrupted"""
+    server = KubaServer()
+    await server.start(host, port, path)
+    print("Serving Kuba games on", server.get_address())
+    await server.serve_forever()
+
+
+def main(arguments=None):
+    """Runs the server from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status 0
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaServer", description="Hosts Kuba games over JSON lines.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    options = parser.parse_args(arguments)
+    try:
+        asyncio.run(serve(options.host, options.port, options.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A session store for many more Kuba games than are played at any moment. The most recently used games
+#              stay in memory up to a budget of games or bytes; the rest are evicted to a spill file and rehydrated
+#              the next time they are used.
+
+from KubaGame import KubaGame
+from KubaRecord import FILE_MAGIC, decode_game_header, encode_game_header
+import collections
+import sys
+
+# The spill file is a KubaRecord archive holding one game header (players and position) per evicted game. A game
+# evicted again gets a new header, and the old one is dead space until the file is compacted.
+COMPACT_MIN_BYTES = 65536
+
+
+def estimate_game_size(game):
+    """Estimates the bytes of memory a game takes, counting its data members and the containers inside them
+
+    Strings and small ints shared between games are counted too, so this is an upper estimate.
+
+    Parameters:
+        game : KubaGame, CompactKubaGame, or any game whose __getstate__ returns a dict of its data members
+    Returns:
+        int number of bytes
+    """
+    def deep_size(value, depth):
+        size = sys.getsizeof(value)
+        if depth == 0:
+            return size
+        if isinstance(value, dict):
+            return size + sum(deep_size(key, 0) + deep_size(item, depth - 1) for key, item in value.items())
+        if isinstance(value, (list, tuple)):
+            return size + sum(deep_size(item, depth - 1) for item in value)
+        return size
+
+    state = game.__getstate__()
+    return sys.getsizeof(game) + deep_size(state, 3)
+
+
+class SessionStore:
+    """Holds games by id, keeping the most recently used in memory and the rest in a spill file.
+
+    Game sizes are estimated when a game is added or read back, and not as it is played.
+
+    Only a game's position is kept while it is evicted (as KubaGame.to_bytes), so its undo stack, recorder and
+    observers are dropped; games that need them should be kept outside the store.
+
+    Data Members (private):
+        _file : the spill file, opened for reading and writing
+        _resident : OrderedDict with game id as key and a tuple (game, estimated size) as value, least recently
+            used first
+        _evicted : dict with game id as key and a tuple (offset, length) of the game's header in _file as value
+        _max_games : most games kept in memory, or None for no limit
+        _max_bytes : most estimated bytes of games kept in memory, or None for no limit
+        _game_class : class of the games, with from_bytes(data, player_one, player_two); KubaGame by default
+        _resident_bytes : estimated bytes of the games in memory
+        _rehydrated_size : estimated size of a game read back from _file, worked out for the first one only, since
+            they all hold the same data members; None until then
+        _dead_bytes : bytes of _file holding headers that are no longer used
+        _next_game_id : id given to the next game added
+        _evictions : number of games evicted
+        _rehydrations : number of games read back from _file
+
+    Methods:
+        create_game(player_one, player_two) --> int
+        add_game(game) --> int
+        get_game(game_id) --> game
+        get_session(game_id) --> GameSession
+        remove_game(game_id)
+        evict(game_id)
+        trim(keep)
+        compact()
+        get_stats() --> dict
+        close()
+    """
+
+    def __init__(self, path, max_games=10000, max_bytes=None, game_class=KubaGame):
+        """Creates an empty store, truncating the spill file
+
+        Parameters:
+            path : path of the spill file
+            max_games : most games kept in memory, or None for no limit
+            max_bytes : most estimated bytes of games kept in memory (see estimate_game_size), or None for no limit
+            game_class : class of the games created and rehydrated, such as KubaGame or CompactKubaGame
+        Returns:
+            None
+        """
+        self._file = open(path, "w+b")
+        self._file.write(FILE_MAGIC)
+        self._resident = collections.OrderedDict()
+        self._evicted = {}
+        self._max_games = max_games
+        self._max_bytes = max_bytes
+        self._game_class = game_class
+        self._resident_bytes = 0
+        self._rehydrated_size = None
+        self._dead_bytes = 0
+        self._next_game_id = 1
+        self._evictions = 0
+        self._rehydrations = 0
+
+    def __enter__(self):
+        """Returns self so the file is closed at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the file"""
+        self.close()
+
+    def __len__(self):
+        """Returns the number of games in the store, in memory or evicted"""
+        return len(self._resident) + len(self._evicted)
+
+    def __contains__(self, game_id):
+        """Returns a boolean value based on if game_id is a game in the store"""
+        return game_id in self._resident or game_id in self._evicted
+
+    def close(self):
+        """Closes the spill file; the evicted games are lost
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        self._file.close()
+
+    def create_game(self, player_one, player_two):
+        """Creates a game with the store's game class and adds it
+
+        Parameters:
+            player_one : ('Player One Name', 'W')
+            player_two : ('Player Two Name', 'B')
+        Returns:
+            the game id as an int
+        """
+        return self.add_game(self._game_class(player_one, player_two))
+
+    def add_game(self, game):
+        """Adds a game as the most recently used, evicting others if the store is over budget
+
+        Parameters:
+            game : a game of the store's game class
+        Returns:
+            the game id as an int
+        """
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        size = estimate_game_size(game)
+        self._resident[game_id] = (game, size)
+        self._resident_bytes += size
+        self.trim(game_id)
+        return game_id
+
+    def get_game(self, game_id):
+        """Returns a game, reading it back from the spill file if it was evicted, and marks it most recently used
+
+        The game returned may be evicted by later calls to the store, after which changes to it are no longer
+        seen by the store; use get_session for a handle that always reaches the current game.
+
+        Parameters:
+            game_id : id of the game
+        Returns:
+            the game
+        """
+        entry = self._resident.get(game_id)
+        if entry is not None:
+            self._resident.move_to_end(game_id)
+            return entry[0]
+
+        if game_id not in self._evicted:
+            raise KeyError(game_id)
+        offset, length = self._evicted.pop(game_id)
+        self._file.flush()
+        self._file.seek(offset)
+        player_one, player_two, position, _ = decode_game_header(memoryview(self._file.read(length)), 0)
+        self._file.seek(0, 2)
+        self._dead_bytes += length
+        self._rehydrations += 1
+
+        game = self._game_class.from_bytes(position, player_one, player_two)
+        if self._rehydrated_size is None:
+            self._rehydrated_size = estimate_game_size(game)
+        self._resident[game_id] = (game, self._rehydrated_size)
+        self._resident_bytes += self._rehydrated_size
+        self.trim(game_id)
+        return game
+
+    def get_session(self, game_id):
+        """Returns a GameSession for a game in the store
+
+        Parameters:
+            game_id : id of the game
+        Returns:
+            GameSession
+        """
+        if game_id not in self:
+            raise KeyError(game_id)
+        return GameSession(self, game_id)
+
+    def remove_game(self, game_id):
+        """Removes a game from the store
+
+        Parameters:
+            game_id : id of the game
+        Returns:
+            None
+        """
+        entry = self._resident.pop(game_id, None)
+        if entry is not None:
+            self._resident_bytes -= entry[1]
+            return None
+
+        if game_id not in self._evicted:
+            raise KeyError(game_id)
+        self._dead_bytes += self._evicted.pop(game_id)[1]
+        return None
+
+    def evict(self, game_id):
+        """Writes a game in memory to the spill file and drops it from memory
+
+        Parameters:
+            game_id : id of a game in memory
+        Returns:
+            None
+        """
+        game, size = self._resident.pop(game_id)
+        self._resident_bytes -= size
+        header = encode_game_header(game)
+        self._evicted[game_id] = (self._file.tell(), len(header))
+        self._file.write(header)
+        self._evictions += 1
+
+        if self._dead_bytes > COMPACT_MIN_BYTES and self._dead_bytes * 2 > self._file.tell():
+            self.compact()
+
+    def trim(self, keep=None):
+        """Evicts the least recently used games until the games in memory are within the budget
+
+        At least one game is always kept in memory, even if it alone is over max_bytes.
+
+        Parameters:
+            keep : id of a game that must not be evicted, or None
+        Returns:
+            None
+        """
+        while len(self._resident) > 1 and ((self._max_games is not None and len(self._resident) > self._max_games)
+                                           or (self._max_bytes is not None
+                                               and self._resident_bytes > self._max_bytes)):
+            game_id = next(iter(self._resident))
+            if game_id == keep:
+                self._resident.move_to_end(game_id)
+                game_id = next(iter(self._resident))
+            self.evict(game_id)
+
+    def compact(self):
+        """Rewrites the spill file with only the headers of the games that are evicted now
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        self._file.flush()
+        self._file.seek(0)
+        data = self._file.read()
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(FILE_MAGIC)
+        for game_id, (offset, length) in self._evicted.items():
+            self._evicted[game_id] = (self._file.tell(), length)
+            self._file.write(data[offset:offset + length])
+        self._dead_bytes = 0
+
+    def get_stats(self):
+        """Returns a dict with the number of 'games', 'resident' games, 'evicted' games, 'resident bytes' (estimated),
+        'file bytes' of the spill file, 'evictions' and 'rehydrations'"""
+        return {
+            "games": len(self),
+            "resident": len(self._resident),
+            "evicted": len(self._evicted),
+            "resident bytes": self._resident_bytes,
+            "file bytes": self._file.seek(0, 2),
+            "evictions": self._evictions,
+            "rehydrations": self._rehydrations
+        }
+
+
+class GameSession:
+    """A handle to one game in a SessionStore that can be used like the game itself.
+
+    Every attribute is looked up on the store's current copy of the game, so calling a method such as make_move or
+    get_marble rehydrates the game if it was evicted. Bound methods kept from an earlier lookup may belong to a copy
+    that has since been evicted.
+
+    Data Members (private):
+        _store : the SessionStore holding the game
+        _game_id : id of the game in _store
+
+    Methods:
+        get_game_id() --> int
+        any method of the game
+    """
+
+    __slots__ = ("_store", "_game_id")
+
+    def __init__(self, store, game_id):
+        """Initialize the GameSession data members"""
+        self._store = store
+        self._game_id = game_id
+
+    def __getattr__(self, name):
+        """Returns the attribute 'name' of the game, rehydrating it if it was evicted"""
+        return getattr(self._store.get_game(self._game_id), name)
+
+    def get_game_id(self):
+        """Returns the id of the game in the store"""
+        return self._game_id
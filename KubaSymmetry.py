@@ -0,0 +1,229 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Symmetries of Kuba positions. The rules are unchanged by rotating or reflecting the board and by
+#              swapping white and black, so positions that differ only by one of these 16 transforms share a
+#              canonical form that caches, tables and opening books can be keyed on.
+
+from KubaGame import KubaGame, BYTE_CELLS, DIRECTION_STEPS, MARBLE_CODES, MARBLES
+
+# A transform is a tuple (symmetry, swap). Symmetry 0-7 is one of the board's rotations and reflections: bit 2
+# transposes rows and columns, then bit 0 flips the rows and bit 1 flips the columns. Swap is True if white and
+# black marbles change places.
+TRANSFORMS = [(symmetry, swap) for swap in (False, True) for symmetry in range(8)]
+IDENTITY = (0, False)
+
+DIRECTIONS = ("L", "R", "F", "B")
+SWAPPED_MARBLES = {"X": "X", "W": "B", "B": "W", "R": "R"}
+
+
+def map_cell(row, column, symmetry):
+    """Returns where symmetry 0-7 moves the cell (row, column) to"""
+    if symmetry & 4:
+        row, column = column, row
+    if symmetry & 1:
+        row = 6 - row
+    if symmetry & 2:
+        column = 6 - column
+    return row, column
+
+
+def map_step(row_step, column_step, symmetry):
+    """Returns the push direction symmetry 0-7 turns the step (row step, column step) into"""
+    if symmetry & 4:
+        row_step, column_step = column_step, row_step
+    if symmetry & 1:
+        row_step = -row_step
+    if symmetry & 2:
+        column_step = -column_step
+    return next(direction for direction in DIRECTIONS if DIRECTION_STEPS[direction] == (row_step, column_step))
+
+
+def build_cell_sources(symmetry):
+    """Returns a tuple whose item 'index' is the index (row * 7 + column) of the cell symmetry moves to 'index'"""
+    sources = [0] * 49
+    for index in range(49):
+        row, column = map_cell(index // 7, index % 7, symmetry)
+        sources[row * 7 + column] = index
+    return tuple(sources)
+
+
+def find_inverse(symmetry):
+    """Returns the symmetry 0-7 that undoes symmetry"""
+    for inverse in range(8):
+        if all(map_cell(*map_cell(index // 7, index % 7, symmetry), inverse) == (index // 7, index % 7)
+               for index in range(49)):
+            return inverse
+
+
+# Lookup tables for each symmetry 0-7: the source of every cell, the direction every push direction becomes,
+# and the symmetry that undoes it
+CELL_SOURCES = [build_cell_sources(symmetry) for symmetry in range(8)]
+DIRECTION_MAPS = [{direction: map_step(*DIRECTION_STEPS[direction], symmetry) for direction in DIRECTIONS}
+                  for symmetry in range(8)]
+INVERSE_SYMMETRIES = [find_inverse(symmetry) for symmetry in range(8)]
+
+
+def invert_transform(transform):
+    """Returns the transform that undoes 'transform'
+
+    Parameters:
+        transform : tuple (symmetry, swap) from TRANSFORMS
+
+    Returns:
+        a tuple (symmetry, swap) from TRANSFORMS
+    """
+    return INVERSE_SYMMETRIES[transform[0]], transform[1]
+
+
+def transform_coordinates(coordinates, transform):
+    """Returns where 'transform' moves the cell at 'coordinates' to
+
+    Parameters:
+        coordinates : tuple (row, column)
+        transform : tuple (symmetry, swap) from TRANSFORMS
+
+    Returns:
+        a tuple (row, column)
+    """
+    return map_cell(coordinates[0], coordinates[1], transform[0])
+
+
+def transform_direction(direction, transform):
+    """Returns the direction a push in 'direction' becomes under 'transform'
+
+    Parameters:
+        direction : one of 'L', 'R', 'F', 'B'
+        transform : tuple (symmetry, swap) from TRANSFORMS
+
+    Returns:
+        one of 'L', 'R', 'F', 'B'
+    """
+    return DIRECTION_MAPS[transform[0]][direction]
+
+
+def transform_move(move, transform):
+    """Returns the move 'move' becomes under 'transform'
+
+    To play a move found in the canonical position, translate it back with invert_transform of the transform
+    returned by canonical_form.
+
+    Parameters:
+        move : tuple (coordinates, direction)
+        transform : tuple (symmetry, swap) from TRANSFORMS
+
+    Returns:
+        a tuple (coordinates, direction)
+    """
+    return transform_coordinates(move[0], transform), DIRECTION_MAPS[transform[0]][move[1]]
+
+
+def transform_marble(marble, transform):
+    """Returns the marble 'marble' becomes under 'transform': white and black change places if it swaps colors
+
+    Parameters:
+        marble : one of 'X', 'W', 'B', 'R'
+        transform : tuple (symmetry, swap) from TRANSFORMS
+
+    Returns:
+        one of 'X', 'W', 'B', 'R'
+    """
+    if transform[1]:
+        return SWAPPED_MARBLES[marble]
+    return marble
+
+
+def get_cells(data):
+    """Returns the 49 cells of a position packed by KubaGame.to_bytes as a list of marbles, row by row"""
+    cells = []
+    for value in data[:13]:
+        cells.extend(BYTE_CELLS[value])
+    return cells[:49]
+
+
+def pack_cells(cells):
+    """Packs 49 marbles, row by row, into the 13 board bytes of KubaGame.to_bytes"""
+    packed = 0
+    for index, marble in enumerate(cells):
+        packed |= MARBLE_CODES[marble] << index * 2
+    return packed.to_bytes(13, "little")
+
+
+def transform_forbidden(value, transform):
+    """Returns the forbidden move byte of KubaGame.to_bytes, 'value', as it is under 'transform'"""
+    if value == 0:
+        return 0
+    cell, direction_index = divmod(value - 1, 4)
+    coordinates, direction = transform_move((divmod(cell, 7), DIRECTIONS[direction_index]), transform)
+    return 1 + (coordinates[0] * 7 + coordinates[1]) * 4 + DIRECTIONS.index(direction)
+
+
+def transform_game(game, transform, engine="list"):
+    """Returns a copy of 'game' with 'transform' applied to its position
+
+    The players keep their names, places and capture counts; if the transform swaps colors, they also swap marble
+    colors. The copy has no undo history.
+
+    Parameters:
+        game : KubaGame
+        transform : tuple (symmetry, swap) from TRANSFORMS
+        engine : board engine of the copy, one of ENGINES
+
+    Returns:
+        a new KubaGame
+    """
+    data = game.to_bytes()
+    cells = get_cells(data)
+    sources = CELL_SOURCES[transform[0]]
+    transformed = [transform_marble(cells[source], transform) for source in sources]
+
+    players = tuple((playername, transform_marble(game.get_color(playername), transform))
+                    for playername in game.get_playernames())
+    packed = pack_cells(transformed) + bytes((data[13], transform_forbidden(data[14], transform), data[15]))
+    return KubaGame.from_bytes(packed, *players, engine=engine)
+
+
+def canonical_form(game):
+    """Returns the canonical form of the position of 'game', and the transform that takes the position there
+
+    The canonical form is the same for every position that one of the 16 transforms maps to another, and is
+    different otherwise. It names players by color rather than by name, so games between different players share
+    it too. Moves found for the canonical position are translated back with
+    transform_move(move, invert_transform(transform)).
+
+    Parameters:
+        game : KubaGame
+
+    Returns:
+        a tuple (key, transform). key : bytes of length KubaGame.POSITION_SIZE; 13 bytes of board as in
+        KubaGame.to_bytes, then red marbles captured by white and by black (a nibble each), the forbidden move as
+        in KubaGame.to_bytes, and the color to move and the winning color (2 bits each; 0 for None, 1 for 'W',
+        2 for 'B'). transform : tuple (symmetry, swap) from TRANSFORMS
+    """
+    data = game.to_bytes()
+    cells = get_cells(data)
+    codes = [MARBLE_CODES[marble] for marble in cells]
+    swapped_codes = [MARBLE_CODES[SWAPPED_MARBLES[marble]] for marble in cells]
+
+    captures = {"W": 0, "B": 0}
+    for playername in game.get_playernames():
+        captures[game.get_color(playername)] = game.get_captured(playername)
+    turn = game.get_current_turn()
+    winner = game.get_winner()
+    turn_color = MARBLE_CODES[game.get_color(turn)] if turn is not None else 0
+    winner_color = MARBLE_CODES[game.get_color(winner)] if winner is not None else 0
+
+    best = None
+    for transform in TRANSFORMS:
+        symmetry, swap = transform
+        board = tuple((swapped_codes if swap else codes)[source] for source in CELL_SOURCES[symmetry])
+        if swap:
+            tail = (captures["B"] | captures["W"] << 4, transform_forbidden(data[14], transform),
+                    (3 - turn_color) % 3 | (3 - winner_color) % 3 << 2)
+        else:
+            tail = (captures["W"] | captures["B"] << 4, transform_forbidden(data[14], transform),
+                    turn_color | winner_color << 2)
+        if best is None or (board, tail) < best[:2]:
+            best = (board, tail, transform)
+
+    board, tail, transform = best
+    return pack_cells(MARBLES[code] for code in board) + bytes(tail), transform
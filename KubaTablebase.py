@@ -0,0 +1,508 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Retrograde endgame tablebases for Kuba positions with little material left, stored as a
+#              memory-mapped table of win/loss/draw and distance to the end of the game for the player to move.
+#              Generate with: python -m KubaTablebase [--max-marbles 3] tablebase.kubt
+
+from KubaGame import MARBLE_CODES
+from itertools import combinations
+import argparse
+import bisect
+import heapq
+import mmap
+import struct
+import sys
+
+# Positions are seen from the player to move: 'us' are that player's marbles and 'them' the opponent's. A material
+# is a tuple (us, them, red) of marble counts, and its table holds one byte per position, indexed by
+#     ((board rank * (1 + 4 * us) + forbidden) * (red + 1) + need us - 1) * (red + 1) + need them - 1
+# board rank : rank of the cells of our marbles, then of theirs among the free cells, then of the reds among the
+#     cells still free, each in the combinatorial number system
+# forbidden : 0, or 1 + 4 * (rank of the marble among our marbles, in cell order) + direction index if pushing one
+#     of our marbles is the forbidden move
+# need : red marbles each player still has to capture to reach 7, at most red + 1 (which can not be reached)
+# The byte is 0 for a draw, or 1 + the number of moves to the end of the game with best play: even for a win for the
+# player to move, odd for a loss (a player who can not move has lost, and is stored as 1).
+TABLEBASE_MAGIC = b"KUBT\x01"
+HEADER = struct.Struct("<5sI")
+MATERIAL = struct.Struct("<BBBQ")
+DIRECTIONS = ("L", "R", "F", "B")
+OPPOSITE_INDEXES = (1, 0, 3, 2)
+EMPTY, US, THEM, RED = 0, 1, 2, 3
+DRAW = 0
+# The four marble codes packed into each possible byte of KubaGame.to_bytes, lowest bits first
+BYTE_CODES = [tuple((value >> shift) & 3 for shift in (0, 2, 4, 6)) for value in range(256)]
+
+# BINOMIALS[n][k] : n choose k, for n up to 49
+BINOMIALS = [[0] * 50 for _ in range(50)]
+for _n in range(50):
+    BINOMIALS[_n][0] = 1
+    for _k in range(1, _n + 1):
+        BINOMIALS[_n][_k] = BINOMIALS[_n - 1][_k - 1] + BINOMIALS[_n - 1][_k]
+
+
+def build_neighbours():
+    """Returns a list indexed by cell (row * 7 + column) of the four cells one step away in each of DIRECTIONS,
+    with -1 for steps off the board"""
+    steps = ((0, -1), (0, 1), (-1, 0), (1, 0))
+    neighbours = []
+    for cell in range(49):
+        row, column = divmod(cell, 7)
+        neighbours.append(tuple((row + row_step) * 7 + column + column_step
+                                if 0 <= row + row_step <= 6 and 0 <= column + column_step <= 6 else -1
+                                for row_step, column_step in steps))
+    return neighbours
+
+
+NEIGHBOURS = build_neighbours()
+
+
+def rank_cells(cells, taken):
+    """Returns the rank of the sorted 'cells' among the cells not in the sorted 'taken'"""
+    rank = 0
+    for index, cell in enumerate(cells):
+        rank += BINOMIALS[cell - bisect.bisect_left(taken, cell)][index + 1]
+    return rank
+
+
+def get_table_size(material):
+    """Returns the number of positions in the table of 'material', a tuple (us, them, red)"""
+    us, them, red = material
+    return (BINOMIALS[49][us] * BINOMIALS[49 - us][them] * BINOMIALS[49 - us - them][red]
+            * (1 + 4 * us) * (red + 1) ** 2)
+
+
+def get_board_index(material, us_cells, them_cells, red_cells, forbidden):
+    """Returns the index of a position in the table of 'material' without the red marbles each player needs, so
+    get_index is ((board index * (red + 1) + need us - 1) * (red + 1) + need them - 1)
+
+    Parameters:
+        material : tuple (us, them, red)
+        us_cells, them_cells, red_cells : sorted tuples of the cells (row * 7 + column) holding each kind of marble
+        forbidden : forbidden move index as described at the top of the module
+
+    Returns:
+        an int
+    """
+    us, them, red = material
+    taken = sorted(us_cells + them_cells)
+    board_rank = ((rank_cells(us_cells, ()) * BINOMIALS[49 - us][them] + rank_cells(them_cells, us_cells))
+                  * BINOMIALS[49 - us - them][red] + rank_cells(red_cells, taken))
+    return board_rank * (1 + 4 * us) + forbidden
+
+
+def get_index(material, us_cells, them_cells, red_cells, forbidden, need_us, need_them):
+    """Returns the index in the table of 'material' of a position
+
+    Parameters:
+        material : tuple (us, them, red)
+        us_cells, them_cells, red_cells : sorted tuples of the cells (row * 7 + column) holding each kind of marble
+        forbidden : forbidden move index as described at the top of the module
+        need_us, need_them : red marbles each player still needs, from 1 to red + 1
+
+    Returns:
+        an int
+    """
+    red = material[2]
+    board_index = get_board_index(material, us_cells, them_cells, red_cells, forbidden)
+    return (board_index * (red + 1) + need_us - 1) * (red + 1) + need_them - 1
+
+
+def get_moves(board, us_cells, forbidden):
+    """Finds every move the player to move can make
+
+    Parameters:
+        board : list of 49 cells holding EMPTY, US, THEM or RED
+        us_cells : sorted tuple of the cells holding our marbles
+        forbidden : forbidden move index as described at the top of the module
+
+    Returns:
+        a list of tuples (cell, direction index, end, captured). The pushed line runs from cell to end; captured is
+        the marble pushed off the board from end, or EMPTY if the line moved into the empty cell end
+    """
+    moves = []
+    for rank, cell in enumerate(us_cells):
+        for direction_index in range(4):
+            if forbidden == 1 + 4 * rank + direction_index:
+                continue
+            behind = NEIGHBOURS[cell][OPPOSITE_INDEXES[direction_index]]
+            if behind != -1 and board[behind] != EMPTY:
+                continue
+
+            position = cell
+            while True:
+                ahead = NEIGHBOURS[position][direction_index]
+                if ahead == -1:
+                    if board[position] != US:  # Our own marbles can not be pushed off
+                        moves.append((cell, direction_index, position, board[position]))
+                    break
+                if board[ahead] == EMPTY:
+                    moves.append((cell, direction_index, ahead, EMPTY))
+                    break
+                position = ahead
+    return moves
+
+
+def push(board, cell, direction_index, end):
+    """Returns a copy of board with the line from cell to end pushed one step in direction; the marble at end is
+    replaced by the one before it, so a marble pushed off the board from end disappears"""
+    pushed = list(board)
+    opposite = OPPOSITE_INDEXES[direction_index]
+    position = end
+    while position != cell:
+        previous = NEIGHBOURS[position][opposite]
+        pushed[position] = board[previous]
+        position = previous
+    pushed[cell] = EMPTY
+    return pushed
+
+
+def get_child_board(material, board, move):
+    """Works out the board after a move, seen from the opponent who moves next, for get_child
+
+    Parameters:
+        material : tuple (us, them, red) before the move
+        board : list of 49 cells before the move
+        move : tuple from get_moves
+
+    Returns:
+        a tuple (material, board index) after the move, with board index from get_board_index, or None as the board
+        index if the move captures the opponent's last marble
+    """
+    us, them, red = material
+    cell, direction_index, end, captured = move
+    if captured == RED:
+        red -= 1
+    elif captured == THEM:
+        them -= 1
+        if them == 0:
+            return (them, us, red), None
+    pushed = push(board, cell, direction_index, end)
+
+    # Seen from the opponent, their marbles are now 'us'
+    child_us = []
+    child_them = []
+    child_red = []
+    cells = (None, child_them, child_us, child_red)  # Indexed by EMPTY, US, THEM and RED
+    for index, marble in enumerate(pushed):
+        if marble != EMPTY:
+            cells[marble].append(index)
+    forbidden = 0
+    if captured == EMPTY and pushed[end] == THEM:  # Pushing the line back is forbidden
+        forbidden = 1 + 4 * child_us.index(end) + OPPOSITE_INDEXES[direction_index]
+    child_material = (them, us, red)
+    return child_material, get_board_index(child_material, tuple(child_us), tuple(child_them), tuple(child_red),
+                                           forbidden)
+
+
+def get_child(material, board, move, need_us, need_them, child_board=None):
+    """Works out the position after a move, seen from the opponent who moves next
+
+    Parameters:
+        material : tuple (us, them, red) before the move
+        board : list of 49 cells before the move
+        move : tuple from get_moves
+        need_us, need_them : red marbles each player needs before the move
+        child_board : get_child_board(material, board, move), if it has already been worked out
+
+    Returns:
+        None if the move wins the game at once, otherwise a tuple (material, index) of the position after it
+    """
+    if child_board is None:
+        child_board = get_child_board(material, board, move)
+    child_material, board_index = child_board
+    if move[3] == RED:
+        need_us -= 1
+        if need_us == 0:
+            return None
+    elif board_index is None:
+        return None
+
+    red = child_material[2]
+    return child_material, ((board_index * (red + 1) + min(need_them, red + 1) - 1) * (red + 1)
+                            + min(need_us, red + 1) - 1)
+
+
+def get_positions(material):
+    """Yields every position of 'material' as tuples (board, us cells, forbidden, need us, need them, index)"""
+    us, them, red = material
+    for us_cells in combinations(range(49), us):
+        free = [cell for cell in range(49) if cell not in us_cells]
+        for them_cells in combinations(free, them):
+            still_free = [cell for cell in free if cell not in them_cells]
+            for red_cells in combinations(still_free, red):
+                board = [EMPTY] * 49
+                for cells, marble in ((us_cells, US), (them_cells, THEM), (red_cells, RED)):
+                    for cell in cells:
+                        board[cell] = marble
+                # The positions of one board are in index order, forbidden move first then needs
+                index = get_index(material, us_cells, them_cells, red_cells, 0, 1, 1)
+                for forbidden in range(1 + 4 * us):
+                    for need_us in range(1, red + 2):
+                        for need_them in range(1, red + 2):
+                            yield board, us_cells, forbidden, need_us, need_them, index
+                            index += 1
+
+
+def solve(materials, solved):
+    """Retrograde analysis of positions whose moves without captures lead only to each other
+
+    Moves that capture lead to positions with less material, which are looked up in 'solved'. The other moves
+    are followed backwards from decided positions, shortest distance first, and positions left undecided are draws.
+
+    Parameters:
+        materials : list of materials (us, them, red) to solve together, such as (2, 1, 0) and (1, 2, 0)
+        solved : dict with materials as keys and bytearray tables as values, holding every material with less
+
+    Returns:
+        a dict with the materials as keys and their bytearray tables as values
+    """
+    offsets = {}
+    total = 0
+    for material in materials:
+        offsets[material] = total
+        total += get_table_size(material)
+
+    # Moves without captures, as lists of predecessors; and for each position the number of such moves still
+    # undecided, the longest distance among moves known to lose, whether a known move draws, and whether a known
+    # move wins (so the position is never taken to be lost, even once all of its other moves are known to lose)
+    predecessors = [[] for _ in range(total)]
+    undecided = [0] * total
+    longest = [0] * total
+    draws = bytearray(total)
+    wins = bytearray(total)
+    queue = []
+    for material in materials:
+        offset = offsets[material]
+        board_moves = None
+        for board, us_cells, forbidden, need_us, need_them, index in get_positions(material):
+            # The positions of one board differ only in forbidden move and needs, so its moves are worked out once
+            if board_moves is None or board is not board_moves[0]:
+                moves = get_moves(board, us_cells, 0)
+                board_moves = (board, [(move, 1 + 4 * us_cells.index(move[0]) + move[1],
+                                        get_child_board(material, board, move)) for move in moves])
+            state = offset + index
+            moves = [(move, child_board) for move, move_index, child_board in board_moves[1]
+                     if move_index != forbidden]
+            if not moves:
+                queue.append((0, state))  # The player to move can not move, and has lost
+                continue
+
+            shortest_win = None
+            for move, child_board in moves:
+                child = get_child(material, board, move, need_us, need_them, child_board)
+                if child is None:
+                    shortest_win = 1
+                    continue
+                child_material, child_index = child
+                if child_material in offsets:
+                    predecessors[offsets[child_material] + child_index].append(state)
+                    undecided[state] += 1
+                    continue
+
+                value = solved[child_material][child_index]
+                if value == DRAW:
+                    draws[state] = 1
+                elif value % 2 == 1:  # The opponent loses after this move
+                    if shortest_win is None or value < shortest_win:
+                        shortest_win = value
+                else:
+                    longest[state] = max(longest[state], value)
+
+            if shortest_win is not None:
+                wins[state] = 1
+                queue.append((shortest_win, state))
+            elif undecided[state] == 0 and not draws[state]:
+                queue.append((longest[state], state))
+
+    heapq.heapify(queue)
+    values = bytearray(total)
+    while queue:
+        distance, state = heapq.heappop(queue)
+        if values[state] != DRAW:
+            continue
+        if distance > 254:
+            raise ValueError("distance to the end of the game is too long to store")
+        values[state] = distance + 1
+        for predecessor in predecessors[state]:
+            if values[predecessor] != DRAW:
+                continue
+            if distance % 2 == 0:  # This position is lost, so moving to it wins
+                wins[predecessor] = 1
+                heapq.heappush(queue, (distance + 1, predecessor))
+            else:
+                undecided[predecessor] -= 1
+                longest[predecessor] = max(longest[predecessor], distance + 1)
+                if undecided[predecessor] == 0 and not draws[predecessor] and not wins[predecessor]:
+                    heapq.heappush(queue, (longest[predecessor], predecessor))
+
+    return {material: values[offsets[material]:offsets[material] + get_table_size(material)]
+            for material in materials}
+
+
+def get_materials(max_marbles):
+    """Returns every material (us, them, red) with at least one marble each for us and them and at most
+    'max_marbles' marbles in all, fewest marbles first"""
+    return [(us, total - red - us, red) for total in range(2, max_marbles + 1)
+            for red in range(total - 1) for us in range(1, total - red)]
+
+
+def generate_tablebase(path, max_marbles=3):
+    """Solves every material with up to 'max_marbles' marbles and writes the tables to a file
+
+    Parameters:
+        path : path of the tablebase file
+        max_marbles : most white, black and red marbles in all
+
+    Returns:
+        a list of the materials written
+    """
+    materials = get_materials(max_marbles)
+    solved = {}
+    for material in materials:
+        if material not in solved:
+            group = [material] if material[0] == material[1] else [material, (material[1], material[0], material[2])]
+            solved.update(solve(group, solved))
+
+    offset = HEADER.size + MATERIAL.size * len(materials)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(TABLEBASE_MAGIC, len(materials)))
+        for material in materials:
+            file.write(MATERIAL.pack(*material, offset))
+            offset += len(solved[material])
+        for material in materials:
+            file.write(solved[material])
+    return materials
+
+
+class KubaTablebase:
+    """A tablebase file written by generate_tablebase, memory-mapped and probed one position at a time.
+
+    Data Members (private):
+        _file : the open tablebase file
+        _map : read-only mmap of the tablebase file
+        _offsets : dict with materials (us, them, red) as keys and the offset of their table in the file as value
+
+    Methods:
+        get_materials() --> list of tuples (us, them, red)
+        probe(game) --> tuple (result, distance)
+        close()
+    """
+
+    def __init__(self, path):
+        """Opens and memory-maps a tablebase file
+
+        Parameters:
+            path : path of the tablebase file
+        Returns:
+            None
+        """
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._map, 0)
+        if magic != TABLEBASE_MAGIC:
+            self.close()
+            raise ValueError("not a Kuba tablebase")
+        self._offsets = {}
+        for index in range(count):
+            us, them, red, offset = MATERIAL.unpack_from(self._map, HEADER.size + index * MATERIAL.size)
+            self._offsets[(us, them, red)] = offset
+
+    def __enter__(self):
+        """Returns self so the file is closed at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the file"""
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the tablebase file
+
+        Parameters:
+            N/A
+        Returns:
+            None
+        """
+        self._map.close()
+        self._file.close()
+
+    def get_materials(self):
+        """Returns the materials (us, them, red) in the tablebase"""
+        return list(self._offsets)
+
+    def probe(self, game):
+        """Looks up the position in 'game' for the player whose turn it is
+
+        Parameters:
+            game : KubaGame
+
+        Returns:
+            a tuple (result, distance): result is 'win', 'loss' or 'draw' for the player to move, and distance the
+            number of moves to the end of the game with best play (0 for a draw). None if the game is over, has
+            not started, or its material is not in the tablebase
+        """
+        playername = game.get_current_turn()
+        if playername is None or game.get_winner() is not None:
+            return None
+
+        color = MARBLE_CODES[game.get_color(playername)]
+        data = game.to_bytes()
+        us_cells = []
+        them_cells = []
+        red_cells = []
+        cell = 0
+        for value in data[:13]:
+            for code in BYTE_CODES[value]:
+                if code == MARBLE_CODES["R"]:
+                    red_cells.append(cell)
+                elif code == color:
+                    us_cells.append(cell)
+                elif code != MARBLE_CODES["X"]:
+                    them_cells.append(cell)
+                cell += 1
+
+        material = (len(us_cells), len(them_cells), len(red_cells))
+        offset = self._offsets.get(material)
+        if offset is None:
+            return None
+
+        # The packed forbidden move only matters if it pushes one of our marbles
+        forbidden = 0
+        if data[14]:
+            forbidden_cell, direction_index = divmod(data[14] - 1, 4)
+            if forbidden_cell in us_cells:
+                forbidden = 1 + 4 * us_cells.index(forbidden_cell) + direction_index
+
+        opponent = next(name for name in game.get_playernames() if name != playername)
+        red = material[2]
+        need_us = min(7 - game.get_captured(playername), red + 1)
+        need_them = min(7 - game.get_captured(opponent), red + 1)
+        value = self._map[offset + get_index(material, tuple(us_cells), tuple(them_cells), tuple(red_cells),
+                                             forbidden, need_us, need_them)]
+        if value == DRAW:
+            return "draw", 0
+        if value % 2 == 0:
+            return "win", value - 1
+        return "loss", value - 1
+
+
+def main(arguments=None):
+    """Generates a tablebase from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status 0
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaTablebase", description="Generates Kuba endgame tables.")
+    parser.add_argument("path", help="tablebase file to write")
+    parser.add_argument("--max-marbles", type=int, default=3, help="most white, black and red marbles in all")
+    options = parser.parse_args(arguments)
+    for material in generate_tablebase(options.path, options.max_marbles):
+        print("{:>3} {:>3} {:>3} {:>12,} positions".format(*material, get_table_size(material)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
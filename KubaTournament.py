@@ -0,0 +1,339 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: A self-play tournament runner for Kuba strategies. Matches are played across a process pool, each
+#              result is streamed to a JSON lines file as it finishes, and the run ends with Elo ratings, win rates
+#              and games per second.
+#              Run with: python -m KubaTournament random greedy alphabeta [--games 100] [--workers 4]
+#                                                [--output results.jsonl]
+
+from KubaAI import KubaAI
+from KubaGame import KubaGame
+from KubaMCTS import KubaMCTS
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import importlib
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+
+# Player names in tournament games; white always moves first
+WHITE = "white"
+BLACK = "black"
+
+DEFAULT_OPTIONS = {"depth": 2, "playouts": 100, "opening_moves": 2, "max_moves": 300}
+
+
+def random_strategy(game, rng, options):
+    """A strategy that plays a random legal move
+
+    Every strategy is a function (game, rng, options) returning a function (playername) --> move, which picks a
+    move as a tuple (coordinates, direction) for the game's current position, or None if there is none.
+
+    Parameters:
+        game : KubaGame being played
+        rng : random.Random for the strategy's choices
+        options : dict of tournament options (see DEFAULT_OPTIONS)
+    Returns:
+        a function (playername) --> move
+    """
+    def choose(playername):
+        moves = game.legal_moves(playername)
+        return rng.choice(moves) if moves else None
+    return choose
+
+
+def greedy_strategy(game, rng, options):
+    """A strategy that pushes off a red marble if it can, otherwise an opponent marble, otherwise plays randomly"""
+    def choose(playername):
+        moves = game.legal_moves(playername)
+        if not moves:
+            return None
+        opponent_color = "B" if game.get_color(playername) == "W" else "W"
+        scores = {"R": 2, opponent_color: 1}
+        scored = [(scores.get(game.get_pushed_off_marble(*move), 0), move) for move in moves]
+        best = max(score for score, _ in scored)
+        return rng.choice([move for score, move in scored if score == best])
+    return choose
+
+
+def alphabeta_strategy(game, rng, options):
+    """A strategy that searches options['depth'] plies with KubaAI"""
+    ai = KubaAI(game, table_size=100000)
+
+    def choose(playername):
+        return ai.best_move(playername, time_limit=float("inf"), max_depth=options["depth"])
+    return choose
+
+
+def mcts_strategy(game, rng, options):
+    """A strategy that runs options['playouts'] playouts with KubaMCTS in this process"""
+    mcts = KubaMCTS(game, workers=1, playouts=options["playouts"], seed=rng.getrandbits(64))
+
+    def choose(playername):
+        return mcts.best_move(playername)
+    return choose
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "greedy": greedy_strategy,
+    "alphabeta": alphabeta_strategy,
+    "mcts": mcts_strategy
+}
+
+
+def load_strategy(name):
+    """Returns the strategy function for a name in STRATEGIES, or for a 'module:function' name of another one
+
+    Parameters:
+        name : strategy name
+    Returns:
+        a strategy function (game, rng, options) --> function (playername) --> move
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if ":" not in name:
+        raise ValueError("unknown strategy " + name + "; use one of " + ", ".join(STRATEGIES)
+                         + " or module:function")
+    module_name, function_name = name.split(":", 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def play_match(match):
+    """Plays one tournament game; the work done by one worker process
+
+    The first options['opening_moves'] moves are random, so strategies that always pick the same move still play
+    different games.
+
+    Parameters:
+        match : tuple (match id, white strategy name, black strategy name, seed, options)
+    Returns:
+        a dict with 'match', 'white', 'black', 'winner' (the winning strategy name, or None for a draw), 'moves',
+        'captures' (red marbles captured by white and black) and 'seconds'
+    """
+    match_id, white, black, seed, options = match
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    game = KubaGame((WHITE, "W"), (BLACK, "B"))
+    players = {WHITE: load_strategy(white)(game, random.Random(rng.getrandbits(64)), options),
+               BLACK: load_strategy(black)(game, random.Random(rng.getrandbits(64)), options)}
+
+    playername = WHITE
+    moves = 0
+    while game.get_winner() is None and moves < options["max_moves"]:
+        if moves < options["opening_moves"]:
+            legal_moves = game.legal_moves(playername)
+            move = rng.choice(legal_moves) if legal_moves else None
+        else:
+            move = players[playername](playername)
+        if move is None or not game.make_move(playername, *move):
+            break
+        moves += 1
+        playername = game.get_current_turn()
+
+    winner = {WHITE: white, BLACK: black}.get(game.get_winner())
+    return {
+        "match": match_id,
+        "white": white,
+        "black": black,
+        "winner": winner,
+        "moves": moves,
+        "captures": [game.get_captured(WHITE), game.get_captured(BLACK)],
+        "seconds": time.perf_counter() - start
+    }
+
+
+def make_schedule(strategies, games, seed, options):
+    """Pairs every two strategies for 'games' games, each playing white in half of them
+
+    Parameters:
+        strategies : list of strategy names
+        games : number of games per pair of strategies
+        seed : seed for the games' seeds
+        options : dict of tournament options passed to every match
+    Returns:
+        a list of match tuples for play_match
+    """
+    rng = random.Random(seed)
+    schedule = []
+    for first, second in itertools.combinations(strategies, 2):
+        for index in range(games):
+            white, black = (first, second) if index % 2 == 0 else (second, first)
+            schedule.append((len(schedule), white, black, rng.getrandbits(64), options))
+    return schedule
+
+
+def compute_elo(results, iterations=200):
+    """Fits Elo ratings to game results with the Bradley-Terry model, draws counting half a win each way
+
+    Every strategy also gets one virtual draw against a 1500 rated opponent, so ratings stay finite for strategies
+    that won or lost every game. Ratings are then shifted to average 1500.
+
+    Parameters:
+        results : iterable of dicts returned by play_match
+        iterations : number of fitting iterations
+    Returns:
+        a dict with strategy name as key and Elo rating as value
+    """
+    wins = {}
+    games = {}
+    for result in results:
+        white, black, winner = result["white"], result["black"], result["winner"]
+        for name in (white, black):
+            wins.setdefault(name, 0.5)  # The virtual draw
+        pair = tuple(sorted((white, black)))
+        games[pair] = games.get(pair, 0) + 1
+        if winner is None:
+            wins[white] += 0.5
+            wins[black] += 0.5
+        else:
+            wins[winner] += 1
+
+    strengths = {name: 1.0 for name in wins}
+    for _ in range(iterations):
+        updated = {}
+        for name in strengths:
+            denominator = 1 / (strengths[name] + 1.0)  # The virtual opponent has strength 1
+            for (first, second), count in games.items():
+                if name in (first, second):
+                    other = second if name == first else first
+                    denominator += count / (strengths[name] + strengths[other])
+            updated[name] = wins[name] / denominator
+        strengths = updated
+
+    ratings = {name: 400 * math.log10(strength) for name, strength in strengths.items()}
+    shift = 1500 - sum(ratings.values()) / len(ratings) if ratings else 0
+    return {name: rating + shift for name, rating in ratings.items()}
+
+
+def summarize(results, seconds):
+    """Adds up tournament results
+
+    Parameters:
+        results : list of dicts returned by play_match
+        seconds : wall clock seconds the tournament took
+    Returns:
+        a dict with 'games', 'seconds', 'games per second', 'moves per second' and 'strategies', a dict with
+        strategy name as key and a dict with 'games', 'wins', 'losses', 'draws', 'win rate' and 'elo' as value
+    """
+    ratings = compute_elo(results)
+    strategies = {name: {"games": 0, "wins": 0, "losses": 0, "draws": 0} for name in ratings}
+    for result in results:
+        for name in (result["white"], result["black"]):
+            strategies[name]["games"] += 1
+            if result["winner"] is None:
+                strategies[name]["draws"] += 1
+            elif result["winner"] == name:
+                strategies[name]["wins"] += 1
+            else:
+                strategies[name]["losses"] += 1
+
+    for name, stats in strategies.items():
+        stats["win rate"] = (stats["wins"] + stats["draws"] / 2) / stats["games"]
+        stats["elo"] = ratings[name]
+
+    moves = sum(result["moves"] for result in results)
+    return {
+        "games": len(results),
+        "seconds": seconds,
+        "games per second": len(results) / seconds if seconds > 0 else 0.0,
+        "moves per second": moves / seconds if seconds > 0 else 0.0,
+        "strategies": strategies
+    }
+
+
+def run_tournament(strategies, games=100, workers=None, output=None, seed=2021, options=None):
+    """Plays every pair of strategies against each other and rates them
+
+    Parameters:
+        strategies : list of at least two strategy names (see load_strategy)
+        games : number of games per pair of strategies
+        workers : number of worker processes; defaults to the number of CPUs. 1 plays in this process
+        output : file object each result is written to as a JSON line as soon as its game finishes, or None
+        seed : seed for the games
+        options : dict overriding DEFAULT_OPTIONS
+    Returns:
+        the dict returned by summarize
+    """
+    if len(set(strategies)) < 2:
+        raise ValueError("a tournament needs at least two different strategies")
+    for name in strategies:
+        load_strategy(name)  # Fail before starting any workers
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    workers = workers if workers is not None else os.cpu_count() or 1
+    schedule = make_schedule(list(dict.fromkeys(strategies)), games, seed, options)
+
+    results = []
+
+    def finish(result):
+        results.append(result)
+        if output is not None:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+    start = time.perf_counter()
+    if workers == 1:
+        for match in schedule:
+            finish(play_match(match))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in as_completed([executor.submit(play_match, match) for match in schedule]):
+                finish(future.result())
+    seconds = time.perf_counter() - start
+
+    results.sort(key=lambda result: result["match"])
+    return summarize(results, seconds)
+
+
+def main(arguments=None):
+    """Runs a tournament from the command line
+
+    Parameters:
+        arguments : list of command line arguments; defaults to sys.argv[1:]
+    Returns:
+        exit status 0
+    """
+    parser = argparse.ArgumentParser(prog="python -m KubaTournament",
+                                     description="Plays Kuba strategies against each other and rates them.")
+    parser.add_argument("strategies", nargs="+",
+                        help="strategy names: " + ", ".join(STRATEGIES) + ", or module:function")
+    parser.add_argument("--games", type=int, default=100, help="games per pair of strategies")
+    parser.add_argument("--workers", type=int, help="worker processes; defaults to the number of CPUs")
+    parser.add_argument("--output", help="append each result to this JSON lines file as it finishes")
+    parser.add_argument("--seed", type=int, default=2021)
+    parser.add_argument("--depth", type=int, default=DEFAULT_OPTIONS["depth"], help="alphabeta search depth")
+    parser.add_argument("--playouts", type=int, default=DEFAULT_OPTIONS["playouts"], help="mcts playouts per move")
+    parser.add_argument("--opening-moves", type=int, default=DEFAULT_OPTIONS["opening_moves"],
+                        help="random moves at the start of every game")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_OPTIONS["max_moves"],
+                        help="moves after which a game is a draw")
+    options = parser.parse_args(arguments)
+
+    match_options = {"depth": options.depth, "playouts": options.playouts, "opening_moves": options.opening_moves,
+                     "max_moves": options.max_moves}
+    output = open(options.output, "a") if options.output else None
+    try:
+        summary = run_tournament(options.strategies, options.games, options.workers, output, options.seed,
+                                 match_options)
+    finally:
+        if output is not None:
+            output.close()
+
+    print("{:<20}{:>8}{:>8}{:>8}{:>8}{:>10}{:>8}".format("strategy", "elo", "games", "wins", "losses", "win rate",
+                                                         "draws"))
+    ranked = sorted(summary["strategies"].items(), key=lambda item: -item[1]["elo"])
+    for name, stats in ranked:
+        print("{:<20}{:>8.0f}{:>8}{:>8}{:>8}{:>10.1%}{:>8}".format(name, stats["elo"], stats["games"], stats["wins"],
+                                                                  stats["losses"], stats["win rate"],
+                                                                  stats["draws"]))
+    print("{:,} games in {:.2f} s: {:,.1f} games/s, {:,.0f} moves/s".format(
+        summary["games"], summary["seconds"], summary["games per second"], summary["moves per second"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
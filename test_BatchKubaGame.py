@@ -0,0 +1,81 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for BatchKubaGame.py
+
+from KubaGame import KubaGame
+from BatchKubaGame import BatchKubaGame, DIRECTIONS
+import numpy as np
+import unittest
+
+
+class TestBatchKubaGame(unittest.TestCase):
+    """Contains unit tests for BatchKubaGame.py"""
+
+    def setUp(self):
+        """Creates a batch of games"""
+        self.batch = BatchKubaGame(("player1", "W"), ("player2", "B"), 64)
+
+    def tearDown(self):
+        """Deletes the batch"""
+        del self.batch
+
+    def test_start_position(self):
+        """Every game starts at the KubaGame start position"""
+        kg = KubaGame(("player1", "W"), ("player2", "B"))
+        self.assertEqual(self.batch.get_size(), 64)
+        self.assertEqual(self.batch.get_board(63), kg._board)
+        self.assertEqual(self.batch.get_marble_count()[0].tolist(), [8, 8, 13])
+        self.assertEqual(self.batch.get_winners(), [None] * 64)
+        self.assertEqual(int(self.batch.legal_move_mask(np.zeros(64, dtype=np.int8))[0].sum()), 8)
+
+    def test_matches_kuba_game(self):
+        """Legal and illegal moves give the same results as KubaGame.make_move in every game"""
+        size = self.batch.get_size()
+        games = [KubaGame(("player1", "W"), ("player2", "B")) for _ in range(size)]
+        names = ("player1", "player2")
+        rng = np.random.default_rng(8)
+        for _ in range(150):
+            players = np.where(self.batch.get_current_turn() < 0, 0, self.batch.get_current_turn())
+            mask = self.batch.legal_move_mask(players).reshape(size, 4 * 49)
+            legal = np.argmax(rng.random(mask.shape) * mask, axis=1)
+            directions, cells = np.divmod(legal, 49)
+            rows, columns = np.divmod(cells, 7)
+
+            # A quarter of the games try an arbitrary move instead, which is usually not allowed
+            arbitrary = rng.random(size) < 0.25
+            players = np.where(arbitrary, rng.integers(0, 2, size), players)
+            rows = np.where(arbitrary, rng.integers(0, 7, size), rows)
+            columns = np.where(arbitrary, rng.integers(0, 7, size), columns)
+            directions = np.where(arbitrary, rng.integers(0, 4, size), directions)
+
+            made = self.batch.make_moves(players, rows, columns, directions)
+            for index, game in enumerate(games):
+                expected = game.make_move(names[players[index]], (int(rows[index]), int(columns[index])),
+                                          DIRECTIONS[directions[index]])
+                self.assertEqual(bool(made[index]), expected)
+                self.assertEqual(self.batch.get_board(index), game._board)
+
+            self.assertEqual(self.batch.get_winners(), [game.get_winner() for game in games])
+            self.assertEqual(self.batch.get_captured("player1").tolist(),
+                             [game.get_captured("player1") for game in games])
+            for index, game in enumerate(games):
+                forbidden = game._forbidden_move
+                row, column, direction = self.batch._forbidden[index].tolist()
+                if forbidden["coordinates"] == ():
+                    self.assertEqual(row, -1)
+                else:
+                    self.assertEqual(((row, column), DIRECTIONS[direction]),
+                                     (forbidden["coordinates"], forbidden["direction"]))
+
+    def test_make_random_moves(self):
+        """Random play in lockstep finishes games and never moves a finished game"""
+        rng = np.random.default_rng(1)
+        for _ in range(400):
+            finished = np.array([winner is not None for winner in self.batch.get_winners()])
+            made = self.batch.make_random_moves(rng)
+            self.assertFalse((made & finished).any())
+        self.assertTrue(any(winner is not None for winner in self.batch.get_winners()))
+
+
+if __name__ == '__main__':
+    unittest.main()
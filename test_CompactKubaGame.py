@@ -0,0 +1,104 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for CompactKubaGame.py
+
+from CompactKubaGame import CompactKubaGame
+from KubaGame import KubaGame, decode_move_event
+import copy
+import pickle
+import random
+import sys
+import unittest
+
+PLAYERS = (("player1", "W"), ("player2", "B"))
+
+
+class TestCompactKubaGame(unittest.TestCase):
+    """Contains unit tests for CompactKubaGame.py"""
+
+    def assert_same_position(self, compact, game):
+        """Checks that a CompactKubaGame and a KubaGame hold the same position"""
+        self.assertEqual(compact._board, game._board)
+        self.assertEqual(compact.to_bytes(), game.to_bytes())
+        self.assertEqual(compact.get_hash(), game.get_hash())
+        self.assertEqual(compact.get_marble_count(), game.get_marble_count())
+        self.assertEqual(compact.get_current_turn(), game.get_current_turn())
+        self.assertEqual(compact.get_winner(), game.get_winner())
+        for playername in ("player1", "player2", "player3"):
+            self.assertEqual(compact.get_captured(playername), game.get_captured(playername))
+            self.assertEqual(sorted(compact.legal_moves(playername)), sorted(game.legal_moves(playername)))
+
+    def test_plays_like_kuba_game(self):
+        """Random games make the same moves, captures, forbidden moves and winners as KubaGame"""
+        rng = random.Random(17)
+        for _ in range(20):
+            compact = CompactKubaGame(*PLAYERS)
+            game = KubaGame(*PLAYERS)
+            self.assert_same_position(compact, game)
+            playername = rng.choice(("player1", "player2"))
+            while game.get_winner() is None:
+                moves = game.legal_moves(playername)
+                for move in rng.sample(moves, min(3, len(moves))) + [((3, 3), "F"), ((0, 0), "L"), ((9, 0), "R")]:
+                    self.assertEqual(compact.is_valid_move(playername, *move), game.is_valid_move(playername, *move))
+                    if game.is_valid_coordinates(move[0]):
+                        self.assertEqual(compact.get_pushed_off_marble(*move), game.get_pushed_off_marble(*move))
+                move = rng.choice(moves)
+                self.assertTrue(compact.make_move(playername, *move))
+                self.assertTrue(game.make_move(playername, *move))
+                self.assert_same_position(compact, game)
+                playername = game.get_current_turn()
+
+        self.assertFalse(compact.make_move("player3", (0, 0), "R"))
+        self.assertFalse(compact.make_move("player1", (0, 0), "N"))
+
+    def test_apply_undo_and_events(self):
+        """undo_move restores the position, and move events match those of KubaGame"""
+        rng = random.Random(3)
+        compact = CompactKubaGame(*PLAYERS)
+        game = KubaGame(*PLAYERS)
+        compact_events = []
+        events = []
+        compact.subscribe(compact_events.append)
+        game.subscribe(events.append)
+        playername = "player1"
+        while game.get_winner() is None:
+            before = compact.to_bytes()
+            for move in compact.legal_moves(playername):
+                self.assertTrue(compact.apply_move(playername, *move))
+                self.assertTrue(compact.undo_move())
+                self.assertEqual(compact.to_bytes(), before)
+            self.assertFalse(compact.undo_move())
+
+            move = rng.choice(game.legal_moves(playername))
+            compact.make_move(playername, *move)
+            game.make_move(playername, *move)
+            self.assertEqual(compact_events[-1], events[-1])
+            self.assertEqual(decode_move_event(compact.encode_move_event(compact_events[-1]), "player1", "player2"),
+                             events[-1])
+            playername = game.get_current_turn()
+
+        self.assertTrue(compact.unsubscribe(compact_events.append))
+        self.assertFalse(compact.unsubscribe(compact_events.append))
+
+    def test_bytes_pickle_and_size(self):
+        """Games round trip through to_bytes, pickle and deepcopy, and are much smaller than a KubaGame"""
+        compact = CompactKubaGame(*PLAYERS)
+        compact.make_move("player1", (6, 6), "F")
+        compact.subscribe([].append)
+        for other in (CompactKubaGame.from_bytes(compact.to_bytes(), *PLAYERS), pickle.loads(pickle.dumps(compact)),
+                      copy.deepcopy(compact)):
+            self.assertEqual(other.to_bytes(), compact.to_bytes())
+            self.assertIsNone(other._observers)
+        with self.assertRaises(ValueError):
+            CompactKubaGame.from_bytes(compact.to_bytes()[:-1], *PLAYERS)
+        with self.assertRaises(AttributeError):
+            compact.extra = 1
+
+        game = KubaGame(*PLAYERS)
+        game_size = sys.getsizeof(game) + sys.getsizeof(game.__dict__) + sum(sys.getsizeof(row) for row in game._grid)
+        compact_size = sys.getsizeof(compact) + sys.getsizeof(compact._cells)
+        self.assertLess(compact_size * 4, game_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaAI.py
+
+from KubaGame import KubaGame
+from KubaAI import EXACT, WIN_SCORE, KubaAI, evaluate_material
+import time
+import unittest
+
+
+class TestKubaAI(unittest.TestCase):
+    """Contains unit tests for KubaAI.py"""
+
+    def setUp(self):
+        """Creates a game and a computer player for it"""
+        self.kg = KubaGame(("player1", "W"), ("player2", "B"))
+        self.ai = KubaAI(self.kg)
+
+    def tearDown(self):
+        """Deletes the game and computer player"""
+        del self.ai
+        del self.kg
+
+    def test_best_move(self):
+        """The chosen move is legal and searching leaves the game unchanged"""
+        board = self.kg._board
+        position_hash = self.kg.get_hash()
+        move = self.ai.best_move("player1", time_limit=0.5, max_depth=2)
+        self.assertIn(move, self.kg.legal_moves("player1"))
+        self.assertEqual(self.kg._board, board)
+        self.assertEqual(self.kg.get_hash(), position_hash)
+        self.assertIsNone(self.kg.get_current_turn())
+
+        stats = self.ai.get_stats()
+        self.assertEqual(stats["depth"], 2)
+        self.assertGreater(stats["nodes"], 0)
+        self.assertGreater(stats["nodes per second"], 0)
+
+        self.assertTrue(self.kg.make_move("player1", *move))
+        self.assertIn(self.ai.best_move(time_limit=0.5, max_depth=1), self.kg.legal_moves("player2"))
+
+    def test_finds_winning_capture(self):
+        """With six reds captured, the move capturing a seventh wins"""
+        self.kg._board = [["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "W", "B", "R", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "W"],
+                          ["X", "X", "X", "X", "X", "X", "R"],
+                          ["X", "X", "X", "X", "X", "B", "R"]]
+        self.kg._players["player1"]["capture count"] = 6
+        self.kg._hash = self.kg.compute_hash()
+        self.assertEqual(self.ai.best_move("player1", time_limit=2.0, max_depth=3), ((4, 6), "B"))
+
+    def test_table_win_scores(self):
+        """Win scores are kept in the table by distance from the position, so they hold at any ply"""
+        self.kg.make_move("player1", (6, 6), "L")
+        position_hash = self.kg.get_hash()
+        self.ai.store(position_hash, 5, WIN_SCORE - 6, EXACT, None, 4)  # Found 4 plies from the root, won 2 later
+        self.assertEqual(self.ai._table[position_hash][1], WIN_SCORE - 2)
+        self.ai._deadline = time.perf_counter() + 10
+        self.assertEqual(self.ai.negamax(3, -WIN_SCORE - 1, WIN_SCORE + 1, 1), WIN_SCORE - 3)
+
+        self.ai.store(position_hash, 5, -WIN_SCORE + 6, EXACT, None, 4)
+        self.assertEqual(self.ai.negamax(3, -WIN_SCORE - 1, WIN_SCORE + 1, 2), -WIN_SCORE + 4)
+        self.ai.store(position_hash, 5, 250, EXACT, None, 4)
+        self.assertEqual(self.ai.negamax(3, -WIN_SCORE - 1, WIN_SCORE + 1, 2), 250)
+
+    def test_table_size(self):
+        """The transposition table never holds more entries than table_size"""
+        ai = KubaAI(self.kg, table_size=50)
+        ai.best_move("player1", time_limit=1.0, max_depth=3)
+        self.assertLessEqual(len(ai._table), 50)
+
+    def test_evaluate_material(self):
+        """Captures and marbles left are scored for the given player"""
+        self.assertEqual(evaluate_material(self.kg, "player1"), 0)
+        self.kg._players["player1"]["capture count"] = 2
+        self.assertGreater(evaluate_material(self.kg, "player1"), 0)
+        self.assertLess(evaluate_material(self.kg, "player2"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
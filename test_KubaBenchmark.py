@@ -0,0 +1,100 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaBenchmark.py
+
+from KubaBenchmark import (BASELINE_PATH, compare, compare_engines, main, make_move_sequences, run_benchmarks,
+                           time_operations)
+from KubaGame import ENGINES
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+
+class TestKubaBenchmark(unittest.TestCase):
+    """Contains unit tests for KubaBenchmark.py"""
+
+    def test_make_move_sequences(self):
+        """The same seed gives the same games"""
+        self.assertEqual(make_move_sequences(2, seed=4), make_move_sequences(2, seed=4))
+        self.assertNotEqual(make_move_sequences(2, seed=4), make_move_sequences(2, seed=5))
+
+    def test_run_benchmarks(self):
+        """Every benchmark reports a positive speed on both engines"""
+        for engine in ("list", "bitboard"):
+            results = run_benchmarks(engine, games=1, playouts=1, repeat=1, min_seconds=0)
+            self.assertEqual(len(results), 6)
+            for result in results.values():
+                self.assertGreater(result["ops per second"], 0)
+
+    def test_time_operations(self):
+        """Every run lasts at least min_seconds"""
+        result = time_operations(lambda: time.sleep(0.001) or 1, 3, min_seconds=0.02)
+        self.assertGreaterEqual(result["seconds"], 0.02)
+        self.assertGreater(result["operations"], 1)
+        self.assertGreaterEqual(result["spread"], 0)
+
+    def test_time_operations_setup(self):
+        """setup runs before every call, and its result is passed to the timed function"""
+        states = []
+        result = time_operations(lambda state: len(state), 3, setup=lambda: states.append(None) or [1, 2],
+                                 min_seconds=0)
+        self.assertEqual(len(states), 4)
+        self.assertEqual(result["operations"], 2)
+
+    def test_compare(self):
+        """Benchmarks slower than the baseline by more than the tolerance are regressions"""
+        baseline = {"make_move": {"ops per second": 100.0}, "removed": {"ops per second": 5.0}}
+        results = {"make_move": {"ops per second": 85.0}, "added": {"ops per second": 1.0}}
+        self.assertEqual(compare(results, baseline, 0.1), {"make_move": {"ratio": 0.85, "regression": True}})
+        self.assertFalse(compare(results, baseline, 0.2)["make_move"]["regression"])
+
+    def test_compare_engines(self):
+        """Engines are compared with the list engine, on the benchmarks it has"""
+        results = {"list": {"make_move": {"ops per second": 100.0}, "playouts": {"ops per second": 0.0}},
+                   "bitboard": {"make_move": {"ops per second": 150.0}, "playouts": {"ops per second": 2.0}}}
+        self.assertEqual(compare_engines(results), {"bitboard": {"make_move": 1.5}})
+
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.assertEqual(main(["--compare-engines", "--games", "1", "--playouts", "1", "--repeat", "1",
+                                   "--min-time", "0"]), 0)
+        self.assertIn("x bitboard", printed.getvalue())
+
+    def test_main(self):
+        """The command line writes JSON results and fails against a much faster baseline"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            baseline = os.path.join(directory, "baseline.json")
+            arguments = ["--games", "1", "--playouts", "1", "--repeat", "1", "--min-time", "0"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(arguments + ["--output", output]), 0)
+                with open(output) as file:
+                    report = json.load(file)
+                for result in report["results"].values():
+                    result["ops per second"] *= 1000
+                with open(baseline, "w") as file:
+                    json.dump(report, file)
+                self.assertEqual(main(arguments + ["--baseline", baseline]), 1)
+                self.assertEqual(main(arguments + ["--baseline", baseline, "--no-baseline"]), 0)
+
+    def test_default_baseline(self):
+        """Every engine has a committed baseline, which runs with other options are not compared against"""
+        for engine in ENGINES:
+            with open(BASELINE_PATH.format(engine)) as file:
+                baseline = json.load(file)
+            self.assertEqual((baseline["engine"], baseline["games"], baseline["playouts"], baseline["seed"]),
+                             (engine, 20, 20, 2021))
+            self.assertEqual(len(baseline["results"]), 6)
+
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.assertEqual(main(["--games", "1", "--playouts", "1", "--repeat", "1", "--min-time", "0"]), 0)
+        self.assertIn("Not compared with", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaBitboard.py
+
+from KubaGame import KubaGame
+from KubaBitboard import KubaBitboard
+import random
+import unittest
+
+
+class TestKubaBitboard(unittest.TestCase):
+    """Contains unit tests for KubaBitboard.py"""
+
+    def setUp(self):
+        """Creates a game on each board engine"""
+        self.kg = KubaGame(("player1", "W"), ("player2", "B"))
+        self.bb = KubaGame(("player1", "W"), ("player2", "B"), engine="bitboard")
+
+    def tearDown(self):
+        """Deletes the games"""
+        del self.kg
+        del self.bb
+
+    def test_invalid_engine(self):
+        """An unknown engine name is rejected"""
+        with self.assertRaises(ValueError):
+            KubaGame(("player1", "W"), ("player2", "B"), engine="array")
+
+    def test_round_trip(self):
+        """A board loaded into the bitboards reads back unchanged"""
+        self.assertEqual(KubaBitboard(self.kg._board).to_list(), self.kg._board)
+        self.assertEqual(self.bb._board, self.kg._board)
+        self.assertEqual(self.bb.get_marble_count(), (8, 8, 13))
+        self.assertEqual(self.bb.get_marble((3, 3)), "R")
+        self.assertEqual(self.bb.get_marble((0, 3)), "X")
+
+    def test_push_marble(self):
+        """Pushes give the same boards and forbidden moves as the list engine"""
+        moves = [("player1", (0, 0), "R"),
+                 ("player2", (1, 6), "L"),
+                 ("player1", (1, 0), "B"),
+                 ("player2", (1, 4), "B"),
+                 ("player1", (6, 6), "F"),
+                 ("player2", (5, 0), "R")]
+        for playername, coordinates, direction in moves:
+            self.assertTrue(self.kg.make_move(playername, coordinates, direction))
+            self.assertTrue(self.bb.make_move(playername, coordinates, direction))
+            self.assertEqual(self.bb._board, self.kg._board)
+            self.assertEqual(self.bb._forbidden_move, self.kg._forbidden_move)
+
+    def test_capture(self):
+        """A red marble pushed off the edge is captured"""
+        board = [["X", "X", "X", "X", "X", "X", "X"],
+                 ["X", "X", "X", "X", "X", "X", "X"],
+                 ["X", "X", "X", "X", "X", "X", "X"],
+                 ["W", "R", "R", "R", "R", "R", "R"],
+                 ["X", "X", "X", "X", "X", "X", "X"],
+                 ["X", "X", "X", "X", "X", "X", "X"],
+                 ["B", "X", "X", "X", "X", "X", "X"]]
+        self.bb._board = board
+        self.assertTrue(self.bb.make_move("player1", (3, 0), "R"))
+        self.assertEqual(self.bb.get_captured("player1"), 1)
+        self.assertEqual(self.bb.get_marble_count(), (1, 1, 5))
+        self.assertEqual(self.bb.get_marble((3, 0)), "X")
+        self.assertEqual(self.bb.get_marble((3, 1)), "W")
+        self.assertEqual(self.bb._forbidden_move["coordinates"], ())
+
+        self.assertFalse(self.bb.can_marble_be_pushed((3, 6), "R"))  # Edge marble has nowhere to go
+        self.assertFalse(self.bb.can_marble_be_pushed((3, 2), "R"))  # Cell behind is occupied
+
+    def test_random_games(self):
+        """Random games play out identically on both engines"""
+        rng = random.Random(2021)
+        for _ in range(20):
+            kg = KubaGame(("player1", "W"), ("player2", "B"))
+            bb = KubaGame(("player1", "W"), ("player2", "B"), engine="bitboard")
+            playername = "player1"
+            for _ in range(200):
+                if kg.get_winner() is not None:
+                    break
+                moves = [((row, column), direction)
+                         for row in range(7) for column in range(7) for direction in "LRFB"
+                         if kg.is_valid_move(playername, (row, column), direction)]
+                for coordinates, direction in moves:
+                    self.assertTrue(bb.is_valid_move(playername, coordinates, direction))
+                coordinates, direction = rng.choice(moves)
+                self.assertTrue(kg.make_move(playername, coordinates, direction))
+                self.assertTrue(bb.make_move(playername, coordinates, direction))
+                self.assertEqual(bb._board, kg._board)
+                self.assertEqual(bb.get_marble_count(), kg.get_marble_count())
+                playername = kg.get_current_turn()
+            self.assertEqual(bb.get_winner(), kg.get_winner())
+            self.assertEqual(bb.get_captured("player1"), kg.get_captured("player1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
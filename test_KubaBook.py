@@ -0,0 +1,82 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaBook.py
+
+from KubaAI import KubaAI
+from KubaBook import build_book, write_book, OpeningBook
+from KubaGame import KubaGame
+from KubaRecord import GameRecordWriter, read_archive
+from KubaSymmetry import transform_game, transform_move, TRANSFORMS
+import os
+import random
+import tempfile
+import unittest
+
+
+class TestKubaBook(unittest.TestCase):
+    """Contains unit tests for KubaBook.py"""
+
+    def setUp(self):
+        """Records random games and builds a book file from them"""
+        self.directory = tempfile.TemporaryDirectory()
+        archive = os.path.join(self.directory.name, "games.kubr")
+        self.path = os.path.join(self.directory.name, "games.book")
+        rng = random.Random(3)
+        with GameRecordWriter(archive) as writer:
+            for _ in range(20):
+                game = KubaGame(("Ann", "W"), ("Bob", "B"))
+                game.set_recorder(writer)
+                playername = "Ann"
+                while game.get_winner() is None and game.get_captured("Ann") + game.get_captured("Bob") < 10:
+                    game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+                    playername = game.get_current_turn()
+        self.book = build_book(read_archive(archive), max_plies=4)
+        write_book(self.path, self.book)
+
+    def tearDown(self):
+        """Deletes the temporary files"""
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        """Book moves are found for symmetric positions and translated to each position's own moves"""
+        game = KubaGame(("Ann", "W"), ("Bob", "B"))
+        with OpeningBook(self.path) as book:
+            self.assertEqual(book.get_position_count(), len(self.book))
+            moves = book.get_moves(game, "Ann")
+            self.assertEqual(sum(plays for _, plays, _, _ in moves), 20)
+            for move, plays, wins, captures in moves:
+                self.assertIn(move, game.legal_moves("Ann"))
+                self.assertLessEqual(wins, plays)
+                self.assertGreaterEqual(captures, 0)
+            self.assertIn(book.best_move(game, "Ann"), game.legal_moves("Ann"))
+            self.assertIsNone(game.get_current_turn())
+
+            game.make_move("Ann", *moves[0][0])
+            for transform in TRANSFORMS:
+                transformed = transform_game(game, transform)
+                self.assertEqual(sorted(move for move, _, _, _ in book.get_moves(transformed)),
+                                 sorted(transform_move(move, transform) for move, _, _, _ in book.get_moves(game)))
+
+            self.assertEqual(book.get_moves(KubaGame(("Ann", "W"), ("Bob", "B"), board=[["X"] * 7] * 7), "Ann"),
+                             [])
+            self.assertIsNone(book.best_move(game, min_plays=100))
+
+    def test_players(self):
+        """Players skip search while the position is in the book"""
+        game = KubaGame(("Ann", "W"), ("Bob", "B"))
+        with OpeningBook(self.path) as book:
+            ai = KubaAI(game, book=book)
+            self.assertEqual(ai.best_move("Ann", time_limit=5.0), book.best_move(game, "Ann"))
+            self.assertEqual(ai.get_stats()["nodes"], 0)
+
+    def test_not_a_book(self):
+        """Files without the book header are rejected"""
+        path = os.path.join(self.directory.name, "other")
+        with open(path, "wb") as file:
+            file.write(bytes(32))
+        with self.assertRaises(ValueError):
+            OpeningBook(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaEvaluator.py
+
+from CompactKubaGame import CompactKubaGame
+from KubaEvaluator import evaluate_boards, evaluate_features, evaluate_games, games_to_arrays, DEFAULT_WEIGHTS, FEATURES
+from KubaGame import KubaGame, MARBLE_CODES
+import numpy as np
+import random
+import unittest
+
+PLAYERS = (("player1", "W"), ("player2", "B"))
+
+
+def count_features(game, playername):
+    """Works out the FEATURES of a game one marble at a time with KubaGame methods"""
+    features = []
+    counts = dict(zip("WBR", game.get_marble_count()))
+    opponent = [name for name in game.get_playernames() if name != playername][0]
+    sides = []
+    for name in (playername, opponent):
+        color = game.get_color(name)
+        other_color = "B" if color == "W" else "W"
+        mobility = edge = red_threats = marble_threats = 0
+        for row in range(7):
+            for column in range(7):
+                if game.get_marble((row, column)) != color:
+                    continue
+                edge += row in (0, 6) or column in (0, 6)
+                for direction in "LRFB":
+                    if direction in "LR":
+                        pushable = game.can_marble_be_pushed_horizontal((row, column), direction, color)
+                    else:
+                        pushable = game.can_marble_be_pushed_vertical((row, column), direction, color)
+                    if pushable:
+                        mobility += 1
+                        pushed_off = game.get_pushed_off_marble((row, column), direction)
+                        red_threats += pushed_off == "R"
+                        marble_threats += pushed_off == other_color
+        sides.append((counts[color], game.get_captured(name), mobility, edge, red_threats, marble_threats))
+    for own, other in zip(*sides):
+        features.append(own - other)
+    return features
+
+
+class TestKubaEvaluator(unittest.TestCase):
+    """Contains unit tests for KubaEvaluator.py"""
+
+    def setUp(self):
+        """Plays random games, keeping a copy of every tenth position"""
+        rng = random.Random(12)
+        self.games = []
+        for _ in range(6):
+            game = KubaGame(*PLAYERS)
+            playername = "player1"
+            moves = 0
+            while game.get_winner() is None:
+                game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+                playername = game.get_current_turn()
+                moves += 1
+                if moves % 10 == 0:
+                    self.games.append(KubaGame.from_bytes(game.to_bytes(), *PLAYERS))
+
+    def test_features(self):
+        """Batched features match counting them on each game, for the side to move and for the other side"""
+        features = evaluate_features(*games_to_arrays(self.games))
+        for game, row in zip(self.games, features):
+            self.assertEqual(row.tolist(), count_features(game, game.get_current_turn()))
+
+        other_sides = [name for game in self.games for name in game.get_playernames()
+                       if name != game.get_current_turn()]
+        features = evaluate_features(*games_to_arrays(self.games, other_sides))
+        for game, playername, row in zip(self.games, other_sides, features):
+            self.assertEqual(row.tolist(), count_features(game, playername))
+
+    def test_scores(self):
+        """Scores are the weighted features, the same for lists of games and for boards, and opposite for the
+        two sides"""
+        scores = evaluate_games(self.games)
+        weights = np.array([DEFAULT_WEIGHTS[name] for name in FEATURES])
+        for game, score in zip(self.games, scores):
+            self.assertAlmostEqual(score, np.dot(count_features(game, game.get_current_turn()), weights))
+
+        compact_games = [CompactKubaGame.from_bytes(game.to_bytes(), *PLAYERS) for game in self.games]
+        self.assertTrue(np.allclose(evaluate_games(compact_games), scores))
+
+        boards = np.array([[[MARBLE_CODES[marble] for marble in row] for row in game._board] for game in self.games])
+        white = evaluate_boards(boards, MARBLE_CODES["W"])
+        black = evaluate_boards(boards, MARBLE_CODES["B"])
+        self.assertTrue(np.allclose(white, -black))
+        self.assertEqual(evaluate_games([]).shape, (0,))
+
+        start = evaluate_games([KubaGame(*PLAYERS)])
+        self.assertEqual(start.tolist(), [0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
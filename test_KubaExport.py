@@ -0,0 +1,99 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaExport.py
+
+from KubaExport import encode_positions, load_shard, main, write_shards, DIRECTIONS
+from KubaGame import KubaGame
+from KubaRecord import GameRecordWriter, read_archive
+import contextlib
+import io
+import numpy as np
+import os
+import random
+import tempfile
+import unittest
+
+
+class TestKubaExport(unittest.TestCase):
+    """Contains unit tests for KubaExport.py"""
+
+    def setUp(self):
+        """Records a few random games, keeping every position and move played"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.archive = os.path.join(self.directory.name, "games.kubr")
+        self.prefix = os.path.join(self.directory.name, "shard")
+        self.samples = []
+        rng = random.Random(8)
+        with GameRecordWriter(self.archive) as writer:
+            for index in range(4):
+                game = KubaGame(("Ann", "B"), ("Bob", "W"))
+                game.set_recorder(writer)
+                playername = "Bob"
+                moves = 0
+                played = []
+                while game.get_winner() is None and moves < 150:
+                    move = rng.choice(game.legal_moves(playername))
+                    played.append(([row[:] for row in game._board], game.get_captured("Bob"), game.get_captured("Ann"),
+                                   game._forbidden_move.copy(), playername, move))
+                    game.make_move(playername, *move)
+                    playername = game.get_current_turn()
+                    moves += 1
+                winner = game.get_winner()
+                self.samples += [sample + (0 if winner is None else 1 if sample[4] == winner else -1,)
+                                 for sample in played]
+
+    def tearDown(self):
+        """Deletes the archive and shards"""
+        self.directory.cleanup()
+
+    def test_write_shards(self):
+        """Shards are fixed-size, memory-mappable, and hold the planes and labels of every position in order"""
+        totals = write_shards(read_archive(self.archive), self.prefix, shard_size=100)
+        self.assertEqual(totals["positions"], len(self.samples))
+        self.assertEqual(totals["shards"], (len(self.samples) + 99) // 100)
+
+        row = 0
+        for index in range(totals["shards"]):
+            features, moves, outcomes = load_shard(self.prefix, index)
+            self.assertIsInstance(features, np.memmap)
+            self.assertEqual(features.shape[1:], (7, 7, 7))
+            if index < totals["shards"] - 1:
+                self.assertEqual(len(features), 100)
+            for planes, move, outcome in zip(features, moves, outcomes):
+                board, white_captures, black_captures, forbidden, playername, played, result = self.samples[row]
+                for plane, marble in enumerate("WBR"):
+                    self.assertTrue(np.array_equal(planes[plane], np.array(board) == marble))
+                if forbidden["coordinates"] == ():
+                    self.assertFalse(planes[3].any())
+                else:
+                    self.assertEqual(planes[3][forbidden["coordinates"]],
+                                     DIRECTIONS.index(forbidden["direction"]) + 1)
+                    self.assertEqual(np.count_nonzero(planes[3]), 1)
+                self.assertTrue((planes[4] == (playername == "Bob")).all())
+                self.assertTrue((planes[5] == white_captures).all() and (planes[6] == black_captures).all())
+                self.assertEqual(divmod(int(move), 49), (DIRECTIONS.index(played[1]), played[0][0] * 7 + played[0][1]))
+                self.assertEqual(outcome, result)
+                row += 1
+            del features, moves, outcomes
+        self.assertEqual(row, len(self.samples))
+
+    def test_encode_positions(self):
+        """The starting position has only marble planes set, and white to move when white's player has the turn"""
+        game = KubaGame(("Ann", "B"), ("Bob", "W"))
+        game.set_current_turn("Bob")
+        features = encode_positions(np.frombuffer(game.to_bytes(), dtype=np.uint8), ("B", "W"))
+        self.assertEqual(features.shape, (1, 7, 7, 7))
+        self.assertEqual(features[0, :3].sum(), 8 + 8 + 13)
+        self.assertFalse(features[0, 3].any() or features[0, 5:].any())
+        self.assertTrue(features[0, 4].all())
+
+    def test_main(self):
+        """The command line exports every archive given"""
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            self.assertEqual(main([self.archive, self.archive, "--output", self.prefix, "--shard-size", "1000"]), 0)
+        self.assertIn("{:,} positions".format(2 * len(self.samples)), printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
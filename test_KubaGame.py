@@ -2,7 +2,11 @@
 # Date: 05/27/2021
 # Description: Unit Tests for KubaGame.py
 
-from KubaGame import KubaGame
+from KubaGame import KubaGame, POSITION_SIZE, decode_move_event, games_to_bytes, games_from_bytes
+import copy
+import random
+import sys
+import threading
 import unittest
 
 
@@ -167,6 +171,336 @@ class TestKubaGame(unittest.TestCase):
         self.kg._winner = None
         self.assertFalse(self.kg.is_game_over())
 
+    def test_can_current_player_move(self):
+        """can_current_player_move agrees with checking every marble, including when the only push is forbidden"""
+        board = [["X"] * 7 for _ in range(7)]
+        board[0][2:5] = ["W", "B", "W"]
+        self.kg._board = board
+        self.kg.set_current_turn("player2")
+        self.assertTrue(self.kg.can_current_player_move())
+        self.kg.set_forbidden_move((0, 3), "B")
+        self.assertFalse(self.kg.can_current_player_move())
+
+        rng = random.Random(13)
+        for _ in range(5):
+            game = KubaGame(("player1", "W"), ("player2", "B"), verify=True)
+            playername = "player1"
+            while game.get_winner() is None:
+                game.apply_move(playername, *rng.choice(game.legal_moves(playername)))
+                playername = game.get_current_turn()
+                color = game.get_color(playername)
+                expected = any(game.can_marble_be_pushed((row, column), direction)
+                               for row in range(7) for column in range(7) for direction in "LRFB"
+                               if game.get_marble((row, column)) == color)
+                self.assertEqual(game.can_current_player_move(), expected)
+            while game.undo_move():
+                self.assertTrue(game.can_current_player_move())
+
+    def test_legal_moves(self):
+        """legal_moves matches checking every square and direction with is_valid_move, on both engines"""
+        self.assertEqual(len(self.kg.legal_moves("player1")), 8)
+        self.assertEqual(self.kg.legal_moves("player3"), [])
+
+        self.kg.set_forbidden_move((0, 0), "R")
+        self.assertNotIn(((0, 0), "R"), self.kg.legal_moves("player1"))
+        self.assertEqual(len(self.kg.legal_moves("player1")), 7)
+
+        self.kg.make_move("player1", (0, 0), "B")
+        self.assertEqual(self.kg.legal_moves("player1"), [])  # Not player1's turn
+
+        rng = random.Random(527)
+        for engine in ("list", "bitboard"):
+            for _ in range(5):
+                game = KubaGame(("player1", "W"), ("player2", "B"), engine=engine)
+                playername = "player1"
+                while game.get_winner() is None:
+                    expected = [((row, column), direction)
+                                for row in range(7) for column in range(7) for direction in "LRFB"
+                                if game.is_valid_move(playername, (row, column), direction)]
+                    moves = game.legal_moves(playername)
+                    self.assertEqual(sorted(moves), sorted(expected))
+                    game.make_move(playername, *rng.choice(moves))
+                    playername = game.get_current_turn()
+                self.assertEqual(game.legal_moves(playername), [])
+
+    def test_get_marble_count(self):
+        """Incremental marble counts match a full count of the board"""
+        self.assertEqual(self.kg.get_marble_count(), (8, 8, 13))
+        self.kg._board = [["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "W", "X", "X", "X"],
+                          ["X", "X", "W", "B", "W", "R", "R"],
+                          ["X", "X", "X", "W", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"]]
+        self.assertEqual(self.kg.get_marble_count(), (4, 1, 2))
+        self.kg.make_move("player1", (3, 2), "R")
+        self.assertEqual(self.kg.get_marble_count(), (4, 1, 1))
+        self.assertEqual(self.kg.get_captured("player1"), 1)
+
+        rng = random.Random(20)
+        for engine in ("list", "bitboard"):
+            game = KubaGame(("player1", "W"), ("player2", "B"), engine=engine, verify=True)
+            playername = "player2"
+            while game.get_winner() is None:
+                game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+                self.assertEqual(game.get_marble_count(), game.count_marbles())
+                playername = game.get_current_turn()
+
+        game = KubaGame(("player1", "W"), ("player2", "B"), verify=True)
+        game._board[0][0] = "X"  # Changes the board without going through push_marble
+        with self.assertRaises(AssertionError):
+            game.get_marble_count()
+
+    def test_apply_move_undo_move(self):
+        """undo_move restores the exact position from before apply_move, on both engines"""
+        self.assertFalse(self.kg.undo_move())
+        self.assertFalse(self.kg.apply_move("player1", (0, 0), "L"))
+        self.assertTrue(self.kg.apply_move("player1", (0, 0), "R"))
+        self.assertEqual(self.kg.get_marble((0, 0)), "X")
+        self.assertTrue(self.kg.undo_move())
+        self.assertEqual(self.kg.get_marble((0, 0)), "W")
+        self.assertIsNone(self.kg.get_current_turn())
+
+        def state(game):
+            return (game._board, dict(game._forbidden_move), game.get_current_turn(), game.get_winner(),
+                    game.get_captured("player1"), game.get_captured("player2"), game.get_marble_count())
+
+        rng = random.Random(4)
+        for engine in ("list", "bitboard"):
+            game = KubaGame(("player1", "W"), ("player2", "B"), engine=engine, verify=True)
+            playername = "player1"
+            states = []
+            while game.get_winner() is None:
+                states.append(state(game))
+                moves = game.legal_moves(playername)
+                for move in moves:  # Every move must be undone cleanly
+                    self.assertTrue(game.apply_move(playername, *move))
+                    self.assertTrue(game.undo_move())
+                    self.assertEqual(state(game), states[-1])
+                self.assertTrue(game.apply_move(playername, *rng.choice(moves)))
+                playername = game.get_current_turn()
+
+            while states:
+                self.assertTrue(game.undo_move())
+                self.assertEqual(state(game), states.pop())
+            self.assertFalse(game.undo_move())
+
+    def test_get_hash(self):
+        """The incremental position hash matches a full rehash and identifies equal positions"""
+        start = self.kg.get_hash()
+        self.assertEqual(start, self.kg.compute_hash())
+        self.assertTrue(self.kg.apply_move("player1", (0, 0), "R"))
+        self.assertNotEqual(self.kg.get_hash(), start)
+        self.kg.undo_move()
+        self.assertEqual(self.kg.get_hash(), start)
+
+        # The same position reached through a different move order hashes the same
+        other = KubaGame(("player1", "W"), ("player2", "B"))
+        for playername, coordinates, direction in [("player1", (0, 0), "B"), ("player2", (0, 6), "B"),
+                                                   ("player1", (6, 6), "F"), ("player2", (6, 0), "F")]:
+            self.kg.make_move(playername, coordinates, direction)
+        for playername, coordinates, direction in [("player1", (6, 6), "F"), ("player2", (6, 0), "F"),
+                                                   ("player1", (0, 0), "B"), ("player2", (0, 6), "B")]:
+            other.make_move(playername, coordinates, direction)
+        self.assertEqual(self.kg._board, other._board)
+        self.assertNotEqual(self.kg.get_hash(), other.get_hash())  # Different forbidden moves
+        self.kg.make_move("player1", (1, 0), "R")
+        other.make_move("player1", (1, 0), "R")
+        self.assertEqual(self.kg._forbidden_move, other._forbidden_move)
+        self.assertEqual(self.kg.get_hash(), other.get_hash())
+
+        rng = random.Random(5)
+        for engine in ("list", "bitboard"):
+            game = KubaGame(("player1", "W"), ("player2", "B"), engine=engine, verify=True)
+            playername = "player2"
+            while game.get_winner() is None:
+                moves = game.legal_moves(playername)
+                for move in moves:
+                    game.apply_move(playername, *move)
+                    self.assertEqual(game.get_hash(), game.compute_hash())
+                    game.undo_move()
+                    self.assertEqual(game.get_hash(), game.compute_hash())
+                game.make_move(playername, *rng.choice(moves))
+                playername = game.get_current_turn()
+
+    def test_move_events(self):
+        """Move events rebuild the board from the changes alone and survive encoding"""
+        players = (("player1", "W"), ("player2", "B"))
+        rng = random.Random(13)
+        for engine in ("list", "bitboard"):
+            game = KubaGame(*players, engine=engine)
+            board = [row[:] for row in game._board]
+            events = []
+            game.subscribe(events.append)
+            self.assertFalse(game.make_move("player1", (3, 3), "F"))
+            self.assertEqual(events, [])
+
+            playername = "player1"
+            while game.get_winner() is None:
+                game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+                event = events[-1]
+                for (row, column), marble in event["changes"]:
+                    board[row][column] = marble
+                self.assertEqual(board, game._board)
+                self.assertEqual(event["player"], playername)
+                self.assertEqual(event["turn"], game.get_current_turn())
+                self.assertEqual(event["winner"], game.get_winner())
+                data = game.encode_move_event(event)
+                self.assertEqual(len(data), 1 + len(event["changes"]))
+                self.assertEqual(decode_move_event(data, "player1", "player2"), event)
+                playername = game.get_current_turn()
+
+            self.assertTrue(any(event["captured"] == "R" for event in events))
+            self.assertTrue(game.unsubscribe(events.append))
+            self.assertFalse(game.unsubscribe(events.append))
+
+    def test_snapshots(self):
+        """Other threads read the position after the last move made, never a move half made or a searched position"""
+        players = (("player1", "W"), ("player2", "B"))
+        for engine in ("list", "bitboard"):
+            game = KubaGame(*players, engine=engine, snapshots=True)
+            self.assertEqual(game.get_snapshot().get_version(), 0)
+            self.assertIsNone(KubaGame(*players).get_snapshot())
+
+            # Readers check that every snapshot they see is whole (its marble count matches its board) and newer than
+            # the last, and that the counts read from the game are all counts after a move
+            stop = threading.Event()
+            torn = []
+            versions = [[], []]
+            counts_read = set()
+            counts_published = {game.get_marble_count()}
+
+            def read(index):
+                while not stop.is_set():
+                    snapshot = game.get_snapshot()
+                    board = [snapshot.get_marble((row, column)) for row in range(7) for column in range(7)]
+                    if tuple(board.count(marble) for marble in "WBR") != snapshot.get_marble_count():
+                        torn.append(snapshot.get_version())
+                    versions[index].append(snapshot.get_version())
+                    counts_read.add(game.get_marble_count())
+
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-5)
+            readers = [threading.Thread(target=read, args=(index,)) for index in range(2)]
+            for reader in readers:
+                reader.start()
+            rng = random.Random(4)
+            playername = "player1"
+            moves = 0
+            while game.get_winner() is None:
+                self.assertTrue(game.make_move(playername, *rng.choice(game.legal_moves(playername))))
+                counts_published.add(game.get_marble_count())
+                self.assertEqual(game.get_snapshot().get_board(), tuple(tuple(row) for row in game._board))
+                playername = game.get_current_turn()
+                moves += 1
+            stop.set()
+            for reader in readers:
+                reader.join()
+            sys.setswitchinterval(switch_interval)
+            self.assertEqual(torn, [])
+            for reader_versions in versions:
+                self.assertEqual(reader_versions, sorted(reader_versions))
+            self.assertGreater(len(set(versions[0] + versions[1])), 1)
+            self.assertLessEqual(counts_read, counts_published)
+            self.assertEqual(game.get_snapshot().get_version(), moves)
+
+            # While this thread searches with apply_move, other threads still see the last move made
+            game = KubaGame(*players, engine=engine, snapshots=True)
+            game.make_move("player1", (6, 6), "F")
+            game.apply_move("player2", (6, 0), "F")
+            seen = []
+            reader = threading.Thread(target=lambda: seen.extend((game.get_marble((6, 0)), game.get_current_turn(),
+                                                                  game.get_marble((7, 0)))))
+            reader.start()
+            reader.join()
+            self.assertEqual(seen, ["B", "player2", None])
+            self.assertEqual(game.get_marble((6, 0)), "X")
+            game.undo_move()
+            self.assertEqual(game.get_marble((6, 0)), "B")
+            self.assertIsNone(game._writer)
+
+            # A move that is not made leaves every thread reading the snapshot
+            self.assertFalse(game.apply_move("player1", (6, 0), "F"))
+            self.assertIsNone(game._writer)
+
+            # A move made in another thread waits until the searching thread has taken back its moves
+            game = KubaGame(*players, engine=engine, snapshots=True)
+            applied = threading.Event()
+            release = threading.Event()
+
+            def search():
+                game.apply_move("player1", (6, 6), "F")
+                applied.set()
+                release.wait()
+                game.undo_move()
+
+            searcher = threading.Thread(target=search, daemon=True)
+            searcher.start()
+            applied.wait()
+            results = []
+            mover = threading.Thread(target=lambda: results.append(game.make_move("player1", (6, 6), "L")), daemon=True)
+            mover.start()
+            mover.join(0.2)
+            self.assertTrue(mover.is_alive())
+            self.assertEqual(results, [])
+            release.set()
+            searcher.join()
+            mover.join()
+            self.assertEqual(results, [True])
+            self.assertEqual(game.get_snapshot().get_board()[6], ("B", "B", "X", "X", "W", "W", "X"))
+            self.assertEqual(game.get_snapshot().get_board(), tuple(tuple(row) for row in game._board))
+            self.assertIsNone(game._writer)
+            self.assertIsNone(game._search_lock)
+
+            snapshot = game.get_snapshot()
+            self.assertEqual(snapshot.get_captured("player1"), 0)
+            self.assertEqual(snapshot.get_captured("nobody"), 0)
+            self.assertIsNone(snapshot.get_winner())
+            self.assertIsNone(copy.deepcopy(game).get_snapshot())
+
+    def test_to_bytes_from_bytes(self):
+        """Packed positions unpack to the same board, captures, forbidden move, turn, winner and hash"""
+        players = (("player1", "W"), ("player2", "B"))
+        data = self.kg.to_bytes()
+        self.assertEqual(len(data), POSITION_SIZE)
+        self.assertEqual(KubaGame.from_bytes(data, *players)._board, self.kg._board)
+        with self.assertRaises(ValueError):
+            KubaGame.from_bytes(data[:-1], *players)
+        for index, value in ((13, 0xE0), (13, 0x0F), (14, 197), (15, 3), (15, 12), (12, 4)):
+            corrupt = bytearray(data)
+            corrupt[index] = value
+            with self.assertRaises(ValueError):
+                KubaGame.from_bytes(corrupt, *players)
+
+        rng = random.Random(9)
+        games = []
+        for engine in ("list", "bitboard"):
+            game = KubaGame(*players, engine=engine)
+            playername = "player1"
+            while game.get_winner() is None:
+                game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+                playername = game.get_current_turn()
+                unpacked_game = KubaGame.from_bytes(game.to_bytes(), *players, engine=engine)
+                self.assertEqual(unpacked_game._board, game._board)
+                self.assertEqual(unpacked_game._forbidden_move, game._forbidden_move)
+                self.assertEqual(unpacked_game.get_current_turn(), game.get_current_turn())
+                self.assertEqual(unpacked_game.get_winner(), game.get_winner())
+                self.assertEqual(unpacked_game.get_captured("player1"), game.get_captured("player1"))
+                self.assertEqual(unpacked_game.get_captured("player2"), game.get_captured("player2"))
+                self.assertEqual(unpacked_game.get_marble_count(), game.get_marble_count())
+                self.assertEqual(unpacked_game.get_hash(), game.get_hash())
+                self.assertEqual(unpacked_game.compute_hash(), game.get_hash())
+                self.assertEqual(unpacked_game.count_marbles(), game.get_marble_count())
+                if game.get_winner() is None:
+                    self.assertEqual(unpacked_game.legal_moves(playername), game.legal_moves(playername))
+                games.append(game.to_bytes())
+
+        buffer = b"".join(games)
+        unpacked = [game.to_bytes() for game in games_from_bytes(buffer, *players)]
+        self.assertEqual(unpacked, games)
+        self.assertEqual(games_to_bytes(games_from_bytes(memoryview(buffer), *players)), buffer)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaMCTS.py
+
+from KubaGame import KubaGame
+from KubaMCTS import KubaMCTS, search_tree
+import unittest
+
+
+class TestKubaMCTS(unittest.TestCase):
+    """Contains unit tests for KubaMCTS.py"""
+
+    def setUp(self):
+        """Creates a game"""
+        self.kg = KubaGame(("player1", "W"), ("player2", "B"))
+
+    def tearDown(self):
+        """Deletes the game"""
+        del self.kg
+
+    def test_search_tree(self):
+        """A worker's tree spends its whole budget on legal root moves and leaves the game unchanged"""
+        position_hash = self.kg.get_hash()
+        result = search_tree(self.kg, "player1", 60, seed=1)
+        self.assertEqual(sum(visits for visits, _ in result.values()), 60)
+        for move in result:
+            self.assertIn(move, self.kg.legal_moves("player1"))
+        self.assertEqual(self.kg.get_hash(), position_hash)
+        self.assertEqual(self.kg._undo_records, [])
+
+    def test_best_move(self):
+        """Single process and process pool searches both return a legal move"""
+        mcts = KubaMCTS(self.kg, workers=1, playouts=40, seed=7)
+        self.assertIn(mcts.best_move("player1"), self.kg.legal_moves("player1"))
+        self.assertEqual(mcts.get_stats()["playouts"], 40)
+
+        with KubaMCTS(self.kg, workers=2, playouts=41, seed=7) as mcts:
+            self.assertIn(mcts.best_move("player1"), self.kg.legal_moves("player1"))
+            self.assertEqual(mcts.get_stats()["playouts"], 41)
+            self.assertEqual(mcts.get_stats()["workers"], 2)
+
+    def test_finds_winning_capture(self):
+        """With six reds captured, the move capturing a seventh is chosen"""
+        self.kg._board = [["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "W", "B", "R", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "W"],
+                          ["X", "X", "X", "X", "X", "X", "R"],
+                          ["X", "X", "X", "X", "X", "B", "R"]]
+        self.kg._players["player1"]["capture count"] = 6
+        mcts = KubaMCTS(self.kg, workers=1, playouts=200, seed=3)
+        self.assertEqual(mcts.best_move("player1"), ((4, 6), "B"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaPerft.py
+
+from KubaGame import KubaGame
+from KubaPerft import divide, perft
+import copy
+import unittest
+
+
+def reference_perft(game, depth, playername):
+    """Counts move sequences by trying every square and direction with make_move on copies of the game"""
+    if depth == 0:
+        return 1
+    nodes = 0
+    for row in range(7):
+        for column in range(7):
+            for direction in "LRFB":
+                child = copy.deepcopy(game)
+                if child.make_move(playername, (row, column), direction):
+                    nodes += reference_perft(child, depth - 1, child.get_current_turn())
+    return nodes
+
+
+class TestKubaPerft(unittest.TestCase):
+    """Contains unit tests for KubaPerft.py"""
+
+    def setUp(self):
+        """Creates a game"""
+        self.kg = KubaGame(("player1", "W"), ("player2", "B"))
+
+    def tearDown(self):
+        """Deletes the game"""
+        del self.kg
+
+    def test_perft(self):
+        """Counts match the reference rules, on both engines, and leave the game unchanged"""
+        self.assertEqual(perft(self.kg, 0), 1)
+        self.assertEqual(perft(self.kg, 1), 8)
+        self.assertEqual(perft(self.kg, 2), reference_perft(self.kg, 2, "player1"))
+        bitboard = KubaGame(("player1", "W"), ("player2", "B"), engine="bitboard")
+        self.assertEqual(perft(bitboard, 3), perft(self.kg, 3))
+        self.assertEqual(self.kg._board, bitboard._board)
+        self.assertIsNone(self.kg.get_current_turn())
+
+    def test_breakdown(self):
+        """Captures and wins are counted at the last move"""
+        self.kg._board = [["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "X"],
+                          ["X", "W", "B", "R", "X", "X", "X"],
+                          ["X", "X", "X", "X", "X", "X", "W"],
+                          ["X", "X", "X", "X", "X", "X", "R"],
+                          ["X", "X", "X", "X", "X", "B", "R"]]
+        self.kg._players["player1"]["capture count"] = 6
+        counts = perft(self.kg, 1, "player1", breakdown=True)
+        self.assertEqual(counts["nodes"], len(self.kg.legal_moves("player1")))
+        self.assertEqual(counts["red captures"], 1)
+        self.assertEqual(counts["wins"], 1)
+        self.assertEqual(perft(self.kg, 2, "player1", breakdown=True)["nodes"],
+                         reference_perft(self.kg, 2, "player1"))
+
+    def test_parallel(self):
+        """Splitting root moves across processes gives the same counts"""
+        serial = divide(self.kg, 3)
+        self.assertEqual(divide(self.kg, 3, workers=2), serial)
+        self.assertEqual(perft(self.kg, 3, workers=2, breakdown=True),
+                         perft(self.kg, 3, breakdown=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
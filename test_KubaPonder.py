@@ -0,0 +1,71 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaPonder.py
+
+from CompactKubaGame import CompactKubaGame
+from KubaGame import KubaGame
+from KubaPonder import KubaPonder
+import time
+import unittest
+
+
+class TestKubaPonder(unittest.TestCase):
+    """Contains unit tests for KubaPonder.py"""
+
+    def setUp(self):
+        """Creates a new game"""
+        self.game = KubaGame(("player1", "W"), ("player2", "B"))
+
+    def test_deadline(self):
+        """best_move answers with a legal move by its deadline, even with no time to search"""
+        with KubaPonder(self.game, "player1", max_playout_moves=30, seed=1) as ponder:
+            start = time.perf_counter()
+            move = ponder.best_move(time_limit=0.2)
+            self.assertLess(time.perf_counter() - start, 0.5)
+            self.assertIn(move, self.game.legal_moves("player1"))
+            self.assertGreater(ponder.get_stats()["playouts"], 0)
+
+            self.assertTrue(self.game.make_move("player1", *move))
+            move = ponder.best_move(time_limit=0)
+            self.assertIn(move, self.game.legal_moves("player2"))
+        self.assertEqual(self.game._observers, [])
+
+    def test_reuse(self):
+        """The subtree under the moves made is kept, for moves made by either player"""
+        with KubaPonder(self.game, "player1", max_playout_moves=30, seed=2) as ponder:
+            for playername in ("player1", "player2", "player1", "player2"):
+                move = ponder.best_move(playername, time_limit=5, playouts=300)
+                self.assertGreaterEqual(ponder.get_stats()["playouts"], 300)
+                self.assertTrue(self.game.make_move(playername, *move))
+            ponder.best_move("player1", time_limit=5, playouts=1)
+            self.assertGreater(ponder.get_stats()["reused playouts"], 0)
+
+    def test_max_nodes(self):
+        """The tree stops growing at max_nodes, but playouts go on; CompactKubaGame can be pondered too"""
+        game = CompactKubaGame(("player1", "W"), ("player2", "B"))
+        with KubaPonder(game, "player1", max_playout_moves=30, max_nodes=10, seed=3) as ponder:
+            move = ponder.best_move(time_limit=5, playouts=100)
+            self.assertIn(move, game.legal_moves("player1"))
+            self.assertGreaterEqual(ponder.get_stats()["playouts"], 100)
+            self.assertLessEqual(ponder.get_stats()["nodes"], 10)
+
+    def test_engine_and_errors(self):
+        """The search runs on the game's engine, and an exception in the search thread is raised by best_move"""
+        game = KubaGame(("player1", "W"), ("player2", "B"), engine="bitboard")
+        with KubaPonder(game, "player1", max_playout_moves=30, seed=4) as ponder:
+            ponder.best_move(time_limit=5, playouts=10)
+            self.assertEqual(ponder._search_game.get_engine(), "bitboard")
+
+        class FailingPonder(KubaPonder):
+            def move_root(self, position):
+                raise KeyError(position)
+
+        with FailingPonder(self.game, "player1", seed=5) as ponder:
+            with self.assertRaises(KeyError):
+                ponder.best_move(time_limit=5)
+            with self.assertRaises(KeyError):
+                ponder.best_move(time_limit=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
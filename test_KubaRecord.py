@@ -0,0 +1,138 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaRecord.py
+
+from CompactKubaGame import CompactKubaGame
+from KubaGame import KubaGame
+from KubaRecord import GameRecordWriter, read_archive, read_games, FILE_MAGIC
+import gc
+import os
+import random
+import tempfile
+import unittest
+
+
+class TestKubaRecord(unittest.TestCase):
+    """Contains unit tests for KubaRecord.py"""
+
+    def setUp(self):
+        """Creates a temporary archive path"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.kubr")
+
+    def tearDown(self):
+        """Deletes the temporary archive"""
+        self.directory.cleanup()
+
+    def play_games(self, count, seed):
+        """Records 'count' random games, returning each game's final board and list of moves"""
+        rng = random.Random(seed)
+        results = []
+        with GameRecordWriter(self.path) as writer:
+            for _ in range(count):
+                game = KubaGame(("Ann", "B"), ("Bob", "W"))
+                game.set_recorder(writer)
+                self.assertFalse(game.make_move("Ann", (0, 0), "R"))  # Not Ann's marble; not recorded
+                moves = []
+                playername = "Bob"
+                while game.get_winner() is None and len(moves) < 120:
+                    move = (playername,) + rng.choice(game.legal_moves(playername))
+                    game.make_move(*move)
+                    moves.append(move)
+                    playername = game.get_current_turn()
+                results.append((game._board, moves))
+        return results
+
+    def test_round_trip(self):
+        """Recorded games read back and replay to the same boards"""
+        results = self.play_games(5, seed=10)
+        records = list(read_archive(self.path))
+        self.assertEqual(len(records), 5)
+        for record, (board, moves) in zip(records, results):
+            self.assertEqual(record.player_one, ("Ann", "B"))
+            self.assertEqual(record.player_two, ("Bob", "W"))
+            self.assertEqual(record.get_move_count(), len(moves))
+            self.assertEqual(list(record.get_moves()), moves)
+            game = None
+            for game, _ in record.replay(engine="bitboard"):
+                pass
+            self.assertEqual(game._board, board)
+
+    def test_append(self):
+        """Opening an archive again appends games to it"""
+        self.play_games(2, seed=1)
+        self.play_games(3, seed=2)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        self.assertEqual(data.count(FILE_MAGIC), 1)
+        self.assertEqual(len(list(read_games(data))), 5)
+
+    def test_mid_game_recording(self):
+        """A recorder attached after the first moves records the position it starts from"""
+        game = KubaGame(("Ann", "W"), ("Bob", "B"))
+        game.make_move("Ann", (0, 0), "R")
+        game.make_move("Bob", (0, 6), "B")
+        with GameRecordWriter(self.path) as writer:
+            game.set_recorder(writer)
+            game.make_move("Ann", (6, 6), "L")
+        with open(self.path, "rb") as file:
+            record = next(read_games(file.read()))
+        replayed = [game for game, _ in record.replay()][-1]
+        self.assertEqual(replayed._board, game._board)
+        self.assertEqual(replayed.get_current_turn(), "Bob")
+
+    def test_games_in_turn(self):
+        """Games recorded in turn each get their own moves, from the position each was left in"""
+        rng = random.Random(3)
+        games = [KubaGame(("Ann", "W"), ("Bob", "B")), CompactKubaGame(("Cat", "B"), ("Dan", "W"))]
+        moves = {"Ann": [], "Cat": []}
+        with GameRecordWriter(self.path) as writer:
+            for game in games:
+                game.set_recorder(writer)
+            for _ in range(30):
+                for game in games:
+                    if game.get_winner() is None:
+                        playername = game.get_current_turn() or game.get_playernames()[0]
+                        move = (playername,) + rng.choice(game.legal_moves(playername))
+                        self.assertTrue(game.make_move(*move))
+                        moves[game.get_playernames()[0]].append(move)
+
+        records = list(read_archive(self.path))
+        self.assertGreater(len(records), 2)
+        for game in games:
+            first_player = game.get_playernames()[0]
+            game_records = [record for record in records if record.player_one[0] == first_player]
+            self.assertEqual([move for record in game_records for move in record.get_moves()], moves[first_player])
+            for record in game_records:
+                replayed = [replayed.to_bytes() for replayed, _ in record.replay()]
+            self.assertEqual(replayed[-1], game.to_bytes())
+
+    def test_finished_games_released(self):
+        """The writer lets go of games when they are won or garbage collected"""
+        with GameRecordWriter(self.path) as writer:
+            for game_class in (KubaGame, CompactKubaGame):
+                game = game_class(("Ann", "W"), ("Bob", "B"))
+                game.set_recorder(writer)
+                game.make_move("Ann", (6, 6), "L")
+                self.assertEqual(len(writer._games), 1)
+                del game
+                gc.collect()
+                self.assertEqual(len(writer._games), 0)
+
+            board = [["X"] * 7 for _ in range(7)]
+            board[0][5:] = ["W", "B"]
+            game = KubaGame(("Ann", "W"), ("Bob", "B"), board=board)
+            game.set_recorder(writer)
+            self.assertEqual(len(writer._games), 1)
+            self.assertTrue(game.make_move("Ann", (0, 5), "R"))
+            self.assertEqual(game.get_winner(), "Ann")
+            self.assertEqual(len(writer._games), 0)
+
+    def test_not_an_archive(self):
+        """Data without the archive header is rejected"""
+        with self.assertRaises(ValueError):
+            next(read_games(b"not a record"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaServer.py and KubaLoadTest.py
+
+from KubaLoadTest import run_load_test, LoadClient
+from KubaServer import KubaServer, LINE_LIMIT
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestKubaServer(unittest.IsolatedAsyncioTestCase):
+    """Contains unit tests for KubaServer.py and KubaLoadTest.py"""
+
+    async def asyncSetUp(self):
+        """Starts a server and connects a client"""
+        self.server = KubaServer()
+        await self.server.start()
+        self.client = await LoadClient.connect(self.server.get_address())
+
+    async def asyncTearDown(self):
+        """Disconnects the client and stops the server"""
+        await self.client.close()
+        await self.server.close()
+
+    async def test_play(self):
+        """Games are created, played and read back over the protocol"""
+        game_id = (await self.client.request({"op": "create", "players": [["Ann", "B"], ["Bob", "W"]]}))["game"]
+        response = await self.client.request({"op": "move", "game": game_id, "player": "Bob",
+                                              "coordinates": [6, 6], "direction": "F", "include_moves": True})
+        self.assertTrue(response["moved"])
+        self.assertEqual(response["turn"], "Ann")
+        self.assertEqual(len(response["moves"]), 8)
+        response = await self.client.request({"op": "move", "game": game_id, "player": "Bob",
+                                              "coordinates": [6, 5], "direction": "F"})
+        self.assertFalse(response["moved"])  # Not Bob's turn
+
+        state = await self.client.request({"op": "state", "game": game_id})
+        self.assertEqual(state["board"][6][6], "X")
+        self.assertEqual(state["captured"], {"Ann": 0, "Bob": 0})
+        self.assertEqual(self.server.get_stats(), {"games": 1, "moves": 1})
+
+        with self.assertRaises(RuntimeError):
+            await self.client.request({"op": "state", "game": game_id + 1})
+        with self.assertRaises(RuntimeError):
+            await self.client.request({"op": "create", "players": [["Ann", "B"], ["Bob", "B"]]})
+        with self.assertRaises(RuntimeError):
+            await self.client.request({"op": "jump", "game": game_id})
+
+        await self.client.request({"op": "close", "game": game_id})
+        self.assertEqual(self.server.get_stats()["games"], 0)
+
+    async def test_bad_lines(self):
+        """Lines that are not JSON objects get an error response, and the connection stays open"""
+        reader, writer = await asyncio.open_connection(*self.server.get_address())
+        for line in (b"not json\n", b"[1, 2]\n", b'{"op": "move", "game": 1, "coordinates": 5}\n'):
+            writer.write(line)
+            self.assertFalse(json.loads(await reader.readline())["ok"])
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_long_line(self):
+        """A line longer than LINE_LIMIT gets an error response, and the connection is closed"""
+        reader, writer = await asyncio.open_connection(*self.server.get_address())
+        writer.write(b'{"op": "' + b"x" * LINE_LIMIT + b'"}\n')
+        response = json.loads(await reader.readline())
+        self.assertFalse(response["ok"])
+        self.assertIn("longer", response["error"])
+        self.assertEqual(await reader.readline(), b"")
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_lagging_subscriber(self):
+        """Subscribers with too many event bytes waiting to be sent are disconnected"""
+        game_id = (await self.client.request({"op": "create"}))["game"]
+        reader, writer = await asyncio.open_connection(*self.server.get_address())
+        writer.write(json.dumps({"op": "subscribe", "game": game_id}).encode() + b"\n")
+        self.assertTrue(json.loads(await reader.readline())["ok"])
+
+        self.server._event_buffer_limit = -1  # Any subscriber is lagging
+        await self.client.request({"op": "move", "game": game_id, "player": "player1",
+                                   "coordinates": [0, 0], "direction": "R"})
+        self.assertEqual(await reader.readline(), b"")
+        self.assertNotIn(game_id, self.server._subscribers)
+        self.assertEqual(self.server._games[game_id]._observers, [])
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_subscribe(self):
+        """Subscribed connections are sent every move made in the game; the game has an observer only while it has
+        subscribers"""
+        game_id = (await self.client.request({"op": "create"}))["game"]
+        game = self.server._games[game_id]
+        self.assertEqual(game._observers, [])
+        reader, writer = await asyncio.open_connection(*self.server.get_address())
+        writer.write(json.dumps({"op": "subscribe", "game": game_id}).encode() + b"\n")
+        self.assertTrue(json.loads(await reader.readline())["ok"])
+        await self.client.request({"op": "subscribe", "game": game_id})
+        self.assertEqual(len(game._observers), 1)
+        await self.client.request({"op": "unsubscribe", "game": game_id})
+        self.assertEqual(len(game._observers), 1)
+
+        await self.client.request({"op": "move", "game": game_id, "player": "player1",
+                                   "coordinates": [0, 0], "direction": "R"})
+        event = json.loads(await reader.readline())
+        self.assertEqual(event["event"], "move")
+        self.assertEqual((event["player"], event["turn"], event["captured"]), ("player1", "player2", None))
+        self.assertEqual(event["changes"], [[[0, 0], "X"], [[0, 2], "W"]])
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):  # Until the server has seen the connection close
+            if not game._observers:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(game._observers, [])
+
+    async def test_load_test(self):
+        """The load test plays every game and reports latencies, over TCP and Unix sockets"""
+        results = await run_load_test(self.server.get_address(), clients=3, games=4, max_moves=20, subscribe=True)
+        self.assertEqual(results["games"], 4)
+        self.assertGreater(results["moves"], 0)
+        self.assertEqual(results["events"], results["moves"])
+        self.assertLessEqual(results["p50 latency"], results["p99 latency"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kuba.sock")
+            server = KubaServer()
+            await server.start(path=path)
+            results = await run_load_test(path, clients=2, games=2, max_moves=10)
+            await server.close()
+        self.assertGreater(results["moves per second"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaSessions.py
+
+from CompactKubaGame import CompactKubaGame
+from KubaGame import KubaGame
+from KubaRecord import read_archive
+from KubaSessions import SessionStore, estimate_game_size
+import os
+import random
+import tempfile
+import unittest
+
+PLAYERS = (("player1", "W"), ("player2", "B"))
+
+
+class TestKubaSessions(unittest.TestCase):
+    """Contains unit tests for KubaSessions.py"""
+
+    def setUp(self):
+        """Creates a directory for the spill files"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "sessions.kuba")
+
+    def tearDown(self):
+        """Removes the spill files"""
+        self.directory.cleanup()
+
+    def test_eviction_and_rehydration(self):
+        """Games evicted to disk come back at the same position when their sessions are used"""
+        rng = random.Random(11)
+        for game_class in (KubaGame, CompactKubaGame):
+            with SessionStore(self.path, max_games=3, game_class=game_class) as store:
+                sessions = [store.get_session(store.create_game(*PLAYERS)) for _ in range(10)]
+                references = [KubaGame(*PLAYERS) for _ in range(10)]
+                self.assertEqual(store.get_stats()["resident"], 3)
+
+                for _ in range(300):
+                    index = rng.randrange(10)
+                    session, reference = sessions[index], references[index]
+                    if reference.get_winner() is not None:
+                        continue
+                    playername = reference.get_current_turn() or "player1"
+                    move = rng.choice(reference.legal_moves(playername))
+                    self.assertTrue(session.make_move(playername, *move))
+                    reference.make_move(playername, *move)
+                    self.assertEqual(session.get_marble(move[0]), "X")
+
+                for session, reference in zip(sessions, references):
+                    self.assertEqual(session.to_bytes(), reference.to_bytes())
+                    self.assertEqual(session.get_captured("player1"), reference.get_captured("player1"))
+
+                stats = store.get_stats()
+                self.assertEqual((stats["games"], stats["resident"], stats["evicted"]), (10, 3, 7))
+                self.assertGreater(stats["rehydrations"], 0)
+                self.assertEqual(stats["evictions"], stats["rehydrations"] + stats["evicted"])
+
+                # The spill file is an ordinary game record archive
+                store._file.flush()
+                records = list(read_archive(self.path))
+                self.assertGreaterEqual(len(records), 7)
+                del records
+
+                store.remove_game(sessions[0].get_game_id())
+                store.remove_game(sessions[9].get_game_id())
+                self.assertEqual(len(store), 8)
+                self.assertNotIn(sessions[0].get_game_id(), store)
+                with self.assertRaises(KeyError):
+                    sessions[0].make_move("player1", (6, 6), "F")
+
+    def test_byte_budget_and_compaction(self):
+        """The estimated bytes in memory stay within max_bytes, and compaction keeps evicted games readable"""
+        size = estimate_game_size(KubaGame(*PLAYERS))
+        with SessionStore(self.path, max_games=None, max_bytes=5 * size) as store:
+            game_ids = [store.create_game(("name" + str(index), "W"), ("other", "B")) for index in range(20)]
+            self.assertLessEqual(store.get_stats()["resident bytes"], 5 * size)
+            self.assertEqual(store.get_stats()["resident"], 5)
+
+            for _ in range(3):
+                for game_id in game_ids:
+                    store.get_game(game_id)
+            before = store.get_stats()["file bytes"]
+            store.compact()
+            self.assertLess(store.get_stats()["file bytes"], before)
+            for index, game_id in enumerate(game_ids):
+                self.assertEqual(store.get_game(game_id).get_playernames(), ["name" + str(index), "other"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaSymmetry.py
+
+from KubaGame import KubaGame
+from KubaSymmetry import canonical_form, invert_transform, transform_game, transform_move, IDENTITY, TRANSFORMS
+import random
+import unittest
+
+
+def play_random_game(seed, moves):
+    """Returns a game after up to 'moves' random moves"""
+    rng = random.Random(seed)
+    game = KubaGame(("player1", "W"), ("player2", "B"))
+    playername = "player1"
+    for _ in range(moves):
+        if game.get_winner() is not None:
+            break
+        game.make_move(playername, *rng.choice(game.legal_moves(playername)))
+        playername = game.get_current_turn()
+    return game
+
+
+class TestKubaSymmetry(unittest.TestCase):
+    """Contains unit tests for KubaSymmetry.py"""
+
+    def test_transforms(self):
+        """There are 16 distinct transforms, and each one is undone by its inverse"""
+        self.assertEqual(len(set(TRANSFORMS)), 16)
+        for transform in TRANSFORMS:
+            inverse = invert_transform(transform)
+            for move in (((0, 0), "R"), ((2, 5), "F"), ((6, 3), "L"), ((4, 1), "B")):
+                self.assertEqual(transform_move(transform_move(move, transform), inverse), move)
+        self.assertEqual(transform_move(((0, 1), "R"), (4, False)), ((1, 0), "B"))  # Transpose
+        self.assertEqual(transform_move(((0, 1), "R"), (2, True)), ((0, 5), "L"))  # Mirror left to right
+
+    def test_starting_position(self):
+        """Every transform of the starting position has the same canonical form"""
+        game = KubaGame(("player1", "W"), ("player2", "B"))
+        key, _ = canonical_form(game)
+        self.assertEqual(len(key), 16)
+        for transform in TRANSFORMS:
+            self.assertEqual(canonical_form(transform_game(game, transform))[0], key)
+        self.assertEqual(canonical_form(KubaGame(("Ann", "B"), ("Bob", "W")))[0], key)
+
+    def test_transformed_games(self):
+        """Transformed positions share a canonical form and have the transformed legal moves"""
+        for seed in range(5):
+            game = play_random_game(seed, 15)
+            playername = game.get_current_turn()
+            key, transform = canonical_form(game)
+            self.assertEqual(canonical_form(transform_game(game, IDENTITY))[0], key)
+            for other in TRANSFORMS:
+                transformed = transform_game(game, other, engine="bitboard")
+                self.assertEqual(canonical_form(transformed)[0], key)
+                self.assertEqual(sorted(transformed.legal_moves(playername)),
+                                 sorted(transform_move(move, other) for move in game.legal_moves(playername)))
+
+            # A move chosen in the canonical position translates back to a move with the same result
+            canonical = transform_game(game, transform)
+            move = canonical.legal_moves(playername)[0]
+            canonical.make_move(playername, *move)
+            self.assertTrue(game.make_move(playername, *transform_move(move, invert_transform(transform))))
+            self.assertEqual(canonical_form(game)[0], canonical_form(canonical)[0])
+
+        self.assertNotEqual(canonical_form(play_random_game(1, 10))[0], canonical_form(play_random_game(1, 11))[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
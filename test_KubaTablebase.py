@@ -0,0 +1,202 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaTablebase.py
+
+from KubaGame import KubaGame
+from KubaTablebase import generate_tablebase, get_child, get_index, get_moves, get_positions, get_table_size, solve
+from KubaTablebase import KubaTablebase
+from KubaTablebase import EMPTY, RED, THEM, US
+import os
+import random
+import tempfile
+import unittest
+
+
+class TestKubaTablebase(unittest.TestCase):
+    """Contains unit tests for KubaTablebase.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generates a tablebase of up to three marbles, which has one table with a red marble"""
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "endgames.kubt")
+        generate_tablebase(cls.path, max_marbles=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Deletes the tablebase"""
+        cls.directory.cleanup()
+
+    def check_probe(self, tablebase, game):
+        """Checks the probed result of the position in game against the results of the moves KubaGame allows from
+        it, and returns the result"""
+        result, distance = tablebase.probe(game)
+        playername = game.get_current_turn()
+        children = []
+        for move in game.legal_moves(playername):
+            game.apply_move(playername, *move)
+            if game.get_winner() is not None:
+                children.append(("loss", 0))  # The opponent has lost at once
+            else:
+                children.append(tablebase.probe(game))
+            game.undo_move()
+
+        if result == "win":
+            self.assertEqual(distance, min(child[1] for child in children if child[0] == "loss") + 1)
+        elif result == "loss":
+            self.assertTrue(all(child[0] == "win" for child in children))
+            self.assertEqual(distance, max(child[1] for child in children) + 1)
+        else:
+            self.assertNotIn("loss", [child[0] for child in children])
+            self.assertIn("draw", [child[0] for child in children])
+        return result
+
+    def test_probe(self):
+        """Every probed result agrees with the results of the moves KubaGame allows from the position"""
+        results = set()
+        with KubaTablebase(self.path) as tablebase:
+            self.assertEqual(tablebase.get_materials(), [(1, 1, 0), (1, 2, 0), (2, 1, 0), (1, 1, 1)])
+            for white in range(49):
+                for black in range(49):
+                    if white == black:
+                        continue
+                    board = [["X"] * 7 for _ in range(7)]
+                    board[white // 7][white % 7] = "W"
+                    board[black // 7][black % 7] = "B"
+                    game = KubaGame(("player1", "W"), ("player2", "B"), board=board)
+                    game.set_current_turn("player2")
+                    results.add(self.check_probe(tablebase, game))
+
+                    # With the forbidden move set, as after a push into the empty cell the black marble is on
+                    for move in game.legal_moves("player2")[:1]:
+                        game.set_forbidden_move(*move)
+                        results.add(self.check_probe(tablebase, game))
+            self.assertEqual(results, {"win", "loss", "draw"})
+
+            self.assertIsNone(tablebase.probe(KubaGame(("player1", "W"), ("player2", "B"))))
+
+    def search(self, game, depth):
+        """Brute-force search of the position in game, looking at most 'depth' moves ahead
+
+        Returns:
+            a tuple (result, distance) as from KubaTablebase.probe, or None if the game does not end within depth
+            moves with best play
+        """
+        playername = game.get_current_turn()
+        moves = game.legal_moves(playername)
+        if not moves:
+            return "loss", 0
+        if depth == 0:
+            return None
+
+        shortest_win = None
+        longest_loss = 0
+        unknown = False
+        for move in moves:
+            game.apply_move(playername, *move)
+            if game.get_winner() is not None:
+                child = ("loss", 0)  # The opponent has lost at once
+            else:
+                child = self.search(game, depth - 1)
+            game.undo_move()
+            if child is None:
+                unknown = True
+            elif child[0] == "loss":
+                shortest_win = child[1] + 1 if shortest_win is None else min(shortest_win, child[1] + 1)
+            else:
+                longest_loss = max(longest_loss, child[1] + 1)
+
+        if shortest_win is not None:
+            return "win", shortest_win
+        if unknown:
+            return None
+        return "loss", longest_loss
+
+    def test_brute_force(self):
+        """Probed results agree with a brute-force search, on positions with a red marble and with three marbles"""
+        rng = random.Random(16)
+        depth = 5
+        results = {}
+        with KubaTablebase(self.path) as tablebase:
+            for marbles in ("WBR", "WBR", "WWB", "WBB") * 15:
+                board = [["X"] * 7 for _ in range(7)]
+                for cell, marble in zip(rng.sample(range(49), 3), marbles):
+                    board[cell // 7][cell % 7] = marble
+                data = bytearray(KubaGame(("player1", "W"), ("player2", "B"), board=board).to_bytes())
+                data[13] = rng.choice((0, 5, 6)) | rng.choice((0, 5, 6)) << 4  # Red marbles captured by each player
+                data[15] = rng.choice((1, 2))  # Player to move
+                game = KubaGame.from_bytes(bytes(data), ("player1", "W"), ("player2", "B"))
+                if game.get_winner() is not None or not game.legal_moves(game.get_current_turn()):
+                    continue
+
+                result = tablebase.probe(game)
+                results.setdefault(marbles, set()).add(result[0])
+                if result[0] == "draw" or result[1] > depth:
+                    self.assertIsNone(self.search(game, depth))
+                else:
+                    self.assertEqual(self.search(game, depth), result)
+        self.assertEqual(results["WBR"], {"win", "loss", "draw"})
+
+    def test_slow_capture_wins(self):
+        """A position with a capture that wins slowly is never stored as lost, however fast its other moves lose
+
+        Every position after a red capture is taken to be lost in 8 moves, so each such capture wins in 9. Positions
+        on boards with a red capture must then agree with the best of their moves (a Bellman consistency check).
+        """
+        losing = {(1, 1, 0): bytearray([9]) * get_table_size((1, 1, 0))}
+        table = solve([(1, 1, 1)], losing)[(1, 1, 1)]
+        tables = {(1, 1, 0): losing[(1, 1, 0)], (1, 1, 1): table}
+        capture_wins = 0
+        checked_board = None
+        for board, us_cells, forbidden, need_us, need_them, index in get_positions((1, 1, 1)):
+            if board is not checked_board:
+                checked_board = board
+                captures_red = any(move[3] == RED for move in get_moves(board, us_cells, 0))
+            if not captures_red:
+                continue
+
+            values = []  # Each move's value, stored as the table would store this position if it were the only one
+            for move in get_moves(board, us_cells, forbidden):
+                child = get_child((1, 1, 1), board, move, need_us, need_them)
+                values.append(2 if child is None else tables[child[0]][child[1]] + 1)
+            wins = [value for value in values if value % 2 == 0]
+            if not values:
+                expected = 1
+            elif wins:
+                expected = min(wins)
+            elif 1 in values:  # A move to a drawn position
+                expected = 0
+            else:
+                expected = max(values)
+            self.assertEqual(table[index], expected)
+            capture_wins += expected == 10
+        self.assertGreater(capture_wins, 0)
+
+    def test_captures(self):
+        """Capturing the last opponent marble, or the seventh red marble, wins at once"""
+        board = [EMPTY] * 49
+        board[4], board[5], board[6] = US, RED, THEM
+        move = (4, 1, 6, THEM)  # Pushes row 0 right from column 4, pushing the black marble off
+        self.assertIn(move, get_moves(board, (4,), 0))
+        self.assertIsNone(get_child((1, 1, 1), board, move, 2, 2))
+
+        board[6], board[10] = RED, THEM
+        move = (4, 1, 6, RED)
+        self.assertIn(move, get_moves(board, (4,), 0))
+        self.assertIsNone(get_child((1, 1, 2), board, move, 1, 3))
+        child_material, index = get_child((1, 1, 2), board, move, 2, 3)
+        self.assertEqual(child_material, (1, 1, 1))
+        self.assertEqual(index, get_index((1, 1, 1), (10,), (5,), (6,), 0, 2, 1))
+        self.assertLess(index, get_table_size(child_material))
+
+    def test_not_a_tablebase(self):
+        """Files without the tablebase header are rejected"""
+        path = os.path.join(self.directory.name, "other")
+        with open(path, "wb") as file:
+            file.write(bytes(32))
+        with self.assertRaises(ValueError):
+            KubaTablebase(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# Author: Nic Nolan
+# Date: 10/17/2026
+# Description: Unit Tests for KubaTournament.py
+
+from KubaTournament import compute_elo, main, make_schedule, play_match, run_tournament, DEFAULT_OPTIONS
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestKubaTournament(unittest.TestCase):
+    """Contains unit tests for KubaTournament.py"""
+
+    def test_make_schedule(self):
+        """Every pair plays the same number of games with each color"""
+        schedule = make_schedule(["random", "greedy", "mcts"], 4, 1, DEFAULT_OPTIONS)
+        self.assertEqual(len(schedule), 12)
+        self.assertEqual([match[0] for match in schedule], list(range(12)))
+        for first, second in (("random", "greedy"), ("random", "mcts"), ("greedy", "mcts")):
+            whites = [match[1] for match in schedule if {match[1], match[2]} == {first, second}]
+            self.assertEqual(sorted(whites), sorted([first, first, second, second]))
+
+    def test_compute_elo(self):
+        """Stronger results give higher ratings, averaging 1500, and even results give equal ratings"""
+        results = [{"white": "a", "black": "b", "winner": "a"}] * 3 + [{"white": "b", "black": "a", "winner": None}]
+        ratings = compute_elo(results)
+        self.assertGreater(ratings["a"], ratings["b"])
+        self.assertAlmostEqual(ratings["a"] + ratings["b"], 3000)
+
+        even = compute_elo([{"white": "a", "black": "b", "winner": "a"}, {"white": "b", "black": "a", "winner": "b"}])
+        self.assertAlmostEqual(even["a"], even["b"])
+
+    def test_play_match(self):
+        """The same match seed plays the same game"""
+        match = (7, "greedy", "KubaTournament:random_strategy", 3, DEFAULT_OPTIONS)
+        result = play_match(match)
+        self.assertEqual(result["match"], 7)
+        self.assertIn(result["winner"], ("greedy", "KubaTournament:random_strategy", None))
+        self.assertEqual({key: value for key, value in play_match(match).items() if key != "seconds"},
+                         {key: value for key, value in result.items() if key != "seconds"})
+        with self.assertRaises(ValueError):
+            run_tournament(["random", "nonexistent"], games=1, workers=1)
+
+    def test_run_tournament(self):
+        """Results are streamed as JSON lines from worker processes, and greedy outrates random"""
+        output = io.StringIO()
+        summary = run_tournament(["random", "greedy"], games=10, workers=2, output=output, seed=5)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(line["match"] for line in lines), list(range(10)))
+        self.assertEqual(summary["games"], 10)
+        self.assertGreater(summary["games per second"], 0)
+        strategies = summary["strategies"]
+        self.assertEqual(strategies["greedy"]["games"], 10)
+        self.assertGreater(strategies["greedy"]["elo"], strategies["random"]["elo"])
+        self.assertGreater(strategies["greedy"]["win rate"], 0.5)
+
+    def test_main(self):
+        """The command line appends results to the output file and prints the ratings"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            printed = io.StringIO()
+            with contextlib.redirect_stdout(printed):
+                status = main(["random", "alphabeta", "--games", "2", "--workers", "1", "--depth", "1",
+                               "--max-moves", "40", "--output", path])
+            self.assertEqual(status, 0)
+            with open(path) as file:
+                self.assertEqual(len(file.readlines()), 2)
+        self.assertIn("alphabeta", printed.getvalue())
+        self.assertIn("games/s", printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()